@@ -159,35 +159,96 @@ class CompactMerkleTree(merkle_tree.MerkleTree):
         self._push_subtree([new_leaf])
         return auditPath
 
+    def append_leaves(self, new_leaves: List[bytes]) -> List[Tuple[List[bytes], bytes]]:
+        """Append new leaves onto the end of this tree and return the audit
+        path and the resulting root hash for every appended leaf.
+
+        The result is the same as calling append() for each leaf, but all
+        leaf and node hashes are written to the hash store in one go.
+        """
+        return self._extend(new_leaves, with_proofs=True)
+
     def extend(self, new_leaves: List[bytes]):
         """Extend this tree with new_leaves on the end.
 
-        The algorithm works by using _push_subtree() as a primitive, calling
-        it with the maximum number of allowed leaves until we can add the
-        remaining leaves as a valid entire (non-full) subtree in one go.
+        The new part of the tree is hashed layer by layer (see _extend), the
+        tree state is updated and the new leaf and node hashes are written
+        to the hash store only once for the whole extension.
         """
-        size = len(new_leaves)
-        final_size = self.tree_size + size
-        idx = 0
-        while True:
-            # keep pushing subtrees until mintree_size > remaining
-            max_h = self.__mintree_height
-            max_size = 1 << (max_h - 1) if max_h > 0 else 0
-            if max_h > 0 and size - idx >= max_size:
-                self._push_subtree(new_leaves[idx:idx + max_size])
-                idx += max_size
-            else:
-                break
-        # fill in rest of tree in one go, now that we can
-        if idx < size:
-            root_hash, hashes = self.__hasher._hash_full(new_leaves, idx, size)
-            self._update(final_size, self.hashes + hashes)
-        assert self.tree_size == final_size
+        self._extend(new_leaves, with_proofs=False)
+
+    def _extend(self, new_leaves: List[bytes], with_proofs: bool,
+                store_hashes: bool = True):
+        """Hash new_leaves on top of this tree a whole level at a time.
+
+        Level k holds the new complete nodes of height k (leaves are of
+        height 0), starting from the node with index `old_size >> k`. If
+        that index is odd, its left sibling is the full subtree of the
+        same height from the current tree. Every pair of nodes of level k
+        forms a node of level k + 1 which is stored as
+        (end of its leaves range, k + 1, hash), the same as append() does.
+        """
+        hasher = self.__hasher
+        old_size = self.__tree_size
+        new_size = old_size + len(new_leaves)
+        old_hashes = dict(zip(self._subtree_heights(old_size), self.__hashes))
+
+        leaf_hashes = hasher.hash_leaves(new_leaves)
+        levels = []
+        nodes = []
+        level, first, height = leaf_hashes, old_size, 0
+        while level:
+            levels.append((first, level))
+            if first % 2:
+                level = [old_hashes[height]] + level
+                first -= 1
+            level = hasher.hash_level(level)
+            first //= 2
+            height += 1
+            nodes.extend(((first + i + 1) << height, height, h)
+                         for i, h in enumerate(level))
+
+        def subtree_hashes(size):
+            hashes = []
+            for h in self._subtree_heights(size):
+                idx = (size >> h) - 1
+                if h < len(levels) and idx >= levels[h][0]:
+                    hashes.append(levels[h][1][idx - levels[h][0]])
+                else:
+                    hashes.append(old_hashes[h])
+            return hashes
+
+        proofs = []
+        if with_proofs:
+            hashes = list(self.__hashes)
+            for size in range(old_size + 1, new_size + 1):
+                audit_path = hashes[::-1]
+                hashes = subtree_hashes(size)
+                proofs.append((audit_path, hasher._hash_fold(hashes)))
+
+        if leaf_hashes and store_hashes and self.hashStore:
+            # nodes are written in the same order as append() creates them
+            nodes.sort(key=lambda node: node[:2])
+            self.hashStore.writeLeaves(leaf_hashes)
+            self.hashStore.writeNodes(nodes)
+        self._update(new_size, subtree_hashes(new_size))
+        return proofs
+
+    @staticmethod
+    def _subtree_heights(tree_size: int) -> List[int]:
+        """Heights of the full subtrees forming a tree of the given size,
+        in descending order (the same order as in hashes)."""
+        return [h for h in reversed(range(tree_size.bit_length()))
+                if tree_size >> h & 1]
 
     def extended(self, new_leaves: List[bytes]):
-        """Returns a new tree equal to this tree extended with new_leaves."""
+        """Returns a new tree equal to this tree extended with new_leaves.
+
+        Only the compact representation (tree_size and hashes) of the new
+        tree is built, its hash store is left empty.
+        """
         new_tree = self.__copy__()
-        new_tree.extend(new_leaves)
+        new_tree._extend(new_leaves, with_proofs=False, store_hashes=False)
         return new_tree
 
     def merkle_tree_hash_hex(self, start: int, end: int):
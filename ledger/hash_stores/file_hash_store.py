@@ -1,6 +1,83 @@
+import mmap
+import os
+
 from ledger.hash_stores.hash_store import HashStore
 from storage.binary_file_store import BinaryFileStore
-from storage.kv_store_file import KeyValueStorageFile
+
+
+class MappedRecordsFile:
+    """
+    File of fixed size records which are appended through the file store and
+    read through a read only memory mapping of the file, so reading a record
+    is slicing of memory rather than a seek and a read syscall. The whole
+    file is mapped and it is mapped again only when records appended since
+    the last mapping are read.
+    """
+
+    def __init__(self, store: BinaryFileStore, recordSize: int):
+        self.store = store
+        self.recordSize = recordSize
+        self.count = 0
+        self._map = None
+        self._mappedCount = 0
+        self.open()
+
+    def append(self, data: bytes):
+        self.store.put(key=None, value=data)
+        self.count += len(data) // self.recordSize
+
+    def get(self, pos) -> bytes:
+        """
+        Returns the record at the given position starting from 1
+        """
+        if pos > self._mappedCount:
+            self._remap()
+        offset = (pos - 1) * self.recordSize
+        return self._map[offset:offset + self.recordSize]
+
+    def getRange(self, start, end) -> bytes:
+        """
+        Returns records from `start` to `end` both inclusive
+        """
+        if end > self._mappedCount:
+            self._remap()
+        return self._map[(start - 1) * self.recordSize:end * self.recordSize]
+
+    def _remap(self):
+        self._unmap()
+        if self.count > 0:
+            self._map = mmap.mmap(self.store.db_file.fileno(),
+                                  self.count * self.recordSize,
+                                  access=mmap.ACCESS_READ)
+        self._mappedCount = self.count
+
+    def _unmap(self):
+        if self._map is not None:
+            # Raises BufferError if memory of the mapping is still referenced,
+            # the file must not be truncated then
+            self._map.close()
+        self._map = None
+        self._mappedCount = 0
+
+    def open(self):
+        if self.store.closed:
+            self.store.open()
+        size = os.fstat(self.store.db_file.fileno()).st_size
+        self.count = size // self.recordSize
+        if size % self.recordSize:
+            # An incomplete record written last is dropped, otherwise
+            # records appended after it would be read from wrong positions
+            self.store.db_file.truncate(self.count * self.recordSize)
+
+    def close(self):
+        self._unmap()
+        self.store.close()
+
+    def reset(self):
+        # Accessing memory mapped beyond the end of the file is a crash
+        self._unmap()
+        self.store.reset()
+        self.count = 0
 
 
 class FileHashStore(HashStore):
@@ -28,12 +105,19 @@ class FileHashStore(HashStore):
         self.nodeSize = nodeSize
         self.leafSize = leafSize
 
+        self.nodes = MappedRecordsFile(self.nodesFile, nodeSize)
+        self.leaves = MappedRecordsFile(self.leavesFile, leafSize)
+
     @property
     def is_persistent(self) -> bool:
         return True
 
     @staticmethod
-    def write(data, store, size):
+    def write(data, store: MappedRecordsFile, size):
+        store.append(FileHashStore._checkedData(data, size))
+
+    @staticmethod
+    def _checkedData(data, size):
         if not isinstance(data, bytes):
             data = data.encode()
         dataSize = len(data)
@@ -42,22 +126,7 @@ class FileHashStore(HashStore):
                 "Data size not allowed. Size of the data should be "
                 "{} but instead was {}".format(
                     size, dataSize))
-        store.put(key=None, value=data)
-
-    @staticmethod
-    def read(store: KeyValueStorageFile, entryNo, size):
-        store.db_file.seek((entryNo - 1) * size)
-        return store.db_file.read(size)
-
-    @staticmethod
-    def dataGen(dataFactory, startpos, endpos):
-        i = startpos
-        while True:
-            data = dataFactory(i)
-            yield data
-            i += 1
-            if i <= endpos:
-                break
+        return data
 
     def writeNode(self, node):
         # TODO: Need to have some exception handling around converting to bytes
@@ -67,54 +136,79 @@ class FileHashStore(HashStore):
         # height = height.to_bytes(1, byteorder='little')
         # data = start + height + nodeHash
         data = node[2]
-        self.write(data, self.nodesFile, self.nodeSize)
+        self.write(data, self.nodes, self.nodeSize)
 
     def writeLeaf(self, leafHash):
-        self.write(leafHash, self.leavesFile, self.leafSize)
+        self.write(leafHash, self.leaves, self.leafSize)
+
+    def writeNodes(self, nodes):
+        # Written with one write (and fsync) instead of one per node
+        data = b''.join(self._checkedData(node[2], self.nodeSize) for node in nodes)
+        if data:
+            self.nodes.append(data)
+
+    def writeLeaves(self, leafHashes):
+        data = b''.join(self._checkedData(leafHash, self.leafSize) for leafHash in leafHashes)
+        if data:
+            self.leaves.append(data)
 
     def readNode(self, pos):
-        data = self.read(self.nodesFile, pos, self.nodeSize)
-        if len(data) < self.nodeSize:
+        self._validatePos(pos)
+        if pos > self.nodes.count:
             raise IndexError("No node at given position")
         # start = int.from_bytes(data[:4], byteorder='little')
         # height = int.from_bytes(data[4:5], byteorder='little')
         # nodeHash = data[5:]
         # return start, height, nodeHash
-        return data
+        return self.nodes.get(pos)
 
     def readLeaf(self, pos):
-        data = self.read(self.leavesFile, pos, self.leafSize)
-        if len(data) < self.leafSize:
+        self._validatePos(pos)
+        if pos > self.leaves.count:
             raise IndexError("No leaf at given position")
-        return data
+        return self.leaves.get(pos)
 
     def readLeafs(self, startpos, endpos):
-        return self.dataGen(self.readLeaf, startpos, endpos)
+        """
+        Returns leaf hashes from `startpos` to `endpos` both inclusive
+        """
+        return self._readMultiple(self.leaves, startpos, endpos, self.leafSize, "leaf")
 
     def readNodes(self, startpos, endpos):
-        return self.dataGen(self.readNode, startpos, endpos)
+        """
+        Returns node hashes from `startpos` to `endpos` both inclusive
+        """
+        return self._readMultiple(self.nodes, startpos, endpos, self.nodeSize, "node")
+
+    @staticmethod
+    def _readMultiple(records: MappedRecordsFile, start, end, size, name):
+        FileHashStore._validatePos(start, end)
+        if end > records.count:
+            raise IndexError("No {} at position {}".format(name, end))
+        data = records.getRange(start, end)
+        return [data[offset:offset + size] for offset in range(0, len(data), size)]
 
     @property
     def leafCount(self) -> int:
-        return self.leavesFile.db_file.seek(0, 2) // self.leafSize
+        return self.leaves.count
 
     @property
     def nodeCount(self) -> int:
-        return self.nodesFile.db_file.seek(0, 2) // self.nodeSize
+        return self.nodes.count
 
     @property
     def closed(self):
         return self.nodesFile.closed and self.leavesFile.closed
 
     def open(self):
-        self.nodesFile.open()
-        self.leavesFile.open()
+        self.nodes.open()
+        self.leaves.open()
 
     def close(self):
-        self.nodesFile.close()
-        self.leavesFile.close()
+        self.nodes.close()
+        self.leaves.close()
 
     def reset(self):
-        self.nodesFile.reset()
-        self.leavesFile.reset()
+        self.nodes.reset()
+        self.leaves.reset()
         return True
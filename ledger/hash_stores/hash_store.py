@@ -1,6 +1,5 @@
 from abc import abstractmethod
 
-from ledger.util import count_bits_set
 from ledger.util import highest_bit_set
 
 
@@ -29,6 +28,25 @@ class HashStore:
         :param node: tuple of start, height and nodeHash
         """
 
+    def writeLeaves(self, leafHashes):
+        """
+        append several leafHashes to the leaf hash store at once
+
+        :param leafHashes: list of leaf hashes in the order of appending
+        """
+        for leafHash in leafHashes:
+            self.writeLeaf(leafHash)
+
+    def writeNodes(self, nodes):
+        """
+        append several nodes to the node hash store at once
+
+        :param nodes: list of tuples of start, height and nodeHash in the
+        order of appending
+        """
+        for node in nodes:
+            self.writeNode(node)
+
     @abstractmethod
     def readLeaf(self, pos):
         """
@@ -93,15 +111,19 @@ class HashStore:
         :param height: Height of this node in the merkle tree
         :return: the node's position
         """
-        pwr = highest_bit_set(start) - 1
+        pwr = start.bit_length() - 1
         height = height or pwr
-        if count_bits_set(start) == 1:
-            adj = height - pwr
-            return start - 1 + adj
-        else:
-            c = pow(2, pwr)
-            return cls.getNodePosition(c, pwr) + \
-                cls.getNodePosition(start - c, height)
+        pos = 0
+        # Until `start` is a power of 2, the position is the position of the
+        # node of the highest complete subtree to the left plus the position
+        # of the node in the rest of the tree
+        while start & (start - 1):
+            c = 1 << pwr
+            pos += c - 1
+            start -= c
+            pwr = start.bit_length() - 1
+        adj = height - pwr
+        return pos + start - 1 + adj
 
     @classmethod
     def getPath(cls, seqNo, offset=0):
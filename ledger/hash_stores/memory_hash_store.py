@@ -13,8 +13,15 @@ class MemoryHashStore(HashStore):
     def writeLeaf(self, leafHash):
         self._leafs.append(leafHash)
 
-    def writeNode(self, nodeHash):
-        self._nodes.append(nodeHash)
+    def writeNode(self, node):
+        # Only nodeHash is kept, like in other hash stores
+        self._nodes.append(node[2])
+
+    def writeLeaves(self, leafHashes):
+        self._leafs.extend(leafHashes)
+
+    def writeNodes(self, nodes):
+        self._nodes.extend(node[2] for node in nodes)
 
     def readLeaf(self, pos):
         return self._leafs[pos - 1]
@@ -3,6 +3,7 @@ import time
 
 from common.exceptions import PlenumValueError
 from common.serializers.mapping_serializer import MappingSerializer
+from common.serializers.msgpack_serializer import MsgPackSerializer
 from common.serializers.serialization import ledger_txn_serializer, ledger_hash_serializer, txn_root_serializer
 from ledger.genesis_txn.genesis_txn_initiator import GenesisTxnInitiator
 from ledger.immutable_store import ImmutableStore
@@ -131,6 +132,42 @@ class Ledger(ImmutableStore):
 
         return merkle_info
 
+    def add_txns(self, leaves, with_merkle_info=True):
+        """
+        Add several leaves (transactions) to the log and the merkle tree.
+
+        Works the same way as calling `add` for each leaf, but all the leaves
+        are written to the log in one batch and the tree is extended with all
+        of them at once, so that the leaf and node hashes are written to the
+        hash store in one batch as well.
+
+        :param with_merkle_info: whether audit paths of the leaves are needed
+        :return: list of merkle info for each of the leaves, empty if
+        `with_merkle_info` is False
+        """
+        if not leaves:
+            return []
+        serz_leaves = [self.serialize_for_txn_log(leaf) for leaf in leaves]
+        self._transactionLog.setBatch([(str(self.seqNo + i), serz_leaf)
+                                       for i, serz_leaf in enumerate(serz_leaves, start=1)])
+
+        if isinstance(self.txn_serializer, MsgPackSerializer) and \
+                isinstance(self.hash_serializer, MsgPackSerializer):
+            # msgpack output does not depend on the store type, so leaves
+            # serialized for the log can be hashed as they are
+            serz_leaves_for_tree = serz_leaves
+        else:
+            serz_leaves_for_tree = [self.serialize_for_tree(leaf) for leaf in leaves]
+        if not with_merkle_info:
+            self.tree.extend(serz_leaves_for_tree)
+            self.seqNo += len(leaves)
+            return []
+        merkle_infos = []
+        for audit_path, root_hash in self.tree.append_leaves(serz_leaves_for_tree):
+            self.seqNo += 1
+            merkle_infos.append(self._build_merkle_proof(audit_path, root_hash))
+        return merkle_infos
+
     def _addToTree(self, leafData, serialized=False):
         serializedLeafData = self.serialize_for_tree(leafData) if \
             not serialized else leafData
@@ -146,10 +183,11 @@ class Ledger(ImmutableStore):
         self.seqNo += 1
         return self._build_merkle_proof(audit_path)
 
-    def _build_merkle_proof(self, audit_path):
+    def _build_merkle_proof(self, audit_path, root_hash=None):
+        root_hash = root_hash if root_hash is not None else self.tree.root_hash
         return {
             F.seqNo.name: self.seqNo,
-            F.rootHash.name: self.hashToStr(self.tree.root_hash),
+            F.rootHash.name: self.hashToStr(root_hash),
             F.auditPath.name: [self.hashToStr(h) for h in audit_path]
         }
 
@@ -2,6 +2,7 @@ import string
 from hashlib import sha256
 from random import choice, randint
 
+import base58
 import pytest
 
 from ledger.hash_stores.file_hash_store import FileHashStore
@@ -99,3 +100,77 @@ def testRandomAndRepeatedReads(nodesLeaves, tempdir):
     fhs.writeLeaf(leaves[-1])
     fhs.writeLeaf(leaves[0])
     assert leaves[idx] == fhs.readLeaf(idx + 1)
+
+
+def testRangeReads(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = writtenFhs(tempdir=tempdir, nodes=nodes, leaves=leaves)
+
+    assert fhs.readLeafs(1, len(leaves)) == leaves
+    assert fhs.readNodes(2, 5) == [node[2] for node in nodes[1:5]]
+    with pytest.raises(IndexError):
+        fhs.readLeafs(1, len(leaves) + 1)
+
+    # Hashes written after a range was read are read as well and the range
+    # read earlier remains valid
+    earlier = fhs.readLeafs(1, len(leaves))
+    fhs.writeLeaves(leaves[:3])
+    assert fhs.leafCount == len(leaves) + 3
+    assert fhs.readLeaf(len(leaves) + 3) == leaves[2]
+    assert fhs.readLeafs(len(leaves) - 1, len(leaves) + 3) == leaves[-2:] + leaves[:3]
+    assert earlier == leaves
+
+    # Hashes are bytes, so they can be used as keys and base58 encoded
+    assert all(type(leaf) is bytes for leaf in earlier)
+    assert base58.b58encode(earlier[0]) == base58.b58encode(leaves[0])
+    assert {leaf: i for i, leaf in enumerate(earlier)}[leaves[1]] == 1
+
+
+def testReadsAfterReset(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = writtenFhs(tempdir=tempdir, nodes=nodes, leaves=leaves)
+    assert fhs.readLeaf(len(leaves)) == leaves[-1]
+
+    fhs.reset()
+    assert fhs.leafCount == 0
+    assert fhs.nodeCount == 0
+    with pytest.raises(IndexError):
+        fhs.readLeaf(1)
+
+    fhs.writeLeaves(leaves[::-1])
+    fhs.writeNodes(nodes[:2])
+    assert fhs.readLeaf(1) == leaves[-1]
+    assert fhs.readNodes(1, 2) == [node[2] for node in nodes[:2]]
+
+
+def testResetFailsWhileMappedMemoryIsReferenced(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = writtenFhs(tempdir=tempdir, nodes=nodes, leaves=leaves)
+    assert fhs.readLeafs(1, len(leaves)) == leaves
+    view = memoryview(fhs.leaves._map)
+
+    # The file is not truncated under the referenced memory
+    with pytest.raises(BufferError):
+        fhs.reset()
+    assert view[:len(leaves[0])] == leaves[0]
+    assert fhs.leavesFile.db_file.seek(0, 2) == len(leaves) * fhs.leafSize
+
+    view.release()
+    fhs.reset()
+    assert fhs.leafCount == 0
+
+
+def testIncompleteRecordIsNotCounted(nodesLeaves, tempdir):
+    nodes, leaves = nodesLeaves
+    fhs = writtenFhs(tempdir=tempdir, nodes=nodes, leaves=leaves)
+    # Like if the node crashed while writing a leaf
+    fhs.leavesFile.db_file.write(leaves[0][:10])
+    fhs.close()
+
+    fhs = FileHashStore(tempdir)
+    assert fhs.leafCount == len(leaves)
+    assert fhs.readLeafs(1, len(leaves)) == leaves
+
+    fhs.writeLeaf(leaves[1])
+    assert fhs.readLeaf(len(leaves) + 1) == leaves[1]
+    fhs.close()
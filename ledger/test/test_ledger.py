@@ -84,6 +84,34 @@ def test_query_merkle_info(ledger, genesis_txns, genesis_txn_file):
             sorted(ledger.merkleInfo(i + 1 + offset).items())
 
 
+def test_add_txns(ledger, genesis_txns, genesis_txn_file):
+    offset = len(genesis_txns) if genesis_txn_file else 0
+    txns = [random_txn(i) for i in range(20)]
+    merkle_infos = ledger.add_txns(txns[:7]) + ledger.add_txns(txns[7:])
+    assert ledger.size == 20 + offset
+
+    for i, (txn, mi) in enumerate(zip(txns, merkle_infos)):
+        seqNo = mi.pop(F.seqNo.name)
+        assert i + 1 + offset == seqNo
+        assert sorted(txn.items()) == sorted(ledger[seqNo].items())
+        assert sorted(mi.items()) == sorted(ledger.merkleInfo(seqNo).items())
+    assert ledger.tree.hashStore.is_consistent
+    check_ledger_generator(ledger)
+
+
+def test_add_txns_without_merkle_info(ledger, genesis_txns, genesis_txn_file):
+    offset = len(genesis_txns) if genesis_txn_file else 0
+    txns = [random_txn(i) for i in range(20)]
+
+    assert ledger.add_txns(txns, with_merkle_info=False) == []
+    assert ledger.size == 20 + offset
+    for i, txn in enumerate(txns):
+        assert sorted(txn.items()) == sorted(ledger[i + 1 + offset].items())
+    assert ledger.tree.root_hash == ledger.tree.merkle_tree_hash(0, ledger.size)
+    assert ledger.tree.hashStore.is_consistent
+    check_ledger_generator(ledger)
+
+
 """
 If the server holding the ledger restarts, the ledger should be fully rebuilt
 from persisted data. Any incoming commands should be stashed. (Does this affect
@@ -347,3 +347,68 @@ def testLocate(hasherAndTree, addTxns, storeHashes):
             leafHash, d,
             [unhexlify(h) for h in auditPaths[d]], sth)
     print(time.perf_counter() - startingTime)
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 8, 13])
+def testAppendLeavesSameAsAppend(hasher, batch_size):
+    one_by_one = CompactMerkleTree(hasher=hasher, hashStore=MemoryHashStore())
+    batched = CompactMerkleTree(hasher=hasher, hashStore=MemoryHashStore())
+    leaves = [str(d + 1).encode() for d in range(100)]
+
+    expected = []
+    for leaf in leaves:
+        audit_path = one_by_one.append(leaf)
+        expected.append((audit_path, one_by_one.root_hash))
+
+    actual = []
+    for i in range(0, len(leaves), batch_size):
+        actual.extend(batched.append_leaves(leaves[i:i + batch_size]))
+
+    assert actual == expected
+    assert batched.hashes == one_by_one.hashes
+    assert batched.root_hash == one_by_one.root_hash
+    assert batched.hashStore.readLeafs(1, len(leaves)) == \
+        one_by_one.hashStore.readLeafs(1, len(leaves))
+    assert batched.nodeCount == one_by_one.nodeCount
+    assert batched.hashStore.readNodes(1, batched.nodeCount) == \
+        one_by_one.hashStore.readNodes(1, one_by_one.nodeCount)
+
+
+def testExtendWritesHashStore(hasher, verifier):
+    m = CompactMerkleTree(hasher=hasher,
+                          hashStore=FileHashStore(TemporaryDirectory().name))
+    m.extend([str(d + 1).encode() for d in range(5)])
+    m.extend([str(d + 1).encode() for d in range(5, 20)])
+    assert m.leafCount == 20
+    assert m.hashStore.is_consistent
+    checkConsistency(m, verifier=verifier)
+
+
+def testProofsFromMemoryHashStore(hasher, verifier):
+    m = CompactMerkleTree(hasher=hasher, hashStore=MemoryHashStore())
+    for d in range(10):
+        m.append(str(d + 1).encode())
+    m.extend([str(d + 1).encode() for d in range(10, 50)])
+    file_tree = CompactMerkleTree(hasher=hasher,
+                                  hashStore=FileHashStore(TemporaryDirectory().name))
+    file_tree.extend([str(d + 1).encode() for d in range(50)])
+
+    # Nodes are stored as hashes like in persistent hash stores
+    assert m.nodeCount == m.get_expected_node_count(m.leafCount)
+    assert m.hashStore.readNodes(1, m.nodeCount) == \
+        file_tree.hashStore.readNodes(1, file_tree.nodeCount)
+    assert m.hashStore.is_consistent
+
+    sth = STH(m.tree_size, m.root_hash)
+    for d in range(m.tree_size):
+        proof = m.inclusion_proof(d, m.tree_size)
+        assert proof == file_tree.inclusion_proof(d, file_tree.tree_size)
+        verifier.verify_leaf_inclusion(str(d + 1).encode(), d, proof, sth)
+
+    for d in range(1, m.tree_size):
+        proof = m.consistency_proof(d, m.tree_size)
+        assert proof == file_tree.consistency_proof(d, file_tree.tree_size)
+        verifier.verify_tree_consistency(d, m.tree_size,
+                                         m.merkle_tree_hash(0, d),
+                                         m.root_hash,
+                                         proof)
@@ -27,6 +27,27 @@ class TreeHasher(object):
         hasher.update(b"\x01" + left + right)
         return hasher.digest()
 
+    def hash_leaves(self, leaves):
+        """Hash a whole level of leaves, same as hash_leaf for each of them."""
+        if type(self).hash_leaf is not TreeHasher.hash_leaf:
+            return [self.hash_leaf(leaf) for leaf in leaves]
+        hashfunc = self.hashfunc
+        return [hashfunc(b"\x00" + leaf).digest() for leaf in leaves]
+
+    def hash_level(self, hashes):
+        """Hash every pair of adjacent nodes of a level, same as hash_children
+        for each pair, and return the nodes of the level above.
+
+        An odd node at the end of the level has no pair, so it is not
+        included into the result.
+        """
+        it = iter(hashes)
+        if type(self).hash_children is not TreeHasher.hash_children:
+            return [self.hash_children(left, right) for left, right in zip(it, it)]
+        hashfunc = self.hashfunc
+        return [hashfunc(b"\x01" + left + right).digest()
+                for left, right in zip(it, it)]
+
     def _hash_full(self, leaves, l_idx, r_idx):
         """Hash the leaves between (l_idx, r_idx) as a valid entire tree.
 
@@ -42,24 +63,19 @@ class TreeHasher(object):
             raise IndexError("{},{} not a valid range over [0,{}]".format(
                 l_idx, r_idx, len(leaves)))
 
-        width = r_idx - l_idx
-        if width == 0:
+        if l_idx == r_idx:
             return self.hash_empty(), ()
-        elif width == 1:
-            leaf_hash = self.hash_leaf(leaves[l_idx])
-            return leaf_hash, (leaf_hash,)
-        else:
-            # next smallest power of 2
-            split_width = 2**((width - 1).bit_length() - 1)
-            assert split_width < width <= 2 * split_width
-            l_root, l_hashes = self._hash_full(
-                leaves, l_idx, l_idx + split_width)
-            assert len(l_hashes) == 1  # left tree always full
-            r_root, r_hashes = self._hash_full(
-                leaves, l_idx + split_width, r_idx)
-            root_hash = self.hash_children(l_root, r_root)
-            return (root_hash, (root_hash,) if split_width * 2 == width else
-                    l_hashes + r_hashes)
+        # Hash the tree layer by layer. Every layer keeps only complete
+        # nodes, so an odd node at the end of a layer is the root of one
+        # of the full subtrees which form the tree.
+        level = self.hash_leaves(leaves[l_idx:r_idx])
+        hashes = []
+        while level:
+            if len(level) % 2:
+                hashes.append(level[-1])
+            level = self.hash_level(level)
+        hashes = tuple(reversed(hashes))
+        return self._hash_fold(hashes), hashes
 
     def _hash_fold(self, hashes):
         rev_hashes = iter(hashes[::-1])
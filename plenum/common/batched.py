@@ -1,10 +1,11 @@
 from collections import deque
+from functools import partial
 from typing import Any, Iterable, Dict
 
 from plenum.common.util import z85_to_friendly
 from plenum.common.constants import BATCH, OP_FIELD_NAME
 from plenum.common.metrics_collector import NullMetricsCollector, MetricsName
-from plenum.common.prepare_batch import split_messages_on_batches
+from plenum.common.prepare_batch import split_messages_on_batches, BatchFormat
 from stp_core.common.constants import CONNECTION_PREFIX
 from stp_core.crypto.signer import Signer
 from stp_core.common.log import getlogger
@@ -13,6 +14,8 @@ from plenum.common.messages.node_messages import Batch
 from plenum.common.message_processor import MessageProcessor
 from stp_core.validators.message_length_validator import MessageLenValidator
 from stp_core.common.config.util import getConfig
+from stp_zmq import codec
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC
 
 logger = getlogger()
 
@@ -33,6 +36,7 @@ class Batched(MessageProcessor):
         self.msg_len_val = MessageLenValidator(self.stp_config.MSG_LEN_LIMIT)
         self.metrics = metrics
         self.enabled = self.stp_config.TRANSPORT_BATCH_ENABLED
+        self._batch_formats = {}  # type: Dict[str, BatchFormat]
 
     def _enqueue(self, msg: Any, rid: int, signer: Signer) -> None:
         """
@@ -71,21 +75,23 @@ class Batched(MessageProcessor):
         """
         # Signing (if required) and serializing before enqueueing otherwise
         # each call to `_enqueue` will have to sign it and `transmit` will try
-        # to serialize it which is waste of resources
-        message_parts, err_msg = \
-            self.prepare_for_sending(msg, signer, message_splitter)
-
-        # TODO: returning breaks contract of super class
-        if err_msg is not None:
-            return False, err_msg
-
-        if rids:
-            for r in rids:
-                for part in message_parts:
-                    self._enqueue(part, r, signer)
-        else:
-            for part in message_parts:
-                self._enqueueIntoAllRemotes(part, signer)
+        # to serialize it which is waste of resources. The message is
+        # serialized once per codec used by the remotes.
+        if not rids:
+            rids = list(self.remotes.keys())
+        codecs = {r: self.remote_codec(r) for r in rids}
+        message_parts = {}
+        for codec_name in set(codecs.values()) or {JSON_CODEC}:
+            message_parts[codec_name], err_msg = \
+                self.prepare_for_sending(msg, signer, message_splitter, codec_name)
+
+            # TODO: returning breaks contract of super class
+            if err_msg is not None:
+                return False, err_msg
+
+        for r in rids:
+            for part in message_parts[codecs[r]]:
+                self._enqueue(part, r, signer)
         return True, None
 
     def flushOutBoxes(self) -> None:
@@ -93,27 +99,28 @@ class Batched(MessageProcessor):
         Clear the outBoxes and transmit batched messages to remotes.
         """
         removedRemotes = []
+        # Broadcast messages are enqueued to all the remotes, so the same
+        # batches are made only once and the same bytes are sent to them
+        batches_cache = {}
         for rid, msgs in self.outBoxes.items():
             try:
                 dest = self.remotes[rid].name
+                codec_name = self.remotes[rid].codec
             except KeyError:
                 removedRemotes.append(rid)
                 continue
             if msgs:
+                if self.binary_codec_enabled and codec_name == JSON_CODEC:
+                    self._reencode_binary_msgs(msgs, dest)
                 if self._should_batch(msgs):
-                    logger.trace(
-                        "{} batching {} msgs to {} into fewer transmissions".
-                        format(self, len(msgs), dest))
-                    logger.trace("    messages: {}".format(msgs))
-                    batches = split_messages_on_batches(list(msgs),
-                                                        self._make_batch,
-                                                        self._test_batch_len,
-                                                        )
+                    logger.trace("%s batching %s msgs to %s into fewer transmissions",
+                                 self, len(msgs), dest)
+                    logger.trace("    messages: %s", msgs)
+                    batches = self._split_on_batches(list(msgs), codec_name, batches_cache)
                     msgs.clear()
                     if batches:
                         for batch, size in batches:
-                            logger.trace("{} sending payload to {}: {}".format(
-                                self, dest, batch))
+                            logger.trace("%s sending payload to %s: %s", self, dest, batch)
                             self.metrics.add_event(MetricsName.TRANSPORT_BATCH_SIZE, size)
                             # Setting timeout to never expire
                             self.transmit(
@@ -128,8 +135,7 @@ class Batched(MessageProcessor):
                 else:
                     while msgs:
                         msg = msgs.popleft()
-                        logger.trace(
-                            "{} sending msg {} to {}".format(self, msg, dest))
+                        logger.trace("%s sending msg %s to %s", self, msg, dest)
                         self.metrics.add_event(MetricsName.TRANSPORT_BATCH_SIZE, 1)
                         # Setting timeout to never expire
                         self.transmit(msg, rid, timeout=self.messageTimeout,
@@ -147,14 +153,56 @@ class Batched(MessageProcessor):
                              logMethod=logger.debug)
             del self.outBoxes[rid]
 
-    def _make_batch(self, msgs):
+    def _split_on_batches(self, msgs, codec_name, batches_cache):
+        # Messages are compared by identity: the same serialized message
+        # is enqueued to every remote it is broadcast to. The messages are
+        # kept in the cache, so their ids cannot be reused while it is alive.
+        key = (codec_name, tuple(map(id, msgs)))
+        if key not in batches_cache:
+            batches = split_messages_on_batches(msgs,
+                                                partial(self._make_batch, codec_name=codec_name),
+                                                self._test_batch_len,
+                                                self._batch_format(codec_name))
+            batches_cache[key] = (msgs, batches)
+        return batches_cache[key][1]
+
+    def _make_batch(self, msgs, codec_name=JSON_CODEC):
         if len(msgs) > 1:
-            batch = Batch(msgs, None)
-            serialized_batch = self.sign_and_serialize(batch)
+            batch_format = self._batch_format(codec_name)
+            serialized_batch = batch_format.make_batch([batch_format.encode_item(msg) for msg in msgs])
         else:
             serialized_batch = msgs[0]
         return serialized_batch
 
+    def _batch_format(self, codec_name) -> BatchFormat:
+        if codec_name not in self._batch_formats:
+            if codec_name == MSGPACK_CODEC:
+                batch_format = BatchFormat(codec.BATCH_FRAME_PREFIX, b'', b'', codec.binary_batch_item)
+            else:
+                # Layout of a JSON batch is taken from a serialized batch of
+                # two messages to match the serializer exactly
+                first, second = codec.json_batch_item('x'), codec.json_batch_item('y')
+                template = self.sign_and_serialize(Batch(['x', 'y'], None))
+                first_end = template.index(first) + len(first)
+                second_start = template.index(second, first_end)
+                batch_format = BatchFormat(template[:first_end - len(first)],
+                                           template[first_end:second_start],
+                                           template[second_start + len(second):],
+                                           codec.json_batch_item)
+            self._batch_formats[codec_name] = batch_format
+        return self._batch_formats[codec_name]
+
+    def _reencode_binary_msgs(self, msgs: deque, dest):
+        # Messages serialized in binary codec for a remote which stopped
+        # supporting it are serialized again as JSON
+        if not any(codec.is_binary_frame(msg) for msg in msgs):
+            return
+        logger.info("{}remote {} does not support binary codec anymore, "
+                    "re-serializing messages to it as JSON".format(CONNECTION_PREFIX, dest))
+        reencoded = [codec.to_json_frame(msg) for msg in msgs]
+        msgs.clear()
+        msgs.extend(reencoded)
+
     def _test_batch_len(self, batch_len):
         return self.msg_len_val.is_len_less_than_limit(batch_len)
 
@@ -174,12 +222,13 @@ class Batched(MessageProcessor):
         return msg
 
     def prepare_for_sending(self, msg, signer,
-                            message_splitter=lambda x: None):
+                            message_splitter=lambda x: None,
+                            codec_name=JSON_CODEC):
         large_msg_parts = [msg]
         fine_msg_parts = []
         while len(large_msg_parts):
             part = large_msg_parts.pop()
-            part_bytes = self.sign_and_serialize(part, signer)
+            part_bytes = self.sign_and_serialize(part, signer, codec_name)
             if self.msg_len_val.is_len_less_than_limit(len(part_bytes)):
                 fine_msg_parts.append(part_bytes)
                 continue
@@ -197,9 +246,9 @@ class Batched(MessageProcessor):
 
         return fine_msg_parts, None
 
-    def sign_and_serialize(self, msg, signer=None):
+    def sign_and_serialize(self, msg, signer=None, codec_name=JSON_CODEC):
         payload = self.prepForSending(msg, signer)
-        msg_bytes = self.serializeMsg(payload)
+        msg_bytes = self.serializeMsg(payload, codec_name)
         return msg_bytes
 
     def _should_batch(self, msgs):
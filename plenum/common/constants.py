@@ -273,6 +273,7 @@ ATTRIB_LABEL = 'attrib'
 SEQ_NO_DB_LABEL = 'seq_no_db'
 NODE_STATUS_DB_LABEL = 'node_status_db'
 LAST_SENT_PP_STORE_LABEL = 'last_sent_pp_store'
+AUDIT_INDEX_LABEL = 'audit_index'
 
 VALID_LEDGER_IDS = (POOL_LEDGER_ID, DOMAIN_LEDGER_ID, CONFIG_LEDGER_ID, AUDIT_LEDGER_ID)
 
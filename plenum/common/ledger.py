@@ -1,4 +1,4 @@
-from copy import copy
+from collections import deque
 from typing import List, Tuple
 
 from common.exceptions import PlenumValueError, LogicError
@@ -18,6 +18,10 @@ class Ledger(_Ledger):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        # Uncommitted trees after applying each of the uncommitted batches,
+        # so that discarding a batch does not need re-hashing of the txns
+        # left uncommitted
+        self._uncommitted_trees = deque()
 
     @property
     def uncommitted_size(self) -> int:
@@ -52,6 +56,7 @@ class Ledger(_Ledger):
         self.uncommittedRootHash = self.uncommittedTree.root_hash
         self.uncommittedTxns.extend(txns)
         if txns:
+            self._uncommitted_trees.append(self.uncommittedTree)
             return (uncommittedSize + 1, uncommittedSize + len(txns)), txns
         else:
             return (uncommittedSize, uncommittedSize), txns
@@ -64,6 +69,16 @@ class Ledger(_Ledger):
         merkle_info.pop(F.seqNo.name, None)
         return merkle_info
 
+    def add_txns(self, txns, with_merkle_info=True):
+        for seq_no, txn in enumerate(txns, start=self.seqNo + 1):
+            if get_seq_no(txn) is None:
+                append_txn_metadata(txn, seq_no=seq_no)
+        merkle_infos = super().add_txns(txns, with_merkle_info)
+        # seqNo is part of the transaction itself, so no need to duplicate it here
+        for merkle_info in merkle_infos:
+            merkle_info.pop(F.seqNo.name, None)
+        return merkle_infos
+
     def _append_seq_no(self, txns, start_seq_no):
         # TODO: Fix name `start_seq_no`, it is misleading. The seq no start from `start_seq_no`+1
         seq_no = start_seq_no
@@ -80,16 +95,20 @@ class Ledger(_Ledger):
         numbers of the committed txns
         """
         committedSize = self.size
-        committedTxns = []
-        for txn in self.uncommittedTxns[:count]:
-            txn.update(self.append(txn))
-            committedTxns.append(txn)
+        committedTxns = self.uncommittedTxns[:count]
+        # All txns of the batch are written to the transaction log and
+        # the hash store in one batch
+        for txn, merkle_info in zip(committedTxns, self.add_txns(committedTxns)):
+            txn.update(merkle_info)
         self.uncommittedTxns = self.uncommittedTxns[count:]
         logger.debug('Committed {} txns, {} are uncommitted'.
                      format(len(committedTxns), len(self.uncommittedTxns)))
         if not self.uncommittedTxns:
             self.uncommittedTree = None
             self.uncommittedRootHash = None
+        while self._uncommitted_trees and \
+                self._uncommitted_trees[0].tree_size <= self.size:
+            self._uncommitted_trees.popleft()
         # Do not change `uncommittedTree` or `uncommittedRootHash`
         # if there are any `uncommittedTxns` since the ledger still has a
         # valid uncommittedTree and a valid root hash which are
@@ -106,8 +125,6 @@ class Ledger(_Ledger):
         :param count:
         :return:
         """
-        # TODO: This can be optimised if multiple discards are combined
-        # together since merkle root computation will be done only once.
         if count == 0:
             return
         if count > len(self.uncommittedTxns):
@@ -118,9 +135,9 @@ class Ledger(_Ledger):
         if not self.uncommittedTxns:
             self.uncommittedTree = None
             self.uncommittedRootHash = None
+            self._uncommitted_trees.clear()
         else:
-            self.uncommittedTree = self.treeWithAppliedTxns(
-                self.uncommittedTxns)
+            self.uncommittedTree = self._discard_uncommitted_trees(self.uncommitted_size)
             self.uncommittedRootHash = self.uncommittedTree.root_hash
         logger.info('Discarding {} txns and root hash {} and new root hash is {}. {} are still uncommitted'.
                     format(count, Ledger.hashToStr(old_hash), Ledger.hashToStr(self.uncommittedRootHash),
@@ -136,16 +153,32 @@ class Ledger(_Ledger):
         # Copying the tree is not a problem since its a Compact Merkle Tree
         # so the size of the tree would be 32*(lg n) bytes where n is the
         # number of leaves (no. of txns)
-        tempTree = copy(currentTree)
-        for txn in txns:
-            s = self.serialize_for_tree(txn)
-            tempTree.append(s)
-        return tempTree
+        # All txns are hashed into the tree at once, a whole level at a time
+        return currentTree.extended([self.serialize_for_tree(txn) for txn in txns])
+
+    def _discard_uncommitted_trees(self, size):
+        """
+        Drop uncommitted trees bigger than `size` and return the tree of
+        the given size
+        """
+        trees = self._uncommitted_trees
+        while trees and trees[-1].tree_size > size:
+            trees.pop()
+        if trees and trees[-1].tree_size == size:
+            return trees[-1]
+        # Txns were discarded not by whole batches, so the txns left from
+        # a partially discarded batch need to be applied again
+        base_tree = trees[-1] if trees else self.tree
+        tree = self.treeWithAppliedTxns(
+            self.uncommittedTxns[base_tree.tree_size - self.size:], base_tree)
+        trees.append(tree)
+        return tree
 
     def reset_uncommitted(self):
         self.uncommittedTxns = []
         self.uncommittedRootHash = None
         self.uncommittedTree = None
+        self._uncommitted_trees.clear()
 
     def get_uncommitted_txns(self):
         return self.uncommittedTxns
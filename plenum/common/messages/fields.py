@@ -2,6 +2,7 @@ import ipaddress
 import json
 import re
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
 from typing import Iterable, Type
 
 import base58
@@ -38,6 +39,18 @@ class FieldValidator(metaclass=ABCMeta):
         :return: error message or None
         """
 
+    def validate_items(self, vals):
+        """
+        Validates values of an iterable field
+
+        :param vals: values to validate
+        :return: error message of the first invalid value or None
+        """
+        for v in vals:
+            check_er = self.validate(v)
+            if check_er:
+                return check_er
+
 
 class FieldBase(FieldValidator, metaclass=ABCMeta):
     """
@@ -83,10 +96,8 @@ class FieldBase(FieldValidator, metaclass=ABCMeta):
     def __type_check(self, val):
         if self._base_types is None:
             return  # type check is disabled
-        for t in self._base_types:
-            if isinstance(val, t):
-                return
-        return self._wrong_type_msg(val)
+        if not isinstance(val, self._base_types):
+            return self._wrong_type_msg(val)
 
     def _wrong_type_msg(self, val):
         types_str = ', '.join(map(lambda x: x.__name__, self._base_types))
@@ -143,6 +154,16 @@ class LimitedLengthStringField(FieldBase):
             val = val[:100] + ('...' if len(val) > 100 else '')
             return '{} is longer than {} symbols'.format(val, self._max_length)
 
+    def validate_items(self, vals):
+        # Values are usually valid, so their types and lengths are checked
+        # all at once and one by one only to find the error. Subclasses
+        # check more than that, so they validate values one by one.
+        if type(self) is LimitedLengthStringField and vals and set(map(type, vals)) == {str}:
+            lengths = list(map(len, vals))
+            if (self._can_be_empty or min(lengths) > 0) and max(lengths) <= self._max_length:
+                return
+        return super().validate_items(vals)
+
 
 class DatetimeStringField(FieldBase):
     _base_types = (str,)
@@ -252,10 +273,7 @@ class IterableField(FieldBase):
             if len(val) > self.max_length:
                 return 'length should be at most {}'.format(self.max_length)
 
-        for v in val:
-            check_er = self.inner_field_type.validate(v)
-            if check_er:
-                return check_er
+        return self.inner_field_type.validate_items(val)
 
 
 class MapField(FieldBase):
@@ -351,25 +369,32 @@ class LedgerIdField(ChooseField):
         return VALID_LEDGER_IDS + tuple(PLUGIN_LEDGER_IDS)
 
 
+@lru_cache(maxsize=4096)
+def _b58_decoded_len(val: str) -> int:
+    # Decoding is slow while the same values (like state and txn roots of
+    # a batch) come in many messages
+    return len(base58.b58decode(val))
+
+
 class Base58Field(FieldBase):
     _base_types = (str,)
     _alphabet = set(base58.alphabet.decode("utf-8"))
+    _regex = re.compile('[{}]*'.format(base58.alphabet.decode("utf-8")))
 
     def __init__(self, byte_lengths=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.byte_lengths = byte_lengths
 
     def _specific_validation(self, val):
-        invalid_chars = set(val) - self._alphabet
-        if invalid_chars:
+        if self._regex.fullmatch(val) is None:
+            invalid_chars = set(val) - self._alphabet
             # only 10 chars to shorten the output
             # TODO: Why does it need to be sorted
             to_print = sorted(invalid_chars)[:10]
             return 'should not contain the following chars {}{}'.format(
                 to_print, ' (truncated)' if len(to_print) < len(invalid_chars) else '')
         if self.byte_lengths is not None:
-            # TODO could impact performance, need to check
-            b58len = len(base58.b58decode(val))
+            b58len = _b58_decoded_len(val)
             if b58len not in self.byte_lengths:
                 expected_length = list(self.byte_lengths)[0] if len(self.byte_lengths) == 1 \
                     else 'one of {}'.format(list(self.byte_lengths))
@@ -530,7 +555,8 @@ class JsonField(LimitedLengthStringField):
 
 
 class SerializedValueField(FieldBase):
-    _base_types = (bytes, str)
+    # Messages of binary batches are memoryviews of the received batch
+    _base_types = (bytes, str, memoryview)
 
     def _specific_validation(self, val):
         if not val and not self.nullable:
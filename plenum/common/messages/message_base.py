@@ -9,12 +9,27 @@ from plenum.common.exceptions import MissingProtocolVersionError
 from plenum.common.messages.fields import FieldValidator
 
 
+class CompiledSchema:
+    """
+    Schema prepared for validating many messages: the validators are looked
+    up by field name and the required fields are known beforehand
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.names = tuple(map(itemgetter(0), schema))
+        self.fields = dict(schema)
+        self.required = frozenset(name for name, field in schema
+                                  if not field.optional)
+
+
 class MessageValidator(FieldValidator):
     # the schema has to be an ordered iterable because the message class
     # can be create with positional arguments __init__(*args)
 
     schema = ()
     schema_is_strict = SCHEMA_IS_STRICT
+    _compiled_schema = None
 
     def __init__(self, schema_is_strict=SCHEMA_IS_STRICT, optional: bool = False):
         self.schema_is_strict = schema_is_strict
@@ -28,21 +43,35 @@ class MessageValidator(FieldValidator):
     def _validate_fields_with_schema(self, dct, schema):
         if not isinstance(dct, dict):
             self._raise_invalid_type(dct)
-        schema_dct = dict(schema)
-        required_fields = filter(lambda x: not x[1].optional, schema)
-        required_field_names = map(lambda x: x[0], required_fields)
-        missed_required_fields = set(required_field_names) - set(dct)
+        compiled_schema = self._compile_schema(schema)
+        missed_required_fields = compiled_schema.required.difference(dct)
         if missed_required_fields:
             self._raise_missed_fields(*missed_required_fields)
+        fields = compiled_schema.fields
         for k, v in dct.items():
-            if k not in schema_dct:
+            field = fields.get(k)
+            if field is None:
                 if self.schema_is_strict:
                     self._raise_unknown_fields(k, v)
             else:
-                validation_error = schema_dct[k].validate(v)
+                validation_error = field.validate(v)
                 if validation_error:
                     self._raise_invalid_fields(k, v, validation_error)
 
+    def _compile_schema(self, schema) -> CompiledSchema:
+        # Schema of a message class is compiled once. Schemas can be
+        # replaced though (by plugins or by the instances of validators
+        # having their own ones), then they are compiled again.
+        compiled_schema = self._compiled_schema
+        if compiled_schema is not None and compiled_schema.schema is schema:
+            return compiled_schema
+        compiled_schema = CompiledSchema(schema)
+        if schema is type(self).schema:
+            type(self)._compiled_schema = compiled_schema
+        elif schema is self.schema:
+            self._compiled_schema = compiled_schema
+        return compiled_schema
+
     def _validate_message(self, dct):
         return None
 
@@ -103,13 +132,16 @@ class MessageBase(Mapping, MessageValidator):
 
         input_as_dict = self._post_process(input_as_dict)
 
+        self._set_fields(input_as_dict)
+
+    def _set_fields(self, input_as_dict: Dict):
         self._fields = OrderedDict(
             (name, input_as_dict[name])
             for name, _ in self.schema
             if name in input_as_dict)
 
     def _join_with_schema(self, args):
-        return dict(zip(map(itemgetter(0), self.schema), args))
+        return dict(zip(self._compile_schema(self.schema).names, args))
 
     def _post_process(self, input_as_dict: Dict) -> Dict:
         return input_as_dict
@@ -184,3 +216,68 @@ class MessageBase(Mapping, MessageValidator):
 
     def __contains__(self, key):
         return key in self._fields
+
+
+class CompactMessageBase(MessageBase):
+    """
+    Message keeping names and values of its fields in tuples rather than in
+    an OrderedDict. Such a message takes less memory and less time to create,
+    so messages which are created in great numbers (like PREPARE and COMMIT)
+    derive from it. A message having all the fields of the schema shares the
+    tuple of names with other messages of its type.
+    """
+
+    def _set_fields(self, input_as_dict: Dict):
+        compiled_schema = self._compile_schema(self.schema)
+        if compiled_schema.fields.keys() <= input_as_dict.keys():
+            self._names = compiled_schema.names
+        else:
+            self._names = tuple(name for name in compiled_schema.names
+                                if name in input_as_dict)
+        self._values = tuple(map(input_as_dict.__getitem__, self._names))
+
+    @property
+    def _fields(self):
+        return OrderedDict(zip(self._names, self._values))
+
+    def __getattr__(self, item):
+        if item in self._names:
+            return self._values[self._names.index(item)]
+        raise AttributeError(
+            "'{}' object has no attribute '{}'"
+            .format(self.__class__.__name__, item)
+        )
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self._values[key])
+        if isinstance(key, int):
+            return self._values[key]
+        raise TypeError("Invalid argument type.")
+
+    @property
+    def __dict__(self):
+        """
+        Return a dictionary form.
+        """
+        m = OrderedDict(((OP_FIELD_NAME, self.typename),))
+        m.update(zip(self._names, self._values))
+        return m
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def items(self):
+        return tuple(zip(self._names, self._values))
+
+    def keys(self):
+        return self._names
+
+    def values(self):
+        return self._values
+
+    def __contains__(self, key):
+        return key in self._names
@@ -13,7 +13,7 @@ from plenum.common.messages.fields import NonNegativeNumberField, IterableField,
     LedgerIdField, MerkleRootField, Base58Field, LedgerInfoField, AnyField, ChooseField, AnyMapField, \
     LimitedLengthStringField, BlsMultiSignatureField, ProtocolVersionField, BooleanField, \
     IntegerField, BatchIDField, ViewChangeField, MapField, StringifiedNonNegativeNumberField
-from plenum.common.messages.message_base import MessageBase
+from plenum.common.messages.message_base import MessageBase, CompactMessageBase
 from plenum.common.types import f
 from plenum.config import NAME_FIELD_LIMIT, DIGEST_FIELD_LIMIT, SENDER_CLIENT_FIELD_LIMIT, HASH_FIELD_LIMIT, \
     SIGNATURE_FIELD_LIMIT, BLS_SIG_LIMIT
@@ -114,6 +114,22 @@ class Propagate(MessageBase):
         (f.SENDER_CLIENT.nm, LimitedLengthStringField(max_length=SENDER_CLIENT_FIELD_LIMIT, nullable=True)),
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._request_obj = None
+
+    def get_request(self, request_class):
+        """
+        Request object made of the `request` field. It's needed both for
+        signature verification and processing of the PROPAGATE, so it's
+        created and its digests are calculated only once.
+
+        :param request_class: class of client requests
+        """
+        if self._request_obj is None:
+            self._request_obj = request_class(**self.request)
+        return self._request_obj
+
 
 class PrePrepare(MessageBase):
     schema = (
@@ -180,7 +196,7 @@ class OldViewPrePrepareReply(MessageBase):
     )
 
 
-class Prepare(MessageBase):
+class Prepare(CompactMessageBase):
     typename = PREPARE
     schema = (
         (f.INST_ID.nm, NonNegativeNumberField()),
@@ -196,7 +212,7 @@ class Prepare(MessageBase):
     )
 
 
-class Commit(MessageBase):
+class Commit(CompactMessageBase):
     typename = COMMIT
     schema = (
         (f.INST_ID.nm, NonNegativeNumberField()),
@@ -213,7 +229,7 @@ class Commit(MessageBase):
     )
 
 
-class Checkpoint(MessageBase):
+class Checkpoint(CompactMessageBase):
     typename = CHECKPOINT
     schema = (
         (f.INST_ID.nm, NonNegativeNumberField()),
@@ -96,6 +96,22 @@ class MetricsName(IntEnum):
     PROPAGATES_PHASE_REQ_TIMEOUTS = 75
     ORDERING_PHASE_REQ_TIMEOUTS = 76
     AUTH_RULES_FROM_STATE_COUNT = 77
+    # State trie node caches statistics, for all ledgers
+    STATE_TRIE_NODE_CACHE_HITS = 78
+    STATE_TRIE_NODE_CACHE_MISSES = 79
+    STATE_TRIE_NODE_CACHE_SIZE = 80
+    # State trie pruning statistics, for all ledgers
+    STATE_PRUNING_TIME = 81
+    STATE_PRUNED_NODES = 82
+    # Number of messages waiting for signature verification by workers
+    CLIENT_SIG_VERIFICATION_QUEUE_SIZE = 83
+    NODE_SIG_VERIFICATION_QUEUE_SIZE = 84
+    # Time from an event to prodding by the looper woken up by it
+    LOOPER_IO_WAKEUP_LATENCY = 85
+    LOOPER_TIMER_WAKEUP_LATENCY = 86
+    # Bytes of a received message copied before it is deserialized
+    INCOMING_NODE_MESSAGE_BYTES_COPIED = 87
+    INCOMING_CLIENT_MESSAGE_BYTES_COPIED = 88
 
     # Node service statistics
     NODE_PROD_TIME = 100
@@ -1,3 +1,5 @@
+from typing import Any, Callable, Optional, Sequence
+
 from stp_core.common.log import getlogger
 
 SPLIT_STEPS_LIMIT = 8
@@ -5,8 +7,84 @@ SPLIT_STEPS_LIMIT = 8
 logger = getlogger()
 
 
-def split_messages_on_batches(msgs, make_batch_func, is_batch_len_under_limit):
+class BatchFormat:
+    """
+    Layout of a serialized batch of several messages: a prefix, the messages
+    encoded as items and joined by a separator, and a suffix. It allows to
+    know the length of a batch without making it.
+    """
+
+    def __init__(self, prefix: bytes, separator: bytes, suffix: bytes,
+                 encode_item: Callable[[Any], bytes]):
+        self.prefix = prefix
+        self.separator = separator
+        self.suffix = suffix
+        self.encode_item = encode_item
+
+    def batch_len(self, items_len: int, count: int) -> int:
+        """
+        Length of a batch of `count` items having `items_len` length in total
+        """
+        return len(self.prefix) + items_len + len(self.separator) * (count - 1) + len(self.suffix)
+
+    def make_batch(self, items: Sequence[bytes]) -> bytes:
+        return self.prefix + self.separator.join(items) + self.suffix
+
+
+def split_messages_on_batches(msgs, make_batch_func, is_batch_len_under_limit,
+                              batch_format: Optional[BatchFormat] = None):
+    """
+    Split messages on batches not exceeding the length limit, each batch
+    takes as many messages as fit into it.
+
+    :param msgs: messages to split
+    :param make_batch_func: makes a batch of the messages
+    :param is_batch_len_under_limit: checks that batch of the given length can be sent
+    :param batch_format: layout of batches made by `make_batch_func` of more
+    than one message, if it is known each message is encoded only once
+    and each batch is made only once
+    :return: list of batches with number of messages in each of them or None
+    if some message cannot be sent even on its own
+    """
+    if batch_format is None:
+        return _split_remaking_batches(msgs, make_batch_func, is_batch_len_under_limit)
+
+    batches = []
+    msgs_for_batch = []
+    items = []
+    items_len = 0
+    for msg in msgs:
+        serialized_msg = make_batch_func([msg])
+        if not is_batch_len_under_limit(len(serialized_msg)):
+            logger.display('The message {}... is too long ({}). '
+                           'Batches were not created'.format(serialized_msg[:256], len(serialized_msg)))
+            return
+        item = batch_format.encode_item(msg)
+        if msgs_for_batch and not is_batch_len_under_limit(
+                batch_format.batch_len(items_len + len(item), len(items) + 1)):
+            batches.append(_make_batch(msgs_for_batch, items, make_batch_func, batch_format))
+            msgs_for_batch = []
+            items = []
+            items_len = 0
+        msgs_for_batch.append(msg)
+        items.append(item)
+        items_len += len(item)
+    if msgs_for_batch:
+        batches.append(_make_batch(msgs_for_batch, items, make_batch_func, batch_format))
+    if len(batches) == 0:
+        batches = [(make_batch_func([]), 0)]
+    return batches
+
+
+def _make_batch(msgs, items, make_batch_func, batch_format):
+    if len(msgs) == 1:
+        return make_batch_func(msgs), 1
+    return batch_format.make_batch(items), len(msgs)
+
 
+def _split_remaking_batches(msgs, make_batch_func, is_batch_len_under_limit):
+    # Batch is made again after adding each message to it since its length
+    # cannot be known otherwise
     batches = []
     while msgs:
         batch = ''
@@ -1,5 +1,6 @@
+from copy import deepcopy
 from hashlib import sha256
-from typing import Mapping, NamedTuple, Dict
+from typing import Mapping, NamedTuple, Dict, Iterable
 
 from common.serializers.serialization import serialize_msg_for_signing
 from plenum.common.constants import REQKEY, FORCE, TXN_TYPE, OPERATION_SCHEMA_IS_STRICT
@@ -10,8 +11,63 @@ from stp_core.types import Identifier
 from plenum import PLUGIN_CLIENT_REQUEST_FIELDS
 
 
+class ReadOnlyRequestData(dict):
+    """
+    Request data which cannot be modified, so that it can be passed to any
+    number of authenticators without copying. Serializations for signing are
+    computed once and cached.
+    Note that only top level fields are protected from modification.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._serializations = {}
+        self._parent = None
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("{} cannot be modified".format(self.__class__.__name__))
+
+    __setitem__ = __delitem__ = _read_only
+    pop = popitem = clear = update = setdefault = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def without(self, keys: Iterable) -> 'ReadOnlyRequestData':
+        """
+        :return: request data without the given top level fields, sharing
+        cached serializations with this one
+        """
+        keys = frozenset(keys)
+        rv = ReadOnlyRequestData((k, v) for k, v in self.items() if k not in keys)
+        rv._parent = (self, keys)
+        return rv
+
+    def set_serialized_for_signing(self, keys_to_ignore: Iterable, serialized: bytes):
+        self._serializations[frozenset(keys_to_ignore)] = serialized
+
+    def serialized_for_signing(self, keys_to_ignore: Iterable = ()) -> bytes:
+        keys_to_ignore = frozenset(keys_to_ignore)
+        if self._parent is not None:
+            parent, parent_keys_to_ignore = self._parent
+            return parent.serialized_for_signing(parent_keys_to_ignore | keys_to_ignore)
+        serialized = self._serializations.get(keys_to_ignore)
+        if serialized is None:
+            serialized = serialize_msg_for_signing(self, topLevelKeysToIgnore=keys_to_ignore)
+            self._serializations[keys_to_ignore] = serialized
+        return serialized
+
+
 class Request:
     idr_delimiter = ','
+    # top level fields which are not signed
+    not_signed_fields = frozenset({f.SIG.nm, f.SIGS.nm, f.FEES.nm})
 
     def __init__(self,
                  identifier: Identifier = None,
@@ -34,6 +90,7 @@ class Request:
         self.endorser = endorser
         self._digest = None
         self._payload_digest = None
+        self._serialized_payload = None
         for nm in PLUGIN_CLIENT_REQUEST_FIELDS:
             if nm in kwargs:
                 setattr(self, nm, kwargs[nm])
@@ -87,7 +144,25 @@ class Request:
         return sha256(serialize_msg_for_signing(self.signingState())).hexdigest()
 
     def getPayloadDigest(self):
-        return sha256(serialize_msg_for_signing(self.signingPayloadState())).hexdigest()
+        return sha256(self.serialized_payload()).hexdigest()
+
+    def serialized_payload(self) -> bytes:
+        if getattr(self, '_serialized_payload', None) is None:
+            self._serialized_payload = serialize_msg_for_signing(self.signingPayloadState())
+        return self._serialized_payload
+
+    def as_read_only_dict(self) -> ReadOnlyRequestData:
+        """
+        Request data for authenticators. If the signed fields are the same as
+        the payload ones, the serialization for signing is shared with the
+        payload digest calculation.
+        """
+        rv = ReadOnlyRequestData(self.as_dict)
+        if self._identifier is not None and \
+                type(self).signingPayloadState is Request.signingPayloadState and \
+                not any(hasattr(self, nm) for nm in PLUGIN_CLIENT_REQUEST_FIELDS if nm not in self.not_signed_fields):
+            rv.set_serialized_for_signing(self.not_signed_fields, self.serialized_payload())
+        return rv
 
     def __getstate__(self):
         return self.__dict__
@@ -45,7 +45,8 @@ class ClientZStack(simple_zstack_class, MessageProcessor):
             metrics=metrics,
             mt_incoming_size=MetricsName.INCOMING_CLIENT_MESSAGE_SIZE,
             mt_outgoing_size=MetricsName.OUTGOING_CLIENT_MESSAGE_SIZE,
-            timer=timer)
+            timer=timer,
+            mt_incoming_copied=MetricsName.INCOMING_CLIENT_MESSAGE_BYTES_COPIED)
         MessageProcessor.__init__(self, allowDictOnly=False)
 
         if config.CLIENT_STACK_RESTART_ENABLED and not config.TRACK_CONNECTED_CLIENTS_NUM_ENABLED:
@@ -174,7 +175,8 @@ class NodeZStack(Batched, KITZStack):
                            seed=seed, sighex=sighex, config=config,
                            metrics=metrics,
                            mt_incoming_size=MetricsName.INCOMING_NODE_MESSAGE_SIZE,
-                           mt_outgoing_size=MetricsName.OUTGOING_NODE_MESSAGE_SIZE)
+                           mt_outgoing_size=MetricsName.OUTGOING_NODE_MESSAGE_SIZE,
+                           mt_incoming_copied=MetricsName.INCOMING_NODE_MESSAGE_BYTES_COPIED)
         MessageProcessor.__init__(self, allowDictOnly=False)
         self.listenerQuota = config.NODE_TO_NODE_STACK_QUOTA
         self.listenerSize = config.NODE_TO_NODE_STACK_SIZE
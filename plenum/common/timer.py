@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from functools import wraps
 from logging import getLogger
-from typing import Callable, NamedTuple
+from typing import Callable, NamedTuple, Optional
 
 import time
 
@@ -41,6 +41,11 @@ class QueueTimer(TimerService):
     def get_current_time(self) -> float:
         return self._get_current_time()
 
+    def time_to_next_event(self) -> Optional[float]:
+        if not self._events:
+            return None
+        return self._next_timestamp() - self._get_current_time()
+
     def schedule(self, delay: float, callback: Callable):
         timestamp = self._get_current_time() + delay
         self._events.add(self.TimerEvent(timestamp=timestamp, callback=callback))
@@ -49,6 +49,8 @@ seqNoDbName = 'seq_no_db'
 
 nodeStatusDbName = 'node_status_db'
 
+auditIndexDbName = 'audit_index_db'
+
 clientBootStrategy = ClientBootStrategy.PoolTxn
 
 hashStore = {
@@ -62,6 +64,7 @@ poolStateStorage = KeyValueStorageType.Rocksdb
 configStateStorage = KeyValueStorageType.Rocksdb
 reqIdToTxnStorage = KeyValueStorageType.Rocksdb
 nodeStatusStorage = KeyValueStorageType.Rocksdb
+auditIndexStorage = KeyValueStorageType.Rocksdb
 
 stateSignatureStorage = KeyValueStorageType.Rocksdb
 
@@ -101,6 +104,9 @@ rocksdb_seq_no_db_config = rocksdb_default_config.copy()
 rocksdb_node_status_db_config = rocksdb_default_config.copy()
 # Change node_status_db config here if you fully understand what's going on
 
+rocksdb_audit_index_db_config = rocksdb_default_config.copy()
+# Change audit_index_db config here if you fully understand what's going on
+
 rocksdb_state_signature_config = rocksdb_default_config.copy()
 # Change state_signature config here if you fully understand what's going on
 
@@ -117,6 +123,7 @@ db_state_config = rocksdb_state_config
 db_transactions_config = rocksdb_transactions_config
 db_seq_no_db_config = rocksdb_seq_no_db_config
 db_node_status_db_config = rocksdb_node_status_db_config
+db_audit_index_db_config = rocksdb_audit_index_db_config
 db_state_signature_config = rocksdb_state_signature_config
 db_state_ts_db_config = rocksdb_state_ts_db_config
 
@@ -269,6 +276,20 @@ MaxStateProofSize = 10
 # State proof timeout
 MaxStateProofTime = 3
 
+# Max memory (in bytes, approximately) taken by the cache of decoded state trie
+# nodes of each ledger, 0 disables the cache
+STATE_TRIE_NODE_CACHE_SIZE = 32 * 1024 * 1024
+
+# Remove state trie nodes not reachable from the committed state roots of the
+# last `STATE_PRUNING_RETAINED_AUDIT_TXNS` audit txns. Reads of state at older
+# roots (for example by timestamp) are not possible once the roots are pruned.
+STATE_PRUNING_ENABLED = False
+STATE_PRUNING_RETAINED_AUDIT_TXNS = 1000
+# Pruning runs in steps visiting at most `STATE_PRUNING_STEP_SIZE` trie nodes
+# each `STATE_PRUNING_INTERVAL` seconds
+STATE_PRUNING_INTERVAL = 1  # seconds
+STATE_PRUNING_STEP_SIZE = 10000
+
 # After ordering every `CHK_FREQ` batches, replica sends a CHECKPOINT
 CHK_FREQ = 100
 
@@ -296,6 +317,10 @@ NEW_VIEW_TIMEOUT = 30  # in secs
 
 CATCHUP_BATCH_SIZE = 5  # Minimum number of txns in single catchup request
 
+# Max memory (in bytes, approximately) taken by the cache of catchup replies
+# built for recently served ranges, 0 disables the cache
+CATCHUP_REP_CACHE_SIZE = 16 * 1024 * 1024
+
 # permissions for keyring dirs/files
 WALLET_DIR_MODE = 0o700  # drwx------
 WALLET_FILE_MODE = 0o600  # -rw-------
@@ -372,6 +397,17 @@ REPLICAS_REMOVING_WITH_PRIMARY_DISCONNECTED = "local"
 # Number of seconds between GC statistics report in log (0 to turn off)
 GC_STATS_REPORT_INTERVAL = 0
 
+# Number of worker threads verifying signatures of client requests and
+# PROPAGATEs (0 to verify them synchronously in the looper thread)
+SIG_VERIFICATION_WORKERS = 0
+# Max number of messages verified by a worker in one go
+SIG_VERIFICATION_BATCH_SIZE = 50
+# No more client messages are received while this number of them is waiting
+# for signature verification
+MAX_SIG_VERIFICATION_QUEUE_SIZE = 1000
+# Max number of ready to use verifiers of client keys kept by a node
+VERIFIER_CACHE_SIZE = 10000
+
 # Enable PreViewChange strategy
 PRE_VC_STRATEGY = PreVCStrategies.VC_START_MSG_STRATEGY
 # Quota multiplier for PreViewChange strategy
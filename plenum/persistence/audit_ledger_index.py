@@ -0,0 +1,150 @@
+from typing import Iterable, Optional, Tuple
+
+from plenum.common.constants import AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO, AUDIT_TXN_STATE_ROOT
+from plenum.common.txn_util import get_payload_data, get_seq_no
+from storage.kv_store import KeyValueStorage
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+
+class AuditLedgerIndex:
+    """
+    Secondary index over committed audit ledger txns. Stores a map from
+    - (view_no, pp_seq_no) and pp_seq_no to audit txn sequence number
+    - ledger id to sequence number and state root of the last audit txn
+      having a state root for this ledger
+    - view_no to sequence number of the first audit txn in the view
+    All the keys written for a batch of audit txns are written at once together
+    with the last indexed sequence number, so the index never gets ahead of
+    what is recorded as indexed.
+    """
+    delimiter = "~"
+    LAST_SEQ_NO_KEY = "last_seq_no"
+    SYNC_CHUNK_SIZE = 1000
+
+    def __init__(self, keyValueStorage: KeyValueStorage):
+        self._keyValueStorage = keyValueStorage
+
+    @property
+    def last_seq_no(self) -> int:
+        seq_no, _ = self._get_last()
+        return seq_no
+
+    def covers(self, audit_ledger) -> bool:
+        """
+        Whether all committed txns of the audit ledger (and nothing else) are indexed
+        """
+        return audit_ledger is not None and self.last_seq_no == audit_ledger.size
+
+    def add_txns(self, txns: Iterable):
+        """
+        Index committed audit txns, which must follow the last indexed one
+        """
+        last_seq_no, last_view_no = self._get_last()
+        batch = []
+        for txn in txns:
+            seq_no = get_seq_no(txn)
+            if seq_no != last_seq_no + 1:
+                raise ValueError("Audit txn with seq_no {} cannot be indexed after {}".format(seq_no, last_seq_no))
+            txn_data = get_payload_data(txn)
+            view_no = txn_data[AUDIT_TXN_VIEW_NO]
+            pp_seq_no = txn_data[AUDIT_TXN_PP_SEQ_NO]
+            batch.append((self._3pc_key(view_no, pp_seq_no), str(seq_no)))
+            batch.append((self._pp_seq_no_key(pp_seq_no), str(seq_no)))
+            if view_no != last_view_no:
+                batch.append((self._view_key(view_no), str(seq_no)))
+            for lid, state_root in txn_data.get(AUDIT_TXN_STATE_ROOT, {}).items():
+                if state_root:
+                    batch.append((self._ledger_key(lid), self._create_value(seq_no, state_root)))
+            last_seq_no, last_view_no = seq_no, view_no
+
+        if not batch:
+            return
+        batch.append((self.LAST_SEQ_NO_KEY, self._create_value(last_seq_no, last_view_no)))
+        self._keyValueStorage.setBatch(batch)
+
+    def sync(self, audit_ledger):
+        """
+        Index committed audit txns which are not indexed yet, for example the ones
+        received during catchup. Rebuilds the index from scratch if it is ahead of the ledger.
+        """
+        if self.last_seq_no > audit_ledger.size:
+            logger.info("Audit ledger index is ahead of the audit ledger ({} > {}), rebuilding it".
+                        format(self.last_seq_no, audit_ledger.size))
+            self.reset()
+
+        while self.last_seq_no < audit_ledger.size:
+            frm = self.last_seq_no + 1
+            to = min(frm + self.SYNC_CHUNK_SIZE - 1, audit_ledger.size)
+            self.add_txns(txn for _, txn in audit_ledger.getAllTxn(frm=frm, to=to))
+
+    def get_seq_no_by_3pc_key(self, view_no: int, pp_seq_no: int) -> Optional[int]:
+        return self._get_int(self._3pc_key(view_no, pp_seq_no))
+
+    def get_seq_no_by_pp_seq_no(self, pp_seq_no: int) -> Optional[int]:
+        """
+        :return: sequence number of the last audit txn with the given pp_seq_no
+        """
+        return self._get_int(self._pp_seq_no_key(pp_seq_no))
+
+    def get_first_seq_no_in_view(self, view_no: int) -> Optional[int]:
+        """
+        :return: sequence number of the first audit txn in the last run of txns with the given view_no
+        """
+        return self._get_int(self._view_key(view_no))
+
+    def get_last_state_root(self, ledger_id: int) -> Tuple[Optional[int], Optional[str]]:
+        """
+        :return: sequence number and state root of the last audit txn having a state root for the ledger
+        """
+        try:
+            val = self._keyValueStorage.get(self._ledger_key(ledger_id))
+        except KeyError:
+            return None, None
+        seq_no, state_root = self._parse_value(val)
+        return int(seq_no), state_root
+
+    def reset(self):
+        self._keyValueStorage.reset()
+
+    def close(self):
+        self._keyValueStorage.close()
+
+    def _get_last(self) -> Tuple[int, Optional[int]]:
+        try:
+            val = self._keyValueStorage.get(self.LAST_SEQ_NO_KEY)
+        except KeyError:
+            return 0, None
+        seq_no, view_no = self._parse_value(val)
+        return int(seq_no), int(view_no)
+
+    def _get_int(self, key) -> Optional[int]:
+        try:
+            return int(self._keyValueStorage.get(key))
+        except KeyError:
+            return None
+
+    def _parse_value(self, val):
+        if isinstance(val, bytes):
+            val = val.decode()
+        return val.split(self.delimiter, 1)
+
+    def _create_value(self, seq_no, data):
+        return str(seq_no) + self.delimiter + str(data)
+
+    @staticmethod
+    def _3pc_key(view_no, pp_seq_no):
+        return "3pc:{}:{}".format(view_no, pp_seq_no)
+
+    @staticmethod
+    def _pp_seq_no_key(pp_seq_no):
+        return "pp:{}".format(pp_seq_no)
+
+    @staticmethod
+    def _view_key(view_no):
+        return "view:{}".format(view_no)
+
+    @staticmethod
+    def _ledger_key(ledger_id):
+        return "ledger:{}".format(int(ledger_id))
@@ -10,6 +10,13 @@ logger = getlogger()
 
 
 class DbHashStore(HashStore):
+    """
+    Hash store keeping leaves and nodes in two key-value databases keyed by
+    their positions. Hashes take positions from 1 to their count, so the
+    counts are found on opening by looking up a few positions rather than
+    iterating over the databases.
+    """
+
     def __init__(self, dataDir, fileNamePrefix="", db_type=HS_LEVELDB, read_only=False, config=None):
         self.dataDir = dataDir
         if db_type not in (HS_ROCKSDB, HS_LEVELDB):
@@ -22,6 +29,7 @@ class DbHashStore(HashStore):
         self.nodesDb = None
         self.leavesDb = None
         self._leafCount = 0
+        self._nodeCount = 0
         self._read_only = read_only
         self.nodes_db_name = fileNamePrefix + '_merkleNodes'
         self.leaves_db_name = fileNamePrefix + '_merkleLeaves'
@@ -36,13 +44,22 @@ class DbHashStore(HashStore):
         return self._read_only
 
     def writeLeaf(self, leafHash):
-        self.leavesDb.put(str(self.leafCount + 1), leafHash)
-        self.leafCount += 1
+        self.writeLeaves([leafHash])
 
     def writeNode(self, node):
-        start, height, nodeHash = node
-        seqNo = self.getNodePosition(start, height)
-        self.nodesDb.put(str(seqNo), nodeHash)
+        self.writeNodes([node])
+
+    def writeLeaves(self, leafHashes):
+        batch = [(str(self._leafCount + i), leafHash)
+                 for i, leafHash in enumerate(leafHashes, start=1)]
+        self.leavesDb.setBatch(batch)
+        self._leafCount += len(batch)
+
+    def writeNodes(self, nodes):
+        batch = [(str(self.getNodePosition(start, height)), nodeHash)
+                 for start, height, nodeHash in nodes]
+        self.nodesDb.setBatch(batch)
+        self._nodeCount += len(batch)
 
     def readLeaf(self, seqNo):
         return self._readOne(seqNo, self.leavesDb)
@@ -79,7 +96,7 @@ class DbHashStore(HashStore):
 
     @property
     def nodeCount(self) -> int:
-        return self.nodesDb.size
+        return self._nodeCount
 
     @leafCount.setter
     def leafCount(self, count: int) -> None:
@@ -98,7 +115,28 @@ class DbHashStore(HashStore):
         self.leavesDb = storage.helper.initKeyValueStorage(
             self.db_type, self.dataDir, self.leaves_db_name,
             read_only=self._read_only, db_config=self.config.db_merkle_leaves_config)
-        self._leafCount = self.leavesDb.size
+        self._leafCount = self._readCount(self.leavesDb)
+        self._nodeCount = self._readCount(self.nodesDb)
+
+    @staticmethod
+    def _readCount(db):
+        """
+        Finds the last taken position with a binary search, which needs
+        about 2 * log2(count) lookups
+        """
+        if '1' not in db:
+            return 0
+        taken = 1
+        while str(taken * 2) in db:
+            taken *= 2
+        free = taken * 2
+        while free - taken > 1:
+            middle = (taken + free) // 2
+            if str(middle) in db:
+                taken = middle
+            else:
+                free = middle
+        return taken
 
     def close(self):
         self.nodesDb.close()
@@ -107,5 +145,6 @@ class DbHashStore(HashStore):
     def reset(self) -> bool:
         self.nodesDb.reset()
         self.leavesDb.reset()
-        self.leafCount = 0
+        self._leafCount = 0
+        self._nodeCount = 0
         return True
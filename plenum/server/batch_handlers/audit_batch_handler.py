@@ -39,6 +39,7 @@ class AuditBatchHandler(BatchRequestHandler):
     def commit_batch(self, three_pc_batch, prev_handler_result=None):
         _, _, txns_count = self.tracker.commit_batch()
         _, committedTxns = self.ledger.commitTxns(txns_count)
+        self._update_index(committedTxns)
         logger.debug("committed {} audit txns; uncommitted root hash is {}; uncommitted size is {}".
                      format(txns_count, self.ledger.uncommitted_root_hash, self.ledger.uncommitted_size))
         return committedTxns
@@ -47,6 +48,9 @@ class AuditBatchHandler(BatchRequestHandler):
         self.tracker.set_last_committed(state_root=None,
                                         txn_root=self.ledger.uncommitted_root_hash,
                                         ledger_size=self.ledger.size)
+        index = self.database_manager.audit_index
+        if index is not None:
+            index.sync(self.ledger)
 
     @staticmethod
     def transform_txn_for_ledger(txn):
@@ -61,6 +65,16 @@ class AuditBatchHandler(BatchRequestHandler):
         txn_data[AUDIT_TXN_STATE_ROOT] = {int(k): v for k, v in txn_data[AUDIT_TXN_STATE_ROOT].items()}
         return txn
 
+    def _update_index(self, committed_txns):
+        index = self.database_manager.audit_index
+        if index is None:
+            return
+        if index.last_seq_no + len(committed_txns) == self.ledger.size:
+            index.add_txns(committed_txns)
+        else:
+            # the index was not in sync with the ledger before this batch, so catch it up
+            index.sync(self.ledger)
+
     def _add_to_ledger(self, three_pc_batch: ThreePcBatch):
         # if PRE-PREPARE doesn't have audit txn (probably old code) - do nothing
         # TODO: remove this check after all nodes support audit ledger
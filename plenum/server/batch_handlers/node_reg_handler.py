@@ -327,6 +327,14 @@ class NodeRegHandler(BatchRequestHandler, WriteRequestHandler):
         '''
         this_txn_view_no = get_payload_data(this_view_first_txn).get(AUDIT_TXN_VIEW_NO)
 
+        audit_index = self.database_manager.audit_index
+        if audit_index is not None and audit_index.covers(audit_ledger):
+            first_seq_no = audit_index.get_first_seq_no_in_view(this_txn_view_no)
+            if first_seq_no is not None and first_seq_no <= get_seq_no(this_view_first_txn):
+                this_view_first_txn = audit_ledger.getBySeqNo(first_seq_no)
+                prev_view_last_txn = audit_ledger.getBySeqNo(first_seq_no - 1) if first_seq_no > 1 else None
+                return this_view_first_txn, prev_view_last_txn
+
         prev_view_last_txn = None
         while True:
             txn_primaries = get_payload_data(this_view_first_txn).get(AUDIT_TXN_PRIMARIES)
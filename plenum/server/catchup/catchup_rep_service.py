@@ -3,6 +3,7 @@ from heapq import merge
 from random import shuffle
 from typing import Optional, List, Tuple, Any, Dict
 
+from ledger.compact_merkle_tree import CompactMerkleTree
 from plenum.common.channel import RxChannel, TxChannel, Router
 from plenum.common.constants import CATCH_UP_PREFIX
 from plenum.common.ledger import Ledger
@@ -351,16 +352,24 @@ class CatchupRepService:
         # If `catchUpReplies` has any transaction that has not been applied
         # to the ledger
         txns = txns[num_processed:]
-        while txns and txns[0][0] - self._ledger.seqNo == 1:
+        # Every reply is verified on top of the tree with transactions of the
+        # replies verified before it, so all the transactions which can be
+        # applied are added to the ledger and applied to the state at once
+        tree = self._ledger.tree
+        verified_txns = []
+        verified_ledger_txns = []
+        while txns and txns[0][0] - tree.tree_size == 1:
             seq_no = txns[0][0]
-            result, node_name, to_be_processed = self._has_valid_catchup_replies(seq_no, txns)
+            result, node_name, ledger_txns, tree = self._has_valid_catchup_replies(seq_no, txns, tree)
+            to_be_processed = len(ledger_txns)
             if result:
-                for _, txn in txns[:to_be_processed]:
-                    self._add_txn(txn)
+                verified_txns.extend(txn for _, txn in txns[:to_be_processed])
+                verified_ledger_txns.extend(ledger_txns)
                 self._remove_processed_catchup_reply(node_name, seq_no)
                 num_processed += to_be_processed
                 txns = txns[to_be_processed:]
             else:
+                self._add_txns(verified_txns, verified_ledger_txns)
                 self._provider.blacklist_node(
                     node_name,
                     reason="Sent transactions that could not be verified")
@@ -370,16 +379,19 @@ class CatchupRepService:
                 # `self.receivedCatchUpReplies`
                 return num_processed + to_be_processed
 
+        self._add_txns(verified_txns, verified_ledger_txns)
         return num_processed
 
-    def _has_valid_catchup_replies(self, seq_no: int, txns_to_process: List[Tuple[int, Any]]) -> Tuple[bool, str, int]:
+    def _has_valid_catchup_replies(self, seq_no: int, txns_to_process: List[Tuple[int, Any]],
+                                   tree: CompactMerkleTree) -> Tuple[bool, str, List, CompactMerkleTree]:
         """
         Transforms transactions for ledger!
 
         Returns:
             Whether catchup reply corresponding to seq_no
             Name of node from which txns came
-            Number of transactions ready to be processed
+            Transactions of the reply transformed for ledger
+            The given tree with these transactions applied
         """
 
         # TODO: Remove after stop passing seqNo here
@@ -403,7 +415,7 @@ class CatchupRepService:
         # Creating a temporary tree which will be used to verify consistency
         # proof, by inserting transactions. Duplicating a merkle tree is not
         # expensive since we are using a compact merkle tree.
-        temp_tree = self._ledger.treeWithAppliedTxns(txns)
+        temp_tree = self._ledger.treeWithAppliedTxns(txns, tree)
 
         proof = catchup_rep.consProof
         final_size = self._catchup_till.final_size
@@ -423,7 +435,7 @@ class CatchupRepService:
         except Exception as ex:
             logger.info("{} could not verify catchup reply {} since {}".format(self, catchup_rep, ex))
             verified = False
-        return bool(verified), node_name, len(txns)
+        return bool(verified), node_name, txns, temp_tree
 
     def _find_catchup_reply_for_seq_no(self, seq_no: int) -> Tuple[str, CatchupRep]:
         # This is inefficient if we have large number of nodes but since
@@ -433,9 +445,13 @@ class CatchupRepService:
                 if str(seq_no) in rep.txns:
                     return frm, rep
 
-    def _add_txn(self, txn):
-        self._ledger.add(self._provider.transform_txn_for_ledger(txn))
-        self._provider.notify_transaction_added_to_ledger(self._ledger_id, txn)
+    def _add_txns(self, txns: List, ledger_txns: List):
+        if not txns:
+            return
+        # Transactions are written to the transaction log and the hash
+        # store in one batch
+        self._ledger.add_txns(ledger_txns, with_merkle_info=False)
+        self._provider.notify_transactions_added_to_ledger(self._ledger_id, txns)
 
     def _remove_processed_catchup_reply(self, node: str, seq_no: str):
         for i, rep in enumerate(self._received_catchup_replies_from[node]):
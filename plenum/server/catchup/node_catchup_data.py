@@ -62,6 +62,16 @@ class CatchupNodeDataProvider(CatchupDataProvider):
         if info is not None and info.postTxnAddedToLedgerClbk:
             info.postTxnAddedToLedgerClbk(ledger_id, txn)
 
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns: List[dict]):
+        state = self._state_info(ledger_id)
+        if state is None:
+            super().notify_transactions_added_to_ledger(ledger_id, txns)
+            return
+        # State is still committed after each of the transactions, but it is
+        # written to the storage once for all of them
+        with state.batched_commit():
+            super().notify_transactions_added_to_ledger(ledger_id, txns)
+
     def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
         if self._node.nodestack.hasRemote(to):
             self._node.sendToNodes(msg, [to], message_splitter)
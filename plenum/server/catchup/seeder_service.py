@@ -1,22 +1,69 @@
 from abc import abstractmethod
-from typing import Any, Tuple, Optional
+from collections import OrderedDict
+from typing import Any, Tuple, Optional, Iterator, List
 
 from plenum.common.channel import RxChannel, Router
 from plenum.common.ledger import Ledger
 from plenum.common.messages.node_messages import CatchupReq, CatchupRep, ConsistencyProof, LedgerStatus
+from plenum.common.perf_util import get_size
 from plenum.common.util import SortedDict
 from plenum.server.catchup.utils import CatchupDataProvider, build_ledger_status
 from stp_core.common.log import getlogger
+from stp_zmq.codec import serialize
 
 logger = getlogger()
 
 
+class CatchupRepCache:
+    """
+    LRU cache of CATCHUP_REPs built for served ranges of txns keyed by
+    ledger id, range and size of the ledger the consistency proofs lead to.
+    Txns up to that size never change, so the replies never get stale. The
+    cache is limited by the memory taken by the replies in it.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._reps = OrderedDict()  # key -> (reps, size)
+
+    def __len__(self):
+        return len(self._reps)
+
+    def get(self, key: tuple) -> Optional[List[CatchupRep]]:
+        entry = self._reps.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._reps.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: tuple, reps: List[CatchupRep], size: int):
+        if size > self.max_size or key in self._reps:
+            return
+        self._reps[key] = (reps, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, evicted_size) = self._reps.popitem(last=False)
+            self.size -= evicted_size
+
+
 class SeederService:
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
+    # Size of JSON encoded CATCHUP_REP without txns and consistency proof
+    CATCHUP_REP_OVERHEAD = 256
+    # Size of JSON encoded hash of consistency proof with quotes and comma
+    PROOF_HASH_SIZE = 48
+
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config):
         router = Router(input)
         router.add(LedgerStatus, self.process_ledger_status)
         router.add(CatchupReq, self.process_catchup_req)
         self._provider = provider
+        self._msg_len_limit = config.MSG_LEN_LIMIT
+        self._reps_cache = CatchupRepCache(config.CATCHUP_REP_CACHE_SIZE)
 
     def __repr__(self):
         return self._provider.node_name()
@@ -82,17 +129,63 @@ class SeederService:
                                    .format(req.catchupTill, ledger.size), logMethod=logger.warning)
             return
 
-        cons_proof = ledger.tree.consistency_proof(end, req.catchupTill)
-        cons_proof = [Ledger.hashToStr(p) for p in cons_proof]
+        # Replies are built to fit into a message already, splitting is left
+        # just in case the size of some reply was underestimated
+        message_splitter = self._make_splitter_for_catchup_rep(ledger, req.catchupTill)
+        key = (ledger_id, start, end, req.catchupTill)
+        reps = self._reps_cache.get(key)
+        if reps is not None:
+            for rep in reps:
+                self._provider.send_to(rep, frm, message_splitter)
+            return
+
+        reps = []
+        reps_size = 0
+        for rep in self._stream_catchup_reps(ledger_id, ledger, start, end, req.catchupTill):
+            self._provider.send_to(rep, frm, message_splitter)
+            if reps is None:
+                continue
+            # Objects of a reply take several times more memory than the
+            # reply serialized, so it's the memory they take which is charged
+            reps_size += get_size(rep)
+            if reps_size <= self._reps_cache.max_size:
+                reps.append(rep)
+            else:
+                # The range doesn't fit into the cache
+                reps = None
+        if reps is not None:
+            self._reps_cache.put(key, reps, reps_size)
+
+    def _stream_catchup_reps(self, ledger_id: int, ledger: Ledger,
+                             start: int, end: int, catchup_till: int) -> Iterator[CatchupRep]:
+        """
+        Reads txns from `start` to `end` from the ledger and yields
+        CATCHUP_REPs with as many of them as fit into a message
+        """
+        # Consistency proof of a tree of size n has at most 2 * log2(n) hashes
+        max_txns_size = self._msg_len_limit - self.CATCHUP_REP_OVERHEAD - \
+            2 * catchup_till.bit_length() * self.PROOF_HASH_SIZE
 
         txns = {}
+        txns_size = 0
         for seq_no, txn in ledger.getAllTxn(start, end):
-            txns[seq_no] = self._provider.update_txn_with_extra_data(txn)
-
-        txns = SortedDict(txns)  # TODO: Do we really need them sorted on the sending side?
-        rep = CatchupRep(ledger_id, txns, cons_proof)
-        message_splitter = self._make_splitter_for_catchup_rep(ledger, req.catchupTill)
-        self._provider.send_to(rep, frm, message_splitter)
+            txn = self._provider.update_txn_with_extra_data(txn)
+            # Txn is a value of mapping with quoted seq_no as a key
+            txn_size = len(serialize(txn)) + len(str(seq_no)) + 4
+            if txns and txns_size + txn_size > max_txns_size:
+                yield self._make_catchup_rep(ledger_id, ledger, txns, catchup_till)
+                txns = {}
+                txns_size = 0
+            txns[seq_no] = txn
+            txns_size += txn_size
+
+        if txns:
+            yield self._make_catchup_rep(ledger_id, ledger, txns, catchup_till)
+
+    def _make_catchup_rep(self, ledger_id: int, ledger: Ledger, txns: dict, catchup_till: int) -> CatchupRep:
+        cons_proof = self._make_consistency_proof(ledger, max(txns), catchup_till)
+        # TODO: Do we really need them sorted on the sending side?
+        return CatchupRep(ledger_id, SortedDict(txns), cons_proof)
 
     def _get_ledger_and_id(self, req: Any) -> Tuple[int, Optional[Ledger]]:
         ledger_id = req.ledgerId
@@ -182,8 +275,8 @@ class SeederService:
 
 
 class ClientSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config):
+        SeederService.__init__(self, input, provider, config)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         ledger_status = build_ledger_status(ledger_id, self._provider)
@@ -191,8 +284,8 @@ class ClientSeederService(SeederService):
 
 
 class NodeSeederService(SeederService):
-    def __init__(self, input: RxChannel, provider: CatchupDataProvider):
-        SeederService.__init__(self, input, provider)
+    def __init__(self, input: RxChannel, provider: CatchupDataProvider, config):
+        SeederService.__init__(self, input, provider, config)
 
     def _on_ledger_status_up_to_date(self, ledger_id: int, frm: str):
         pass
@@ -77,6 +77,10 @@ class CatchupDataProvider(ABC):
     def notify_transaction_added_to_ledger(self, ledger_id: int, txn: dict):
         pass
 
+    def notify_transactions_added_to_ledger(self, ledger_id: int, txns: List[dict]):
+        for txn in txns:
+            self.notify_transaction_added_to_ledger(ledger_id, txn)
+
     @abstractmethod
     def send_to(self, msg: Any, to: str, message_splitter: Optional[Callable] = None):
         pass
@@ -2,7 +2,9 @@
 Clients are authenticated with a digital signature.
 """
 from abc import abstractmethod
-from typing import Dict, Optional
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Mapping, Optional
 
 import base58
 from common.serializers.serialization import serialize_msg_for_signing
@@ -10,6 +12,7 @@ from plenum.common.constants import VERKEY, ROLE, NYM
 from plenum.common.exceptions import EmptySignature, MissingSignature, EmptyIdentifier, \
     MissingIdentifier, CouldNotAuthenticate, InvalidSignatureFormat, InsufficientSignatures, \
     InsufficientCorrectSignatures
+from plenum.common.request import ReadOnlyRequestData
 from plenum.common.types import f
 from plenum.common.verifier import DidVerifier, Verifier
 from plenum.server.request_handlers.utils import get_nym_details, get_request_type, nym_ident_is_dest, get_target_verkey
@@ -18,6 +21,62 @@ from stp_core.common.log import getlogger
 logger = getlogger()
 
 
+class VerifierCache:
+    """
+    LRU cache of ready to use verifiers keyed by identifier and verkey, so
+    that requests of the same client don't need to decode the keys and set up
+    a new verifier each time. Since the verkey is a part of the key a verifier
+    for an outdated verkey is never used, entries of an identifier are dropped
+    once its verkey changes just to not waste the space.
+    The cache can be used by several threads at once.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._verifiers = OrderedDict()  # (identifier, verkey) -> DidVerifier
+        self._verkeys = {}  # identifier -> set of cached verkeys
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._verifiers)
+
+    def get(self, identifier: str, verkey: str) -> DidVerifier:
+        key = (identifier, verkey)
+        with self._lock:
+            verifier = self._verifiers.get(key)
+            if verifier is not None:
+                self._verifiers.move_to_end(key)
+                return verifier
+
+        verifier = DidVerifier(verkey, identifier=identifier)
+        with self._lock:
+            if key not in self._verifiers:
+                self._verifiers[key] = verifier
+                self._verkeys.setdefault(identifier, set()).add(verkey)
+                while len(self._verifiers) > self.max_size:
+                    (idr, vk), _ = self._verifiers.popitem(last=False)
+                    self._forget_verkey(idr, vk)
+        return verifier
+
+    def invalidate(self, identifier: str):
+        with self._lock:
+            for verkey in self._verkeys.pop(identifier, ()):
+                self._verifiers.pop((identifier, verkey), None)
+
+    def clear(self):
+        with self._lock:
+            self._verifiers.clear()
+            self._verkeys.clear()
+
+    def _forget_verkey(self, identifier, verkey):
+        verkeys = self._verkeys.get(identifier)
+        if verkeys is None:
+            return
+        verkeys.discard(verkey)
+        if not verkeys:
+            del self._verkeys[identifier]
+
+
 class ClientAuthNr:
     """
     Interface for client authenticators.
@@ -56,6 +115,18 @@ class ClientAuthNr:
         correct; a SigningException is raised if threshold was not met
         """
 
+    def get_verkeys(self, msg: Dict) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Get verification keys of all the signers of the message in advance,
+        so that they can be passed to `authenticate` called in another thread
+        than the one changing the state. By default the keys are not taken in
+        advance and `authenticate` looks them up itself.
+
+        :param msg: the message to be authenticated
+        :return: mapping from identifiers to verification keys or None
+        """
+        return None
+
     @abstractmethod
     def addIdr(self, identifier, verkey, role=None):
         """
@@ -80,9 +151,12 @@ class ClientAuthNr:
 
 
 class NaclAuthNr(ClientAuthNr):
+    # Verifiers of DidVerifier type are taken from the cache if there is one
+    verifier_cache = None  # type: Optional[VerifierCache]
 
     def authenticate_multi(self, msg: Dict, signatures: Dict[str, str],
-                           threshold: Optional[int] = None, verifier: Verifier = DidVerifier):
+                           threshold: Optional[int] = None, verifier: Verifier = DidVerifier,
+                           verkeys: Optional[Dict[str, Optional[str]]] = None):
 
         num_sigs = len(signatures)
         if threshold is not None:
@@ -101,11 +175,17 @@ class NaclAuthNr(ClientAuthNr):
 
             ser = self.serializeForSig(msg, identifier=idr)
 
-            verkey = self.getVerkey(idr, msg)
+            if verkeys is not None:
+                verkey = verkeys.get(idr)
+            else:
+                verkey = self.getVerkey(idr, msg)
             if verkey is None:
                 raise CouldNotAuthenticate(idr)
 
-            vr = verifier(verkey, identifier=idr)
+            if verifier is DidVerifier and self.verifier_cache is not None:
+                vr = self.verifier_cache.get(idr, verkey)
+            else:
+                vr = verifier(verkey, identifier=idr)
             if vr.verify(sig_decoded, ser):
                 correct_sigs_from.append(idr)
                 if len(correct_sigs_from) == threshold:
@@ -126,6 +206,8 @@ class NaclAuthNr(ClientAuthNr):
         pass
 
     def serializeForSig(self, msg, identifier=None, topLevelKeysToIgnore=None):
+        if isinstance(msg, ReadOnlyRequestData):
+            return msg.serialized_for_signing(topLevelKeysToIgnore or ())
         return serialize_msg_for_signing(
             msg, topLevelKeysToIgnore=topLevelKeysToIgnore)
 
@@ -136,16 +218,20 @@ class SimpleAuthNr(NaclAuthNr):
     secure system.
     """
 
-    def __init__(self, state=None):
+    def __init__(self, state=None, verifier_cache_size: int = 0):
         # key: some identifier, value: verification key
         self.clients = {}  # type: Dict[str, Dict]
         self.state = state
+        if verifier_cache_size > 0:
+            self.verifier_cache = VerifierCache(verifier_cache_size)
         self.specific_verkey_validation = {NYM: self.nym_specific_auth}
 
     def addIdr(self, identifier, verkey, role=None):
         if identifier in self.clients:
             # raise RuntimeError("client already added")
             logger.debug("client already added")
+            if self.verifier_cache is not None:
+                self.verifier_cache.invalidate(identifier)
         self.clients[identifier] = {
             VERKEY: verkey,
             ROLE: role
@@ -229,7 +315,8 @@ class CoreAuthMixin:
 
     def authenticate(self, req_data, identifier: Optional[str] = None,
                      signature: Optional[str] = None, threshold: Optional[int] = None,
-                     verifier: Verifier = DidVerifier):
+                     verifier: Verifier = DidVerifier,
+                     verkeys: Optional[Dict[str, Optional[str]]] = None):
         """
         Prepares the data to be serialised for signing and then verifies the
         signature
@@ -237,10 +324,31 @@ class CoreAuthMixin:
         :param identifier:
         :param signature:
         :param verifier:
+        :param verkeys: verkeys of the signers taken by `get_verkeys`
         :return:
         """
-        to_serialize = {k: v for k, v in req_data.items()
-                        if k not in self.excluded_from_signing}
+        if isinstance(req_data, ReadOnlyRequestData):
+            to_serialize = req_data.without(self.excluded_from_signing)
+        else:
+            to_serialize = {k: v for k, v in req_data.items()
+                            if k not in self.excluded_from_signing}
+        signatures = self._get_signatures(req_data, identifier, signature)
+        return self.authenticate_multi(to_serialize, signatures=signatures,
+                                       threshold=threshold, verifier=verifier,
+                                       verkeys=verkeys)
+
+    def get_verkeys(self, req_data):
+        try:
+            signatures = self._get_signatures(req_data)
+        except Exception:
+            # The same error is raised by `authenticate`
+            return {}
+        if not isinstance(signatures, Mapping):
+            return {}
+        return {idr: self.getVerkey(idr, req_data) for idr in signatures}
+
+    def _get_signatures(self, req_data, identifier: Optional[str] = None,
+                        signature: Optional[str] = None):
         if req_data.get(f.SIG.nm) is None and \
                 req_data.get(f.SIGS.nm) is None and \
                 signature is None:
@@ -254,23 +362,22 @@ class CoreAuthMixin:
                 # if not signature:
                 signature = signature or self._extract_signature(req_data)
 
-                signatures = {identifier: signature}
+                return {identifier: signature}
             except Exception as ex:
                 if ex in (MissingSignature, EmptySignature, MissingIdentifier,
                           EmptyIdentifier):
                     ex = ex(req_data.get(f.IDENTIFIER.nm), req_data.get(f.SIG.nm))
                 raise ex
-        else:
-            signatures = req_data.get(f.SIGS.nm, None)
-        return self.authenticate_multi(to_serialize, signatures=signatures,
-                                       threshold=threshold, verifier=verifier)
+        return req_data.get(f.SIGS.nm, None)
 
     def serializeForSig(self, msg, identifier=None, topLevelKeysToIgnore=None):
+        if isinstance(msg, ReadOnlyRequestData):
+            return msg.serialized_for_signing(topLevelKeysToIgnore or ())
         return serialize_msg_for_signing(
             msg, topLevelKeysToIgnore=topLevelKeysToIgnore)
 
 
 class CoreAuthNr(CoreAuthMixin, SimpleAuthNr):
-    def __init__(self, write_types, query_types, action_types, state=None):
-        SimpleAuthNr.__init__(self, state)
+    def __init__(self, write_types, query_types, action_types, state=None, verifier_cache_size: int = 0):
+        SimpleAuthNr.__init__(self, state, verifier_cache_size)
         CoreAuthMixin.__init__(self, write_types, query_types, action_types)
@@ -196,7 +196,8 @@ class CheckpointService:
 
     def _create_checkpoint_from_audit_ledger(self, pp_seq_no):
         audit_ledger = self._db_manager.get_ledger(AUDIT_LEDGER_ID)
-        audit_txn, audit_txn_seq_no = self._audit_txn_by_pp_seq_no(audit_ledger, pp_seq_no)
+        audit_txn, audit_txn_seq_no = self._audit_txn_by_pp_seq_no(audit_ledger, pp_seq_no,
+                                                                   self._db_manager.audit_index)
         # TODO: What should we do if txn not found or audit ledger is empty?
         view_no = self._get_view_no_from_audit(audit_txn)
         digest = self._get_digest_from_audit(audit_ledger, audit_txn_seq_no)
@@ -288,7 +289,14 @@ class CheckpointService:
         )
 
     @staticmethod
-    def _audit_txn_by_pp_seq_no(audit_ledger: Ledger, pp_seq_no: int) -> (dict, int):
+    def _audit_txn_by_pp_seq_no(audit_ledger: Ledger, pp_seq_no: int, audit_index=None) -> (dict, int):
+        if audit_index is not None and audit_index.covers(audit_ledger):
+            seq_no = audit_index.get_seq_no_by_pp_seq_no(pp_seq_no)
+            if seq_no is not None:
+                return audit_ledger.getBySeqNo(seq_no), seq_no
+            # Not found, return what the full scan below ends up with
+            return (audit_ledger.getBySeqNo(1) if audit_ledger.size else None), 0
+
         # TODO: Should we put it into some common code?
         seq_no = audit_ledger.size
         txn = None
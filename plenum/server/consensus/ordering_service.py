@@ -52,7 +52,7 @@ from plenum.server.replica_validator_enums import STASH_VIEW_3PC, STASH_CATCH_UP
 from plenum.server.request_handlers.ledgers_freeze.ledger_freeze_helper import StaticLedgersFreezeHelper
 from plenum.server.request_managers.write_request_manager import WriteRequestManager
 from plenum.server.suspicion_codes import Suspicions
-from stp_core.common.log import getlogger
+from stp_core.common.log import getlogger, lazy
 
 logger = getlogger()
 
@@ -233,19 +233,18 @@ class OrderingService:
             return result, reason
 
         key = (prepare.viewNo, prepare.ppSeqNo)
-        logger.debug("{} received PREPARE{} from {}".format(self, key, sender))
+        logger.debug("%s received PREPARE%s from %s", self, key, sender)
 
         # TODO move this try/except up higher
         try:
             if self._validate_prepare(prepare, sender):
                 self._add_to_prepares(prepare, sender)
                 self.stats.inc(TPCStat.PrepareRcvd)
-                logger.debug("{} processed incoming PREPARE {}".format(
-                    self, (prepare.viewNo, prepare.ppSeqNo)))
+                logger.debug("%s processed incoming PREPARE %s", self, (prepare.viewNo, prepare.ppSeqNo))
             else:
                 # TODO let's have isValidPrepare throw an exception that gets
                 # handled and possibly logged higher
-                logger.trace("{} cannot process incoming PREPARE".format(self))
+                logger.trace("%s cannot process incoming PREPARE", self)
         except SuspiciousNode as ex:
             self.report_suspicious_node(ex)
         return None, None
@@ -445,13 +444,12 @@ class OrderingService:
         if result != PROCESS:
             return result, reason
 
-        logger.debug("{} received COMMIT{} from {}".format(self, (commit.viewNo, commit.ppSeqNo), sender))
+        logger.debug("%s received COMMIT%s from %s", self, (commit.viewNo, commit.ppSeqNo), sender)
 
         if self._validate_commit(commit, sender):
             self.stats.inc(TPCStat.CommitRcvd)
             self._add_to_commits(commit, sender)
-            logger.debug("{} processed incoming COMMIT{}".format(
-                self, (commit.viewNo, commit.ppSeqNo)))
+            logger.debug("%s processed incoming COMMIT%s", self, (commit.viewNo, commit.ppSeqNo))
         return result, reason
 
     def _validate_commit(self, commit: Commit, sender: str) -> bool:
@@ -518,7 +516,7 @@ class OrderingService:
             return result, reason
 
         key = (pre_prepare.viewNo, pre_prepare.ppSeqNo)
-        logger.debug("{} received PRE-PREPARE{} from {}".format(self, key, sender))
+        logger.debug("%s received PRE-PREPARE%s from %s", self, key, sender)
 
         # TODO: should we still do it?
         # Converting each req_idrs from list to tuple
@@ -894,11 +892,8 @@ class OrderingService:
         old_state_root = self.get_state_root_hash(pre_prepare.ledgerId, to_str=False)
         old_txn_root = self.get_txn_root_hash(pre_prepare.ledgerId)
         if self.is_master:
-            logger.debug('{} state root before processing {} is {}, {}'.format(
-                self,
-                pre_prepare,
-                old_state_root,
-                old_txn_root))
+            logger.debug('%s state root before processing %s is %s, %s',
+                         self, pre_prepare, old_state_root, old_txn_root)
 
         # 1. APPLY
         reqs, invalid_indices, rejects, suspicious = self._apply_pre_prepare(pre_prepare)
@@ -941,7 +936,7 @@ class OrderingService:
                 self._data.inst_id, pre_prepare.ppSeqNo)
         self._track_batches(pre_prepare, old_state_root)
         key = (pre_prepare.viewNo, pre_prepare.ppSeqNo)
-        logger.debug("{} processed incoming PRE-PREPARE{}".format(self, key),
+        logger.debug("%s processed incoming PRE-PREPARE%s", self, key,
                      extra={"tags": ["processing"]})
         return None
 
@@ -1153,8 +1148,8 @@ class OrderingService:
                 self._process_req_during_batch(req,
                                                pre_prepare.ppTime)
             except InvalidClientMessageException as ex:
-                logger.warning('{} encountered exception {} while processing {}, '
-                               'will reject'.format(self, ex, req))
+                logger.warning('%s encountered exception %s while processing %s, '
+                               'will reject', self, ex, req)
                 rejects.append((req.key, Reject(req.identifier, req.reqId,
                                                 reasonForClientFromException(ex), ex.code)))
                 invalid_indices.append(idx)
@@ -1178,6 +1173,7 @@ class OrderingService:
         return reqs, invalid_indices, rejects, suspicious
 
     def _get_valid_req_ids_from_all_requests(self, reqs, invalid_indices):
+        invalid_indices = set(invalid_indices)
         return [req.key for idx, req in enumerate(reqs) if idx not in invalid_indices]
 
     def _validate_applied_pre_prepare(self, pre_prepare: PrePrepare,
@@ -1242,7 +1238,7 @@ class OrderingService:
         # pp.discarded indicates the index from where the discarded requests
         #  starts hence the count of accepted requests, prevStateRoot is
         # tracked to revert this PRE-PREPARE
-        logger.trace('{} tracking batch for {} with state root {}'.format(self, pp, prevStateRootHash))
+        logger.trace('%s tracking batch for %s with state root %s', self, pp, prevStateRootHash)
         if self.is_master:
             self.metrics.add_event(MetricsName.THREE_PC_BATCH_SIZE, len(pp.reqIdr))
         else:
@@ -1299,7 +1295,7 @@ class OrderingService:
             while self.preparesWaitingForPrePrepare[key]:
                 prepare, sender = self.preparesWaitingForPrePrepare[
                     key].popleft()
-                logger.debug("{} popping stashed PREPARE{}".format(self, key))
+                logger.debug("%s popping stashed PREPARE%s", self, key)
                 self._network.process_incoming(prepare, sender)
                 i += 1
             self.preparesWaitingForPrePrepare.pop(key)
@@ -1318,7 +1314,7 @@ class OrderingService:
             while self.commitsWaitingForPrepare[key]:
                 commit, sender = self.commitsWaitingForPrepare[
                     key].popleft()
-                logger.debug("{} popping stashed COMMIT{}".format(self, key))
+                logger.debug("%s popping stashed COMMIT%s", self, key)
                 self._network.process_incoming(commit, sender)
 
                 i += 1
@@ -1351,7 +1347,7 @@ class OrderingService:
     @measure_consensus_time(MetricsName.SEND_PREPARE_TIME,
                             MetricsName.BACKUP_SEND_PREPARE_TIME)
     def _do_prepare(self, pp: PrePrepare):
-        logger.debug("{} Sending PREPARE{} at {}".format(self, (pp.viewNo, pp.ppSeqNo), self.get_current_time()))
+        logger.debug("%s Sending PREPARE%s at %s", self, (pp.viewNo, pp.ppSeqNo), lazy(self.get_current_time))
         params = [self._data.inst_id,
                   pp.viewNo,
                   pp.ppSeqNo,
@@ -1421,7 +1417,7 @@ class OrderingService:
         :param p: the prepare message
         """
         key_3pc = (p.viewNo, p.ppSeqNo)
-        logger.debug("{} Sending COMMIT{} at {}".format(self, key_3pc, self.get_current_time()))
+        logger.debug("%s Sending COMMIT%s at %s", self, key_3pc, lazy(self.get_current_time))
 
         params = [
             self._data.inst_id, p.viewNo, p.ppSeqNo
@@ -1474,7 +1470,7 @@ class OrderingService:
 
     def _do_order(self, commit: Commit):
         key = (commit.viewNo, commit.ppSeqNo)
-        logger.debug("{} ordering COMMIT {}".format(self, key))
+        logger.debug("%s ordering COMMIT %s", self, key)
         return self._order_3pc_key(key)
 
     @measure_consensus_time(MetricsName.ORDER_3PC_BATCH_TIME,
@@ -1496,7 +1492,7 @@ class OrderingService:
         self._data.last_batch_timestamp = pp.ppTime
 
         self._add_to_ordered(*key)
-        invalid_indices = invalid_index_serializer.deserialize(pp.discarded)
+        invalid_indices = set(invalid_index_serializer.deserialize(pp.discarded))
         invalid_reqIdr = []
         valid_reqIdr = []
         for ind, reqIdr in enumerate(pp.reqIdr):
@@ -1535,8 +1531,7 @@ class OrderingService:
                       "state root {}, txn root {}, audit root {}".format(self, pp.viewNo, pp.ppSeqNo, pp.ledgerId,
                                                                          pp.stateRootHash, pp.txnRootHash,
                                                                          pp.auditTxnRootHash)
-        logger.debug("{}, requests ordered {}, discarded {}".
-                     format(ordered_msg, valid_reqIdr, invalid_reqIdr))
+        logger.debug("%s, requests ordered %s, discarded %s", ordered_msg, valid_reqIdr, invalid_reqIdr)
         logger.info("{}, requests ordered {}, discarded {}".
                     format(ordered_msg, len(valid_reqIdr), len(invalid_reqIdr)))
 
@@ -2038,9 +2033,8 @@ class OrderingService:
     def create_3pc_batch(self, ledger_id):
         pp_seq_no = self.lastPrePrepareSeqNo + 1
         pool_state_root_hash = self.get_state_root_hash(POOL_LEDGER_ID)
-        logger.debug("{} creating batch {} for ledger {} with state root {}".format(
-            self, pp_seq_no, ledger_id,
-            self.get_state_root_hash(ledger_id, to_str=False)))
+        logger.debug("%s creating batch %s for ledger %s with state root %s",
+                     self, pp_seq_no, ledger_id, lazy(self.get_state_root_hash, ledger_id, False))
 
         if self.last_accepted_pre_prepare_time is None:
             last_ordered_ts = self._get_last_timestamp_from_state(ledger_id)
@@ -2098,7 +2092,7 @@ class OrderingService:
 
         pre_prepare = PrePrepare(*params)
 
-        logger.trace('{} created a PRE-PREPARE with {} requests for ledger {}'.format(self, len(reqs), ledger_id))
+        logger.trace('%s created a PRE-PREPARE with %s requests for ledger %s', self, len(reqs), ledger_id)
         self.last_accepted_pre_prepare_time = tm
         if self.is_master and rejects:
             for reject in rejects:
@@ -2133,9 +2127,12 @@ class OrderingService:
         rejects = []
         invalid_indices = []
         idx = 0
-        while len(reqs) < self._config.Max3PCBatchSize \
-                and self.requestQueues[ledger_id]:
-            key = self.requestQueues[ledger_id].pop(0)
+        # Request queues are ordered sets, so popping the first key takes
+        # constant time
+        queue = self.requestQueues[ledger_id]
+        batch_size = self._config.Max3PCBatchSize
+        while len(reqs) < batch_size and queue:
+            key = queue.pop(0)
             if key in self._requests:
                 fin_req = self._requests[key].finalised
                 malicious_req = False
@@ -2146,8 +2143,8 @@ class OrderingService:
                 except (
                         InvalidClientMessageException
                 ) as ex:
-                    logger.warning('{} encountered exception {} while processing {}, '
-                                   'will reject'.format(self, ex, fin_req))
+                    logger.warning('%s encountered exception %s while processing %s, '
+                                   'will reject', self, ex, fin_req)
                     rejects.append((fin_req.key, Reject(fin_req.identifier, fin_req.reqId,
                                                         reasonForClientFromException(ex), ex.code)))
                     invalid_indices.append(idx)
@@ -2168,7 +2165,7 @@ class OrderingService:
                             MetricsName.BACKUP_SEND_PREPREPARE_TIME)
     def send_pre_prepare(self, ppReq: PrePrepare):
         key = (ppReq.viewNo, ppReq.ppSeqNo)
-        logger.debug("{} sending PRE-PREPARE{}".format(self, key))
+        logger.debug("%s sending PRE-PREPARE%s", self, key)
         self._send(ppReq, stat=TPCStat.PrePrepareSent)
 
     def _send(self, msg, dst=None, stat=None) -> None:
@@ -1,7 +1,7 @@
 import time
 from collections import deque
 from functools import wraps
-from typing import Callable
+from typing import Callable, Optional
 
 from stp_core.common.log import getlogger
 from stp_core.common.util import get_func_name
@@ -103,6 +103,17 @@ class HasActionQueue:
                              format(self, get_func_name(action), aid))
         return count
 
+    def time_to_next_event(self) -> Optional[float]:
+        """
+        Time in seconds after which some scheduled action has to be run or
+        None if there are no scheduled actions
+        """
+        if self.actionQueue:
+            return 0
+        if self.aqStash:
+            return self.aqNextCheck - time.perf_counter()
+        return None
+
     def startRepeating(self, action: Callable, seconds: int):
         @wraps(action)
         def wrapper():
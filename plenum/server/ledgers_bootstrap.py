@@ -8,8 +8,9 @@ from ledger.genesis_txn.genesis_txn_initiator import GenesisTxnInitiator
 from ledger.genesis_txn.genesis_txn_initiator_from_file import GenesisTxnInitiatorFromFile
 from ledger.genesis_txn.genesis_txn_initiator_from_mem import GenesisTxnInitiatorFromMem
 from plenum.common.constants import AUDIT_LEDGER_ID, POOL_LEDGER_ID, CONFIG_LEDGER_ID, DOMAIN_LEDGER_ID, \
-    NODE_PRIMARY_STORAGE_SUFFIX, BLS_LABEL, HS_MEMORY
+    NODE_PRIMARY_STORAGE_SUFFIX, BLS_LABEL, HS_MEMORY, AUDIT_INDEX_LABEL
 from plenum.common.ledger import Ledger
+from plenum.persistence.audit_ledger_index import AuditLedgerIndex
 from plenum.persistence.storage import initStorage
 from plenum.server.batch_handlers.audit_batch_handler import AuditBatchHandler
 from plenum.server.batch_handlers.config_batch_handler import ConfigBatchHandler
@@ -31,6 +32,7 @@ from plenum.server.request_managers.action_request_manager import ActionRequestM
 from plenum.server.request_managers.read_request_manager import ReadRequestManager
 from plenum.server.request_managers.write_request_manager import WriteRequestManager
 from state.pruning_state import PruningState
+from state.trie.node_cache import TrieNodeCache
 from storage.helper import initHashStore, initKeyValueStorage
 from storage.kv_in_memory import KeyValueStorageInMemory
 from stp_core.common.log import getlogger
@@ -117,6 +119,8 @@ class LedgersBootstrap:
                                               self._create_ledger('audit'),
                                               taa_acceptance_required=False)
 
+        self.db_manager.register_new_store(AUDIT_INDEX_LABEL, self._create_audit_index())
+
     def _init_bls_bft(self):
         self._bls_bft = self._create_bls_bft()
         self.db_manager.register_new_store(BLS_LABEL, self.bls_bft.bls_store)
@@ -227,6 +231,16 @@ class LedgersBootstrap:
                       ensureDurability=self.config.EnsureLedgerDurability,
                       genesis_txn_initiator=genesis)
 
+    def _create_audit_index(self) -> AuditLedgerIndex:
+        if self.data_location is None:
+            return AuditLedgerIndex(KeyValueStorageInMemory())
+        return AuditLedgerIndex(
+            initKeyValueStorage(
+                self.config.auditIndexStorage,
+                self.data_location,
+                self.config.auditIndexDbName,
+                db_config=self.config.db_audit_index_db_config))
+
     def _create_domain_ledger(self) -> Ledger:
         if self.config.primaryStorage is None:
             # TODO: add a place for initialization of all ledgers, so it's
@@ -242,15 +256,21 @@ class LedgersBootstrap:
     def _create_state(self, name: str) -> PruningState:
         storage_name = getattr(self.config, "{}StateStorage".format(name))
         db_name = getattr(self.config, "{}StateDbName".format(name))
+        node_cache = self._create_trie_node_cache()
         if self.data_location is not None:
             return PruningState(
                 initKeyValueStorage(
                     storage_name,
                     self.data_location,
                     db_name,
-                    db_config=self.config.db_state_config))
+                    db_config=self.config.db_state_config),
+                node_cache=node_cache)
         else:
-            return PruningState(KeyValueStorageInMemory())
+            return PruningState(KeyValueStorageInMemory(), node_cache=node_cache)
+
+    def _create_trie_node_cache(self) -> Optional[TrieNodeCache]:
+        cache_size = self.config.STATE_TRIE_NODE_CACHE_SIZE
+        return TrieNodeCache(cache_size) if cache_size else None
 
     def _init_state_from_ledger(self, ledger_id: int):
         """
@@ -3,6 +3,7 @@ import os
 import time
 from binascii import unhexlify
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from functools import partial
 from typing import Dict, Any, Mapping, Iterable, List, Optional, Set, Tuple, Callable
@@ -26,13 +27,15 @@ from common.serializers.serialization import state_roots_serializer
 from crypto.bls.bls_key_manager import LoadBLSKeyError
 from plenum.common.gc_trackers import GcTimeTracker, GcObjectTree
 from plenum.common.metrics_collector import KvStoreMetricsCollector, NullMetricsCollector, MetricsName, \
-    async_measure_time, measure_time
+    MetricsCollector, async_measure_time, measure_time
 from plenum.common.timer import QueueTimer
 from plenum.server.backup_instance_faulty_processor import BackupInstanceFaultyProcessor
 from plenum.server.batch_handlers.three_pc_batch import ThreePcBatch
 from plenum.server.inconsistency_watchers import NetworkInconsistencyWatcher
-from plenum.server.quota_control import StaticQuotaControl, RequestQueueQuotaControl
+from plenum.server.quota_control import StaticQuotaControl, RequestQueueQuotaControl, CompositeQuotaControl, \
+    SigVerificationQueueQuotaControl
 from plenum.server.replica_helper import generateName
+from plenum.server.sig_verification_queue import SigVerificationQueue
 from plenum.server.replica_validator_enums import STASH_WATERMARKS, STASH_CATCH_UP, STASH_VIEW_3PC
 from plenum.server.request_managers.action_request_manager import ActionRequestManager
 from plenum.server.request_managers.read_request_manager import ReadRequestManager
@@ -42,6 +45,7 @@ from storage.helper import initKeyValueStorage, initHashStore, initKeyValueStora
 from storage.state_ts_store import StateTsDbStorage
 from stp_core.common.log import getlogger
 from stp_core.crypto.signer import Signer
+from stp_core.loop.looper import WAKEUP_IO, WAKEUP_TIMER
 from stp_core.network.exceptions import RemoteNotFound
 from stp_core.network.network_interface import NetworkInterface
 from stp_core.types import HA
@@ -58,7 +62,7 @@ from plenum.common.constants import POOL_LEDGER_ID, DOMAIN_LEDGER_ID, \
     GET_TXN, DATA, VERKEY, \
     TARGET_NYM, ROLE, STEWARD, TRUSTEE, ALIAS, \
     NODE_IP, BLS_PREFIX, LedgerState, CURRENT_PROTOCOL_VERSION, AUDIT_LEDGER_ID, \
-    AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO, \
+    AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO, AUDIT_TXN_STATE_ROOT, \
     TS_LABEL, SEQ_NO_DB_LABEL, NODE_STATUS_DB_LABEL, \
     LAST_SENT_PP_STORE_LABEL, AUDIT_TXN_PRIMARIES, PRIMARY_SELECTION_PREFIX, MONITORING_PREFIX
 from plenum.common.exceptions import SuspiciousNode, SuspiciousClient, \
@@ -118,6 +122,7 @@ from plenum.server.propagator import Propagator
 from plenum.server.quorums import Quorums
 from plenum.server.replicas import Replicas, MASTER_REPLICA_INDEX
 from plenum.server.req_authenticator import ReqAuthenticator
+from plenum.server.request_handlers.nym_handler import NymHandler
 from plenum.server.router import Router
 from plenum.server.suspicion_codes import Suspicions
 from plenum.server.validator_info_tool import ValidatorNodeInfoTool
@@ -283,6 +288,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         if config.GC_STATS_REPORT_INTERVAL > 0:
             self.startRepeating(self.report_gc_stats, config.GC_STATS_REPORT_INTERVAL)
 
+        if config.STATE_PRUNING_ENABLED:
+            self.init_state_pruning()
+            self.startRepeating(self.prune_states, config.STATE_PRUNING_INTERVAL)
+
         self.white_list_init()
 
         # Map of request identifier, request id to client name. Used for
@@ -305,6 +314,20 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         else:
             self.quota_control = StaticQuotaControl(node_quota=node_quota, client_quota=client_quota)
 
+        # Signatures of client requests and PROPAGATEs can be verified by a pool
+        # of workers, messages are passed on in the order they were received.
+        # The workers are started with the node, see `_start_sig_verification`
+        self.client_sig_verifier = None  # type: Optional[SigVerificationQueue]
+        self.node_sig_verifier = None  # type: Optional[SigVerificationQueue]
+        self._sig_verification_executor = None  # type: Optional[ThreadPoolExecutor]
+        if config.SIG_VERIFICATION_WORKERS > 0:
+            self.quota_control = CompositeQuotaControl(
+                self.quota_control,
+                SigVerificationQueueQuotaControl(
+                    max_sig_verification_queue_size=config.MAX_SIG_VERIFICATION_QUEUE_SIZE,
+                    max_node_quota=node_quota,
+                    max_client_quota=client_quota))
+
         # Any messages that are intended for view numbers higher than the
         # current view.
         self.msgsForFutureViews = {}
@@ -936,6 +959,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
             self.nodestack.start()
             self.clientstack.start()
+            self._start_sig_verification()
 
             self.schedule_node_status_dump()
             self.dump_additional_info()
@@ -982,6 +1006,34 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         """
         return len(self.nodestack.conns) + 1
 
+    def _start_sig_verification(self):
+        if self.config.SIG_VERIFICATION_WORKERS <= 0:
+            return
+        # A stopped executor can't be used again, so a new one is created
+        # every time the node is started
+        self._sig_verification_executor = ThreadPoolExecutor(max_workers=self.config.SIG_VERIFICATION_WORKERS,
+                                                             thread_name_prefix="{}_sig".format(self.name))
+        # Metrics collector is not thread safe, so it's not used by workers
+        verify = partial(self._verify_prepared_signature, metrics=NullMetricsCollector())
+        self.client_sig_verifier = SigVerificationQueue(verify, self._sig_verification_executor,
+                                                        self.config.SIG_VERIFICATION_BATCH_SIZE,
+                                                        prepare=self._prepare_sig_verification)
+        self.node_sig_verifier = SigVerificationQueue(verify, self._sig_verification_executor,
+                                                      self.config.SIG_VERIFICATION_BATCH_SIZE,
+                                                      prepare=self._prepare_sig_verification)
+
+    def _stop_sig_verification(self):
+        if self._sig_verification_executor is None:
+            return
+        # Messages waiting for verification are dropped, workers finish
+        # the batches they are verifying and exit
+        self.client_sig_verifier.clear()
+        self.node_sig_verifier.clear()
+        self._sig_verification_executor.shutdown(wait=False)
+        self.client_sig_verifier = None
+        self.node_sig_verifier = None
+        self._sig_verification_executor = None
+
     @property
     def ledgers(self):
         return [self.ledgerManager.ledgerRegistry[lid].ledger
@@ -992,6 +1044,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         Actions to be performed on stopping the node.
 
         - Close the UDP socket of the nodestack
+        - Stop the workers verifying signatures
         """
         # Log stats should happen before any kind of reset or clearing
         if self.config.STACK_COMPANION == 1:
@@ -1010,6 +1063,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.nodestack.stop()
         self.clientstack.stop()
 
+        self._stop_sig_verification()
+
         self.closeAllKVStores()
 
         self._info_tool.stop()
@@ -1049,7 +1104,8 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.last_prod_started = time.perf_counter()
 
         self.quota_control.update_state({
-            'request_queue_size': len(self.monitor.requestTracker.unordered())}
+            'request_queue_size': len(self.monitor.requestTracker.unordered()),
+            'sig_verification_queue_size': len(self.client_sig_verifier) if self.client_sig_verifier else 0}
         )
 
         if self.status is not Status.stopped:
@@ -1075,6 +1131,31 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         return c
 
+    def wakeup_sources(self):
+        return self.nodestack.wakeup_sockets() + self.clientstack.wakeup_sockets()
+
+    def time_to_next_event(self) -> Optional[float]:
+        if self.nodestack.has_pending_input():
+            return 0
+        if self.clientstack.has_pending_input():
+            # Client messages are left unread while the client quota is exhausted
+            return 0 if self.quota_control.client_quota.count > 0 else None
+        if any(verifier is not None and len(verifier) > 0
+               for verifier in (self.client_sig_verifier, self.node_sig_verifier)):
+            # Signatures are verified by workers which do not wake the looper up
+            return None
+        times = [self.timer.time_to_next_event(),
+                 HasActionQueue.time_to_next_event(self),
+                 self.monitor.time_to_next_event()]
+        times.extend(replica.time_to_next_event() for replica in self.replicas.values())
+        return min((t for t in times if t is not None), default=float('inf'))
+
+    def on_wakeup(self, reason: str, latency: float):
+        if reason == WAKEUP_IO:
+            self.metrics.add_event(MetricsName.LOOPER_IO_WAKEUP_LATENCY, latency)
+        elif reason == WAKEUP_TIMER:
+            self.metrics.add_event(MetricsName.LOOPER_TIMER_WAKEUP_LATENCY, latency)
+
     @async_measure_time(MetricsName.SERVICE_REPLICAS_TIME)
     async def serviceReplicas(self, limit) -> int:
         """
@@ -1104,6 +1185,10 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.metrics.add_event(MetricsName.NODE_STACK_MESSAGES_PROCESSED, n)
 
+        if self.node_sig_verifier is not None:
+            self.node_sig_verifier.submit()
+            self.node_sig_verifier.service(self.unpackNodeMsg, self._on_node_msg_sig_verification_failed)
+
         await self.processNodeInBox()
         return n
 
@@ -1118,6 +1203,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         c = await self.clientstack.service(limit, self.quota_control.client_quota)
         self.metrics.add_event(MetricsName.CLIENT_STACK_MESSAGES_PROCESSED, c)
 
+        if self.client_sig_verifier is not None:
+            self.client_sig_verifier.submit()
+            self.client_sig_verifier.service(self._on_client_msg_sig_verified,
+                                             self._on_client_msg_sig_verification_failed)
+
         await self.processClientInBox()
         return c
 
@@ -1461,13 +1551,18 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         the message
         """
         try:
-            vmsg = self.validateNodeMsg(wrappedMsg)
+            vmsg = self.validateNodeMsg(wrappedMsg, verify_signature=self.node_sig_verifier is None)
             if vmsg:
-                logger.trace("{} msg validated {}".format(self, wrappedMsg),
+                logger.trace("%s msg validated %s", self, wrappedMsg,
                              extra={"tags": ["node-msg-validation"]})
-                self.unpackNodeMsg(*vmsg)
+                msg, frm = vmsg
+                if self.node_sig_verifier is None or isinstance(msg, Batch):
+                    self.unpackNodeMsg(msg, frm)
+                else:
+                    self.node_sig_verifier.add(msg, frm,
+                                               need_verification=not isinstance(msg, self.authnWhitelist))
             else:
-                logger.debug("{} invalidated msg {}".format(self, wrappedMsg),
+                logger.debug("%s invalidated msg %s", self, wrappedMsg,
                              extra={"tags": ["node-msg-validation"]})
         except SuspiciousNode as ex:
             self.reportSuspiciousNodeEx(ex)
@@ -1476,12 +1571,13 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             self.discard(msg, ex, logger.info)
 
     @measure_time(MetricsName.VALIDATE_NODE_MSG_TIME)
-    def validateNodeMsg(self, wrappedMsg):
+    def validateNodeMsg(self, wrappedMsg, verify_signature=True):
         """
         Validate another node's message sent to this node.
 
         :param wrappedMsg: Tuple of message and the name of the node that sent
         the message
+        :param verify_signature: whether to verify the message signature
         :return: Tuple of message from node and name of the node
         """
         msg, frm = wrappedMsg
@@ -1497,12 +1593,26 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             except Exception as ex:
                 raise InvalidNodeMsg(str(ex))
 
+        if verify_signature:
+            try:
+                self.verifySignature(message)
+            except BaseExc as ex:
+                raise SuspiciousNode(frm, ex, message) from ex
+        logger.debug("%s received node message from %s: %s", self, frm, message, extra={"cli": False})
+        return message, frm
+
+    def _on_node_msg_sig_verification_failed(self, msg, frm, ex):
+        # Signatures are verified by workers concurrently with state updates made
+        # by the looper, so the signature is checked once again before rejecting the message
         try:
-            self.verifySignature(message)
+            self.verifySignature(msg)
         except BaseExc as ex:
-            raise SuspiciousNode(frm, ex, message) from ex
-        logger.debug("{} received node message from {}: {}".format(self, frm, message), extra={"cli": False})
-        return message, frm
+            self.reportSuspiciousNodeEx(SuspiciousNode(frm, ex, msg))
+            return
+        except Exception as ex:
+            self.discard(msg, ex, logger.info)
+            return
+        self.unpackNodeMsg(msg, frm)
 
     def unpackNodeMsg(self, msg, frm) -> None:
         """
@@ -1516,7 +1626,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         # a transport, it should be encapsulated.
 
         if isinstance(msg, Batch):
-            logger.trace("{} processing a batch {}".format(self, msg))
+            logger.trace("%s processing a batch %s", self, msg)
             with self.metrics.measure_time(MetricsName.UNPACK_BATCH_TIME):
                 for m in msg.messages:
                     try:
@@ -1535,7 +1645,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param msg: a node message
         :param frm: the name of the node that sent this `msg`
         """
-        logger.trace("{} appending to nodeInbox {}".format(self, msg))
+        logger.trace("%s appending to nodeInbox %s", self, msg)
         self.nodeInBox.append((msg, frm))
 
     @async_measure_time(MetricsName.PROCESS_NODE_INBOX_TIME)
@@ -1561,18 +1671,46 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param wrappedMsg: a message from a client
         """
         try:
-            vmsg = self.validateClientMsg(wrappedMsg)
+            vmsg = self.validateClientMsg(wrappedMsg, verify_signature=self.client_sig_verifier is None)
             if vmsg:
-                self.unpackClientMsg(*vmsg)
+                msg, frm = vmsg
+                if self.client_sig_verifier is None or isinstance(msg, Batch):
+                    self.unpackClientMsg(msg, frm)
+                else:
+                    self.client_sig_verifier.add(msg, frm,
+                                                 need_verification=not isinstance(msg, self.authnWhitelist))
         except BlowUp:
             raise
         except Exception as ex:
-            msg, frm = wrappedMsg
-            friendly = friendlyEx(ex)
-            if isinstance(ex, SuspiciousClient):
-                self.reportSuspiciousClient(frm, friendly)
+            self._handle_client_msg_exception(ex, wrappedMsg)
 
-            self.handleInvalidClientMsg(ex, wrappedMsg)
+    def _handle_client_msg_exception(self, ex, wrappedMsg):
+        msg, frm = wrappedMsg
+        friendly = friendlyEx(ex)
+        if isinstance(ex, SuspiciousClient):
+            self.reportSuspiciousClient(frm, friendly)
+
+        self.handleInvalidClientMsg(ex, wrappedMsg)
+
+    def _on_client_msg_sig_verified(self, msg, frm):
+        try:
+            self.unpackClientMsg(msg, frm)
+        except BlowUp:
+            raise
+        except Exception as ex:
+            self._handle_client_msg_exception(ex, (msg, frm))
+
+    def _on_client_msg_sig_verification_failed(self, msg, frm, ex):
+        # Signatures are verified by workers concurrently with state updates made
+        # by the looper, so the signature is checked once again before rejecting the message
+        try:
+            self.verifySignature(msg)
+        except BlowUp:
+            raise
+        except Exception as ex:
+            self._handle_client_msg_exception(ex, (msg, frm))
+            return
+        self._on_client_msg_sig_verified(msg, frm)
 
     def handleInvalidClientMsg(self, ex, wrappedMsg):
         msg, frm = wrappedMsg
@@ -1615,10 +1753,11 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
             # no need to send it back as NACK is already sent
             pass
 
-    def validateClientMsg(self, wrappedMsg):
+    def validateClientMsg(self, wrappedMsg, verify_signature=True):
         """
         Validate a message sent by a client.
         :param wrappedMsg: a message from a client
+        :param verify_signature: whether to verify the message signature
         :return: Tuple of clientMessage and client address
         """
         msg, frm = wrappedMsg
@@ -1654,9 +1793,9 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         self.replicas.send_to_internal_bus(PreSigVerification(cMsg),
                                            self.master_replica.instId)
-        self.verifySignature(cMsg)
-        logger.trace("{} received CLIENT message: {}".
-                     format(self.clientstack.name, cMsg))
+        if verify_signature:
+            self.verifySignature(cMsg)
+        logger.trace("%s received CLIENT message: %s", self.clientstack.name, cMsg)
         return cMsg, frm
 
     def unpackClientMsg(self, msg, frm):
@@ -1707,8 +1846,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         while self.clientInBox:
             m = self.clientInBox.popleft()
             req, frm = m
-            logger.debug("{} processing {} request {}".
-                         format(self.clientstack.name, frm, req),
+            logger.debug("%s processing %s request %s", self.clientstack.name, frm, req,
                          extra={"cli": True,
                                 "tags": ["node-msg-processing"]})
 
@@ -2008,8 +2146,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param request: the REQUEST from the client
         :param frm: the name of the client that sent this REQUEST
         """
-        logger.debug("{} received client request: {} from {}".
-                     format(self.name, request, frm))
+        logger.debug("%s received client request: %s from %s", self.name, request, frm)
         self.nodeRequestSpikeMonitorData['accum'] += 1
 
         # TODO: What if client sends requests with same request id quickly so
@@ -2107,10 +2244,9 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         :param msg: the propagateRequest
         :param frm: the name of the node which sent this `msg`
         """
-        logger.debug("{} received propagated request: {}".
-                     format(self.name, msg))
+        logger.debug("%s received propagated request: %s", self.name, msg)
 
-        request = TxnUtilConfig.client_request_class(**msg.request)
+        request = self._get_propagated_request(msg)
 
         clientName = msg.senderClient
 
@@ -2286,6 +2422,46 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         obj_tree.report_top_collections()
         obj_tree.cleanup()
 
+    def init_state_pruning(self):
+        for ledger_id, state in self.states.items():
+            if isinstance(state, PruningState):
+                state.create_pruner(partial(self._get_retained_state_roots, ledger_id))
+
+    def _get_retained_state_roots(self, ledger_id):
+        """
+        State roots of the ledger which must stay readable: the ones recorded
+        in the last `STATE_PRUNING_RETAINED_AUDIT_TXNS` audit txns and the last
+        audited one (which may be recorded in an older audit txn)
+        """
+        roots = set()
+        audit_ledger = self.auditLedger
+        if audit_ledger is None or audit_ledger.size == 0:
+            return roots
+
+        audit_index = self.db_manager.audit_index
+        if audit_index is not None and audit_index.covers(audit_ledger):
+            _, state_root = audit_index.get_last_state_root(ledger_id)
+            if state_root:
+                roots.add(Ledger.strToHash(state_root))
+
+        frm = max(1, audit_ledger.size - self.config.STATE_PRUNING_RETAINED_AUDIT_TXNS + 1)
+        for _, txn in audit_ledger.getAllTxn(frm=frm):
+            for lid, state_root in get_payload_data(txn).get(AUDIT_TXN_STATE_ROOT, {}).items():
+                if int(lid) == ledger_id and state_root:
+                    roots.add(Ledger.strToHash(state_root))
+        return roots
+
+    @measure_time(MetricsName.STATE_PRUNING_TIME)
+    def prune_states(self):
+        pruned = 0
+        for state in self.states.values():
+            pruner = getattr(state, 'pruner', None)
+            if pruner is not None:
+                pruned += pruner.run(self.config.STATE_PRUNING_STEP_SIZE)
+        if pruned:
+            self.metrics.add_event(MetricsName.STATE_PRUNED_NODES, pruned)
+            logger.debug("{} pruned {} state trie nodes".format(self, pruned))
+
     def flush_metrics(self):
         # Flush accumulated should always be done to avoid numeric overflow in accumulators
         self.metrics.flush_accumulated()
@@ -2324,6 +2500,22 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         self.metrics.add_event(MetricsName.DOMAIN_LEDGER_UNCOMMITTED_SIZE, len(self.domainLedger.uncommittedTxns))
         self.metrics.add_event(MetricsName.CONFIG_LEDGER_UNCOMMITTED_SIZE, len(self.configLedger.uncommittedTxns))
 
+        node_caches = {id(cache): cache for cache in (getattr(state, 'node_cache', None)
+                                                      for state in self.states.values()) if cache is not None}
+        self.metrics.add_event(MetricsName.STATE_TRIE_NODE_CACHE_HITS,
+                               sum(cache.hits for cache in node_caches.values()))
+        self.metrics.add_event(MetricsName.STATE_TRIE_NODE_CACHE_MISSES,
+                               sum(cache.misses for cache in node_caches.values()))
+        self.metrics.add_event(MetricsName.STATE_TRIE_NODE_CACHE_SIZE,
+                               sum(cache.size for cache in node_caches.values()))
+        for cache in node_caches.values():
+            cache.reset_stats()
+
+        self.metrics.add_event(MetricsName.CLIENT_SIG_VERIFICATION_QUEUE_SIZE,
+                               len(self.client_sig_verifier) if self.client_sig_verifier else 0)
+        self.metrics.add_event(MetricsName.NODE_SIG_VERIFICATION_QUEUE_SIZE,
+                               len(self.node_sig_verifier) if self.node_sig_verifier else 0)
+
         # Collections metrics
         def sum_for_values(obj):
             # We don't want to get 0 if we have huge dictionary of empty queues, hence +1
@@ -2621,19 +2813,48 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
         logger.debug('{} ordered previous view batch {} by instance {}'.
                      format(self, pp_seqno, inst_id))
 
-    def verifySignature(self, msg):
+    def verifySignature(self, msg, metrics: MetricsCollector = None):
         """
         Validate the signature of the request
         Note: Batch is whitelisted because the inner messages are checked
 
         :param msg: a message requiring signature verification
+        :param metrics: metrics collector to use instead of the node one
         :return: None; raises an exception if the signature is not valid
         """
         if isinstance(msg, self.authnWhitelist):
             return
+        typ, req, key = self._get_request_data_to_authenticate(msg)
+        self._authenticate_request_data(typ, req, key, metrics=metrics)
+
+    def _prepare_sig_verification(self, msg):
+        """
+        Get the request data of a message and the verkeys of its signers before
+        passing the message to signature verification workers. This is done in
+        the looper thread, since the state the verkeys are taken from is
+        changed by that thread and can't be read by the workers.
+        """
+        typ, req, key = self._get_request_data_to_authenticate(msg)
+        verkeys = self.authNr(req).get_verkeys(req)
+        return typ, req, key, verkeys
+
+    def _verify_prepared_signature(self, msg, prepared, metrics: MetricsCollector = None):
+        typ, req, key, verkeys = prepared
+        self._authenticate_request_data(typ, req, key, verkeys=verkeys, metrics=metrics)
+
+    def _authenticate_request_data(self, typ, req, key, verkeys=None, metrics: MetricsCollector = None):
+        with (metrics or self.metrics).measure_time(MetricsName.VERIFY_SIGNATURE_TIME):
+            identifiers = self.authNr(req).authenticate(req, key=key, verkeys=verkeys)
+
+        logger.debug("{} authenticated {} signature on {} request {}".
+                     format(self, identifiers, typ, req['reqId']),
+                     extra={"cli": True,
+                            "tags": ["node-msg-processing"]})
+
+    def _get_request_data_to_authenticate(self, msg):
         if isinstance(msg, Propagate):
             typ = 'propagate'
-            req = TxnUtilConfig.client_request_class(**msg.request)
+            req = self._get_propagated_request(msg)
         else:
             typ = ''
             req = msg
@@ -2642,17 +2863,14 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
         if isinstance(req, Request):
             key = req.key
-
-        if not isinstance(req, Mapping):
+            req = req.as_read_only_dict()
+        elif not isinstance(req, Mapping):
             req = req.as_dict
+        return typ, req, key
 
-        with self.metrics.measure_time(MetricsName.VERIFY_SIGNATURE_TIME):
-            identifiers = self.authNr(req).authenticate(req, key=key)
-
-        logger.debug("{} authenticated {} signature on {} request {}".
-                     format(self, identifiers, typ, req['reqId']),
-                     extra={"cli": True,
-                            "tags": ["node-msg-processing"]})
+    @staticmethod
+    def _get_propagated_request(msg: Propagate) -> Request:
+        return msg.get_request(TxnUtilConfig.client_request_class)
 
     def authNr(self, req):
         return self.clientAuthNr
@@ -2833,10 +3051,15 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
 
     def init_core_authenticator(self):
         state = self.getState(DOMAIN_LEDGER_ID)
-        return CoreAuthNr(self.write_manager.txn_types,
-                          self.read_manager.txn_types,
-                          self.action_manager.txn_types,
-                          state=state)
+        authnr = CoreAuthNr(self.write_manager.txn_types,
+                            self.read_manager.txn_types,
+                            self.action_manager.txn_types,
+                            state=state,
+                            verifier_cache_size=self.config.VERIFIER_CACHE_SIZE)
+        for handler in self.write_manager.request_handlers.get(NYM, []):
+            if isinstance(handler, NymHandler):
+                handler.verifier_cache = authnr.verifier_cache
+        return authnr
 
     def defaultAuthNr(self) -> ReqAuthenticator:
         req_authnr = ReqAuthenticator()
@@ -2980,8 +3203,7 @@ class Node(HasActionQueue, Motor, Propagator, MessageProcessor, HasFileStorage,
                            self.nodestack.remotes.values()]
             recipientsNum = 'all'
 
-        logger.debug("{} sending message {} to {} recipients: {}".
-                     format(self, msg, recipientsNum, remoteNames))
+        logger.debug("%s sending message %s to %s recipients: %s", self, msg, recipientsNum, remoteNames)
         self.nodestack.send(msg, *rids, signer=signer, message_splitter=message_splitter)
 
     def sendToNodes(self, msg: Any, names: Iterable[str] = None, message_splitter=None):
@@ -75,3 +75,26 @@ class RequestQueueQuotaControl(QuotaControl):
     @property
     def client_quota(self) -> Quota:
         return Quota(count=0, size=0) if self._request_queue_overflow else self._max_client_quota
+
+
+class SigVerificationQueueQuotaControl(QuotaControl):
+    def __init__(self,
+                 max_sig_verification_queue_size: int,
+                 max_node_quota: Quota,
+                 max_client_quota: Quota):
+        self._max_sig_verification_queue_size = max_sig_verification_queue_size
+        self._max_node_quota = max_node_quota
+        self._max_client_quota = max_client_quota
+        self._sig_verification_queue_overflow = False
+
+    def update_state(self, state: dict):
+        self._sig_verification_queue_overflow = \
+            state.get('sig_verification_queue_size', 0) >= self._max_sig_verification_queue_size
+
+    @property
+    def node_quota(self) -> Quota:
+        return self._max_node_quota
+
+    @property
+    def client_quota(self) -> Quota:
+        return Quota(count=0, size=0) if self._sig_verification_queue_overflow else self._max_client_quota
@@ -635,6 +635,7 @@ class Replica(HasActionQueue, MessageProcessor):
             return self._freshness_checker.get_last_update_time()
 
     def get_valid_req_ids_from_all_requests(self, reqs, invalid_indices):
+        invalid_indices = set(invalid_indices)
         return [req.key for idx, req in enumerate(reqs) if idx not in invalid_indices]
 
     def report_suspicious_node(self, ex):
@@ -1,9 +1,9 @@
-from copy import deepcopy
-from typing import Optional
+from typing import Dict, Optional
 
 from plenum.common.constants import TXN_TYPE
 from common.error import error
 from plenum.common.exceptions import NoAuthenticatorFound
+from plenum.common.request import ReadOnlyRequestData
 from plenum.common.types import OPERATION, f
 from plenum.server.client_authn import ClientAuthNr
 
@@ -20,41 +20,72 @@ class ReqAuthenticator:
     def register_authenticator(self, authenticator: ClientAuthNr):
         self._authenticators.append(authenticator)
 
-    def authenticate(self, req_data, key=None):
+    def authenticate(self, req_data, key=None, verkeys=None):
         """
         Authenticates a given request data by verifying signatures from
         any registered authenticators. If the request is a query returns
         immediately, if no registered authenticator can authenticate then an
         exception is raised.
         :param req_data:
+        :param verkeys: verkeys of the signers taken by `get_verkeys`; if
+        None, authenticators look the verkeys up themselves
         :return:
         """
         identifiers = set()
+        if not isinstance(req_data, ReadOnlyRequestData):
+            req_data = ReadOnlyRequestData(req_data)
         typ = req_data.get(OPERATION, {}).get(TXN_TYPE)
-        if key and self._check_and_verify_existing_req(req_data, key):
-            return self._verified_reqs[key]['identifiers']
+        if key:
+            # Requests can be authenticated by several threads, so the
+            # verified request is read only once
+            verified = self._verified_reqs.get(key)
+            if verified is not None and self._check_and_verify_existing_req(req_data, verified):
+                return verified['identifiers']
 
-        for authenticator in self._authenticators:
+        for idx, authenticator in enumerate(self._authenticators):
             if authenticator.is_query(typ):
                 return set()
             if not (authenticator.is_write(typ) or
                     authenticator.is_action(typ)):
                 continue
-            rv = authenticator.authenticate(deepcopy(req_data)) or set()
-            identifiers.update(rv)
+            authnr_verkeys = verkeys.get(idx) if verkeys is not None else None
+            if authnr_verkeys is None:
+                rv = authenticator.authenticate(req_data)
+            else:
+                rv = authenticator.authenticate(req_data, verkeys=authnr_verkeys)
+            identifiers.update(rv or set())
 
         if not identifiers:
             raise NoAuthenticatorFound
         if key:
-            self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm)}
-            self._verified_reqs[key]['identifiers'] = identifiers
+            self._verified_reqs[key] = {'signature': req_data.get(f.SIG.nm),
+                                        'identifiers': identifiers}
         return identifiers
 
-    def _check_and_verify_existing_req(self, req_data: dict, key: str):
-        if key in self._verified_reqs:
-            if req_data.get(f.SIG.nm) == self._verified_reqs[key]['signature']:
-                return True
-        return False
+    def get_verkeys(self, req_data) -> Dict[int, Dict[str, Optional[str]]]:
+        """
+        Gets verkeys of the request signers for each authenticator which
+        would authenticate the request, so that they are not looked up by
+        `authenticate` which can be called later in another thread
+        :param req_data:
+        :return: verkeys by the index of authenticator
+        """
+        verkeys = {}
+        typ = req_data.get(OPERATION, {}).get(TXN_TYPE)
+        for idx, authenticator in enumerate(self._authenticators):
+            if authenticator.is_query(typ):
+                break
+            if not (authenticator.is_write(typ) or
+                    authenticator.is_action(typ)):
+                continue
+            authnr_verkeys = authenticator.get_verkeys(req_data)
+            if authnr_verkeys is not None:
+                verkeys[idx] = authnr_verkeys
+        return verkeys
+
+    @staticmethod
+    def _check_and_verify_existing_req(req_data: dict, verified: dict):
+        return req_data.get(f.SIG.nm) == verified['signature']
 
     @property
     def core_authenticator(self):
@@ -68,5 +99,4 @@ class ReqAuthenticator:
                 return authnr
 
     def clean_from_verified(self, key):
-        if key in self._verified_reqs:
-            self._verified_reqs.pop(key)
+        self._verified_reqs.pop(key, None)
@@ -42,14 +42,7 @@ class GetTxnHandler(ReadRequestHandler):
 
         try:
             txn = self.node.getReplyFromLedger(db.ledger, seq_no, write=False)
-            audit_ledger = self.database_manager.get_ledger(AUDIT_LEDGER_ID)
-            audit_seq_no = audit_ledger.size
-            state_root = None
-            for seq_no in reversed(range(1, audit_seq_no + 1)):
-                audit_txn = audit_ledger.getBySeqNo(seq_no)
-                state_root = audit_txn[TXN_PAYLOAD][DATA][AUDIT_TXN_STATE_ROOT].get(ledger_id, None)
-                if state_root:
-                    break
+            state_root = self._get_last_audited_state_root(ledger_id)
             if state_root is not None:
                 multi_sig = self.database_manager.bls_store.get(state_root)
         except KeyError:
@@ -77,3 +70,18 @@ class GetTxnHandler(ReadRequestHandler):
             result[f.SEQ_NO.nm] = get_seq_no(txn.result)
 
         return result
+
+    def _get_last_audited_state_root(self, ledger_id):
+        audit_ledger = self.database_manager.get_ledger(AUDIT_LEDGER_ID)
+        audit_index = self.database_manager.audit_index
+        if audit_index is not None and audit_index.covers(audit_ledger):
+            _, state_root = audit_index.get_last_state_root(ledger_id)
+            return state_root
+
+        state_root = None
+        for seq_no in reversed(range(1, audit_ledger.size + 1)):
+            audit_txn = audit_ledger.getBySeqNo(seq_no)
+            state_root = audit_txn[TXN_PAYLOAD][DATA][AUDIT_TXN_STATE_ROOT].get(ledger_id, None)
+            if state_root:
+                break
+        return state_root
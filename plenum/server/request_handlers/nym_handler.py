@@ -11,6 +11,7 @@ from plenum.common.request import Request
 from plenum.common.txn_util import get_payload_data, get_from, \
     get_seq_no, get_txn_time, get_request_data
 from plenum.common.types import f
+from plenum.server.client_authn import VerifierCache
 from plenum.server.database_manager import DatabaseManager
 from plenum.server.request_handlers.handler_interfaces.write_request_handler import WriteRequestHandler
 from plenum.server.request_handlers.utils import is_steward, get_nym_details
@@ -26,6 +27,9 @@ class NymHandler(WriteRequestHandler):
         super().__init__(database_manager, NYM, DOMAIN_LEDGER_ID)
         self.config = config
         self._steward_count = 0
+        # Cache of the client authenticator whose entries of a nym are
+        # dropped once its verkey changes
+        self.verifier_cache = None  # type: Optional[VerifierCache]
 
     def static_validation(self, request: Request):
         pass
@@ -76,6 +80,9 @@ class NymHandler(WriteRequestHandler):
         new_data[ROLE] = txn_data.get(ROLE, None)
         if VERKEY in txn_data:
             new_data[VERKEY] = txn_data[VERKEY]
+            if self.verifier_cache is not None and \
+                    existing_data and existing_data.get(VERKEY) != new_data[VERKEY]:
+                self.verifier_cache.invalidate(nym)
         new_data[F.seqNo.name] = get_seq_no(txn)
         new_data[TXN_TIME] = get_txn_time(txn)
         self.__update_steward_count(new_data, existing_data)
@@ -169,6 +169,10 @@ class WriteRequestManager(RequestManager):
         handlers = self.batch_handlers.get(three_pc_batch.ledger_id, None)
         if handlers is None:
             raise LogicError
+        state = self.database_manager.get_state(three_pc_batch.ledger_id)
+        if state is not None:
+            # The batch may be reverted to or committed later
+            state.add_uncommitted_root(state.headHash)
         prev_handler_result = handlers[0].post_batch_applied(three_pc_batch, None)
         for handler in handlers[1:]:
             prev_handler_result = handler.post_batch_applied(three_pc_batch, prev_handler_result)
@@ -0,0 +1,122 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+# message, sender, whether the message signature needs to be verified,
+# data prepared for the verification
+QueuedMsg = Tuple[Any, Any, bool, Any]
+
+
+class SigVerificationQueue:
+    """
+    Verifies signatures of incoming messages on a pool of workers and hands
+    the messages out in exactly the order they were added, no matter in which
+    order the verification finishes. Messages are verified in batches to keep
+    the overhead of passing them to the workers low.
+    """
+
+    def __init__(self,
+                 verify: Callable[..., None],
+                 executor: Executor,
+                 batch_size: int,
+                 prepare: Optional[Callable[[Any], Any]] = None):
+        """
+        :param verify: verifies signature of a message raising an exception if it is invalid,
+        called in worker threads
+        :param executor: pool of workers
+        :param batch_size: max number of messages verified by a worker in one go
+        :param prepare: if given, it's called with a message needing verification when the
+        message is added, so in the thread using the queue; what it returns is passed to
+        `verify` along with the message
+        """
+        self._verify = verify
+        self._prepare = prepare
+        self._executor = executor
+        self._batch_size = batch_size
+        self._to_submit = []  # type: List[QueuedMsg]
+        self._in_flight = deque()  # type: Deque[Tuple[Optional[Future], List[QueuedMsg]]]
+        self._size = 0
+
+    def __len__(self):
+        """
+        Number of messages added to the queue and not handed out yet
+        """
+        return self._size
+
+    def add(self, msg, frm, need_verification: bool = True):
+        prepared = None
+        if need_verification and self._prepare is not None:
+            prepared = self._prepare(msg)
+        self._to_submit.append((msg, frm, need_verification, prepared))
+        self._size += 1
+        if len(self._to_submit) >= self._batch_size:
+            self.submit()
+
+    def submit(self):
+        """
+        Pass all the added messages to the workers
+        """
+        if not self._to_submit:
+            return
+        batch, self._to_submit = self._to_submit, []
+        future = None
+        if any(need_verification for _, _, need_verification, _ in batch):
+            future = self._executor.submit(self._verify_batch, batch)
+        self._in_flight.append((future, batch))
+
+    def clear(self):
+        """
+        Drop all the messages, verification which has not started yet is cancelled
+        """
+        for future, _ in self._in_flight:
+            if future is not None:
+                future.cancel()
+        self._in_flight.clear()
+        self._to_submit = []
+        self._size = 0
+
+    def service(self,
+                on_verified: Callable[[Any, Any], None],
+                on_failed: Callable[[Any, Any, Exception], None]) -> int:
+        """
+        Hand out the messages whose verification is finished, stopping at
+        the first message which is still being verified
+
+        :param on_verified: called with a message and its sender if the signature is valid
+        :param on_failed: called with a message, its sender and the verification exception otherwise
+        :return: number of handed out messages
+        """
+        count = 0
+        while self._in_flight:
+            future, batch = self._in_flight[0]
+            if future is not None and not future.done():
+                break
+            self._in_flight.popleft()
+            errors = future.result() if future is not None else [None] * len(batch)
+            for (msg, frm, _, _), error in zip(batch, errors):
+                self._size -= 1
+                if error is None:
+                    on_verified(msg, frm)
+                else:
+                    on_failed(msg, frm, error)
+            count += len(batch)
+        return count
+
+    def _verify_batch(self, batch: List[QueuedMsg]) -> List[Optional[Exception]]:
+        errors = []
+        for msg, _, need_verification, prepared in batch:
+            error = None
+            if need_verification:
+                try:
+                    if self._prepare is None:
+                        self._verify(msg)
+                    else:
+                        self._verify(msg, prepared)
+                except Exception as ex:
+                    error = ex
+            errors.append(error)
+        return errors
@@ -0,0 +1,142 @@
+from time import perf_counter
+
+import pytest
+
+from plenum.common.batched import Batched
+from plenum.common.messages.node_messages import Prepare, Commit
+from plenum.common.util import get_utc_epoch
+from plenum.test.bls.helper import generate_state_root
+from plenum.test.perf_helper import perf_param, print_perf_result
+from plenum.test.testing_utils import FakeSomething
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC, is_binary_frame
+from stp_zmq.zstack import ZStack
+
+MSG_LEN_LIMIT = 128 * 1024
+REMOTES_COUNT = 24
+
+
+class BroadcastingBatched(Batched):
+    serializeMsg = staticmethod(ZStack.serializeMsg)
+
+    def __init__(self, codecs):
+        super().__init__(FakeSomething(MSG_LEN_LIMIT=MSG_LEN_LIMIT, TRANSPORT_BATCH_ENABLED=True))
+        self.binary_codec_enabled = MSGPACK_CODEC in codecs
+        self.remotes = {rid: FakeSomething(name='Node{}'.format(rid), codec=codec_name)
+                        for rid, codec_name in enumerate(codecs)}
+        self.transmitted = {rid: [] for rid in self.remotes}
+        self.messageTimeout = None
+
+    def remote_codec(self, rid):
+        return self.remotes[rid].codec
+
+    def transmit(self, msg, uid, timeout=None, serialized=False, is_batch=False):
+        self.transmitted[uid].append(msg)
+        return True, None
+
+
+def create_3pc_msgs(count):
+    msgs = []
+    for pp_seq_no in range(count):
+        msgs.append(Prepare(0, 1, pp_seq_no, get_utc_epoch(), 'd' * 32,
+                            generate_state_root(), generate_state_root(), generate_state_root()))
+        msgs.append(Commit(0, 1, pp_seq_no))
+    return msgs
+
+
+def broadcast_and_flush(batched, msgs):
+    for msg in msgs:
+        batched.send(msg)
+    batched.flushOutBoxes()
+    return batched.transmitted
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+def test_broadcast_batches_are_made_once(codec_name):
+    batched = BroadcastingBatched([codec_name] * REMOTES_COUNT)
+    transmitted = broadcast_and_flush(batched, create_3pc_msgs(10))
+
+    first, *others = transmitted.values()
+    assert len(first) == 1
+    assert all(len(batches) == 1 and batches[0] is first[0] for batches in others)
+
+
+def test_broadcast_batches_are_made_once_per_codec():
+    codecs = [JSON_CODEC, MSGPACK_CODEC] * (REMOTES_COUNT // 2)
+    batched = BroadcastingBatched(codecs)
+    transmitted = broadcast_and_flush(batched, create_3pc_msgs(10))
+
+    batches = {}
+    for rid, codec_name in enumerate(codecs):
+        batches.setdefault(codec_name, transmitted[rid][0])
+        assert transmitted[rid] == [batches[codec_name]]
+        assert transmitted[rid][0] is batches[codec_name]
+    assert batches[JSON_CODEC] != batches[MSGPACK_CODEC]
+
+
+def test_batches_differ_for_different_outboxes():
+    batched = BroadcastingBatched([JSON_CODEC] * 3)
+    msgs = create_3pc_msgs(10)
+    for msg in msgs:
+        batched.send(msg)
+    batched.send(Commit(0, 1, 100), 0)
+    batched.flushOutBoxes()
+
+    assert batched.transmitted[1] == batched.transmitted[2]
+    assert batched.transmitted[0] != batched.transmitted[1]
+    assert len(ZStack.deserializeMsg(batched.transmitted[0][0])['messages']) == len(msgs) + 1
+
+
+@pytest.mark.parametrize('batch_enabled', [True, False])
+def test_binary_msgs_are_sent_as_json_after_remote_switches_to_json(batch_enabled):
+    batched = BroadcastingBatched([MSGPACK_CODEC] * 2)
+    batched.enabled = batch_enabled
+    msgs = create_3pc_msgs(10)
+    for msg in msgs:
+        batched.send(msg)
+    batched.remotes[0].codec = JSON_CODEC
+    batched.flushOutBoxes()
+
+    def received(frames):
+        result = []
+        for frame in frames:
+            msg = ZStack.deserializeMsg(frame)
+            if msg['op'] == 'BATCH':
+                result.extend(ZStack.deserializeMsg(m) for m in msg['messages'])
+            else:
+                result.append(msg)
+        return result
+
+    assert not any(is_binary_frame(frame) for frame in batched.transmitted[0])
+    assert all(is_binary_frame(frame) for frame in batched.transmitted[1])
+    expected = [ZStack.deserializeMsg(ZStack.serializeMsg(msg._asdict())) for msg in msgs]
+    assert received(batched.transmitted[0]) == expected
+    assert received(batched.transmitted[1]) == expected
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+@pytest.mark.parametrize('msgs_count', [10, perf_param(100)])
+def test_broadcast_flush_perf(codec_name, msgs_count, capsys):
+    msgs = create_3pc_msgs(msgs_count)
+
+    batched = BroadcastingBatched([codec_name] * REMOTES_COUNT)
+    for msg in msgs:
+        batched.send(msg)
+    start = perf_counter()
+    batched.flushOutBoxes()
+    shared_time = perf_counter() - start
+
+    # Every remote has its own outbox with its own messages, so nothing is shared
+    separate = BroadcastingBatched([codec_name] * REMOTES_COUNT)
+    for msg in msgs:
+        for rid in separate.remotes:
+            separate.send(msg, rid)
+    start = perf_counter()
+    separate.flushOutBoxes()
+    separate_time = perf_counter() - start
+
+    assert batched.transmitted == separate.transmitted
+
+    print_perf_result(capsys,
+                      'Flushed {} {} msgs to {} remotes: batching per remote in {:.4f} seconds, '
+                      'batching once in {:.4f} seconds'.format(len(msgs), codec_name, REMOTES_COUNT,
+                                                              separate_time, shared_time))
@@ -1,6 +1,9 @@
 import json
+import random
 
-from plenum.common.prepare_batch import split_messages_on_batches, SPLIT_STEPS_LIMIT
+import pytest
+
+from plenum.common.prepare_batch import split_messages_on_batches, SPLIT_STEPS_LIMIT, BatchFormat
 from plenum.common.util import randomString
 
 LEN_LIMIT_BYTES = 100
@@ -90,3 +93,33 @@ def test_batch_size_limitations():
     for r in res:
         batch, length = r
         assert len(batch) <= msg_limit
+
+
+def make_batch_of_items(msgs):
+    if len(msgs) == 1:
+        return msgs[0]
+    return b'<' + b','.join(b'"' + msg + b'"' for msg in msgs) + b'>'
+
+
+BATCH_FORMAT = BatchFormat(b'<', b',', b'>', lambda msg: b'"' + msg + b'"')
+
+
+@pytest.mark.parametrize('limit', [10, 20, 50, 100])
+def test_split_with_batch_format_is_the_same_as_without_it(limit):
+    msgs = [randomString(random.randint(1, limit)).encode() for _ in range(200)]
+    check_len = lambda l: l <= limit
+
+    expected = split_messages_on_batches(list(msgs), make_batch_of_items, check_len)
+    assert split_messages_on_batches(msgs, make_batch_of_items, check_len, BATCH_FORMAT) == expected
+    if expected is not None:
+        assert sum(count for _, count in expected) == len(msgs)
+
+
+def test_split_with_batch_format_fails_if_one_msg_excesses_limit():
+    msgs = [b'1', b'1' * (LEN_LIMIT_BYTES + 1), b'1']
+    assert split_messages_on_batches(msgs, make_batch_of_items, check_batch_len_func, BATCH_FORMAT) is None
+
+
+def test_split_empty_msgs_with_batch_format():
+    assert split_messages_on_batches([], make_batch_func, check_batch_len_func, BATCH_FORMAT) == \
+        split_ut([])
@@ -0,0 +1,66 @@
+from time import perf_counter
+
+import pytest
+
+from plenum.common.batched import Batched
+from plenum.common.messages.node_messages import Batch, Prepare
+from plenum.common.prepare_batch import split_messages_on_batches
+from plenum.common.util import get_utc_epoch
+from plenum.test.bls.helper import generate_state_root
+from plenum.test.perf_helper import perf_param, print_perf_result
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC, pack_batch
+from stp_zmq.zstack import ZStack
+
+MSG_LEN_LIMIT = 128 * 1024
+
+
+class SerializingBatched(Batched):
+    serializeMsg = staticmethod(ZStack.serializeMsg)
+
+
+@pytest.fixture(scope='module')
+def batched():
+    return SerializingBatched()
+
+
+def make_batch_remaking_envelope(batched, codec_name):
+    # This is how batches used to be made before the batch format was known
+    def make_batch(msgs):
+        if len(msgs) == 1:
+            return msgs[0]
+        if codec_name == MSGPACK_CODEC:
+            return pack_batch(msgs)
+        return batched.sign_and_serialize(Batch([msg.decode() for msg in msgs], None))
+
+    return make_batch
+
+
+def create_msgs(batched, count, codec_name):
+    return [batched.sign_and_serialize(Prepare(0, 1, pp_seq_no, get_utc_epoch(), 'd' * 32,
+                                               generate_state_root(), generate_state_root(),
+                                               generate_state_root()), codec_name=codec_name)
+            for pp_seq_no in range(count)]
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+@pytest.mark.parametrize('msgs_count', [10, 100, perf_param(2000)])
+def test_split_messages_on_batches_perf(batched, msgs_count, codec_name, capsys):
+    msgs = create_msgs(batched, msgs_count, codec_name)
+    check_len = lambda l: l <= MSG_LEN_LIMIT
+
+    start = perf_counter()
+    expected = split_messages_on_batches(list(msgs), make_batch_remaking_envelope(batched, codec_name), check_len)
+    remaking_time = perf_counter() - start
+
+    start = perf_counter()
+    batches = split_messages_on_batches(list(msgs), lambda m: batched._make_batch(m, codec_name), check_len,
+                                        batched._batch_format(codec_name))
+    tracking_time = perf_counter() - start
+
+    assert batches == expected
+    assert sum(count for _, count in batches) == msgs_count
+
+    print_perf_result(capsys,
+                      'Split {} {} msgs on {} batches: remaking batches in {:.4f} seconds, '
+                      'tracking batch length in {:.4f} seconds'.format(msgs_count, codec_name, len(batches),
+                                                                        remaking_time, tracking_time))
@@ -3,7 +3,9 @@ import pytest
 from ledger.compact_merkle_tree import CompactMerkleTree
 from plenum.common.constants import AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO, TXN_METADATA, TXN_PAYLOAD, TXN_PAYLOAD_DATA
 from plenum.common.ledger import Ledger
+from plenum.persistence.audit_ledger_index import AuditLedgerIndex
 from plenum.server.consensus.checkpoint_service import CheckpointService
+from storage.kv_in_memory import KeyValueStorageInMemory
 
 
 @pytest.fixture(params=[
@@ -57,3 +59,11 @@ def test_search_key_before_first_in_audit_ledger_returns_zero(audit_ledger, orde
         pp_seq_no = last_pp_seq_no - pp_seq_no_dec
         _, seq_no = CheckpointService._audit_txn_by_pp_seq_no(audit_ledger, pp_seq_no)
         assert seq_no == 0
+
+
+def test_search_with_audit_index_returns_same_as_scan(audit_ledger, ordered_batches):
+    audit_index = AuditLedgerIndex(KeyValueStorageInMemory())
+    audit_index.sync(audit_ledger)
+    for pp_seq_no in range(0, 7):
+        assert CheckpointService._audit_txn_by_pp_seq_no(audit_ledger, pp_seq_no, audit_index) == \
+            CheckpointService._audit_txn_by_pp_seq_no(audit_ledger, pp_seq_no)
@@ -7,9 +7,10 @@ from common.exceptions import LogicError
 from crypto.bls.bls_bft import BlsBft
 from crypto.bls.bls_bft_replica import BlsBftReplica
 from plenum.bls.bls_crypto_factory import create_default_bls_crypto_factory
+from plenum.bls.bls_store import BlsStore
 from plenum.common.batched import Batched
 from plenum.common.config_util import getConfig
-from plenum.common.constants import NODE, NYM, SEQ_NO_DB_LABEL
+from plenum.common.constants import NODE, NYM, SEQ_NO_DB_LABEL, KeyValueStorageType
 from plenum.common.event_bus import InternalBus
 from plenum.common.message_processor import MessageProcessor
 from plenum.common.messages.internal_messages import NeedViewChange, CatchupFinished
@@ -58,7 +59,7 @@ class TestLedgersBootstrap(LedgersBootstrap):
             bls_crypto_signer=FakeSomething(),
             bls_crypto_verifier=FakeSomething(),
             bls_key_register=FakeSomething(),
-            bls_store=FakeSomething())
+            bls_store=BlsStore(KeyValueStorageType.Memory, None, 'bls_store'))
 
     def _update_txn_with_extra_data(self, txn):
         return txn
@@ -140,7 +141,7 @@ class SimPool:
         self._initial_view_no = random.integer(0, 1000)
         self._random = random if random else DefaultSimRandom()
         self._timer = MockTimer()
-        self._network = SimNetwork(self._timer, self._random, self._serialize_deserialize)
+        self._network = self._create_network()
         self._nodes = []
         self._genesis_txns = None
         self._genesis_validators = genNodeNames(node_count)
@@ -162,6 +163,9 @@ class SimPool:
     def _get_free_port(self):
         return self._ports.pop()
 
+    def _create_network(self) -> SimNetwork:
+        return SimNetwork(self._timer, self._random, self._serialize_deserialize)
+
     def _generate_genensis_txns(self):
         self._genesis_txns = create_pool_txn_data(
             node_names=self._genesis_validators,
@@ -0,0 +1,75 @@
+from time import perf_counter
+
+import pytest
+
+from plenum.common.constants import DOMAIN_LEDGER_ID, CURRENT_PROTOCOL_VERSION
+from plenum.common.exceptions import InvalidClientMessageException
+from plenum.common.request import Request
+from plenum.server.consensus import ordering_service
+from plenum.test.greek import genNodeNames
+from plenum.test.perf_helper import perf_param, print_perf_result
+
+BATCHES_COUNT = 10
+
+
+@pytest.fixture()
+def validators():
+    return genNodeNames(4)
+
+
+@pytest.fixture()
+def initial_view_no():
+    return 0
+
+
+@pytest.fixture()
+def is_master():
+    return True
+
+
+def create_requests(count):
+    return [Request(identifier='fake_did', reqId=req_id,
+                    operation={'type': '1', 'dest': 'dest_{}'.format(req_id)},
+                    protocolVersion=CURRENT_PROTOCOL_VERSION)
+            for req_id in range(count)]
+
+
+@pytest.mark.parametrize('rejected_share', [0, 10, 50])
+@pytest.mark.parametrize('pending_reqs_count, batch_size', [(2000, 100), perf_param(100000, 1000)])
+def test_consume_req_queue_for_pre_prepare_perf(orderer, pending_reqs_count, batch_size, rejected_share,
+                                                monkeypatch, capsys):
+    monkeypatch.setattr(orderer._config, 'Max3PCBatchSize', batch_size)
+    # Rejects are logged as warnings, writing them out is not measured
+    monkeypatch.setattr(ordering_service.logger, 'disabled', True)
+    reqs = create_requests(pending_reqs_count)
+    queue = orderer.requestQueues[DOMAIN_LEDGER_ID]
+    for req in reqs:
+        orderer._requests.add(req)
+        orderer._requests.set_finalised(req)
+        queue.add(req.key)
+    rejected = {req.key for req in reqs if req.reqId % 100 < rejected_share}
+
+    def process_req(req, cons_time):
+        if req.key in rejected:
+            raise InvalidClientMessageException(req.identifier, req.reqId, 'rejected')
+
+    orderer._process_req_during_batch = process_req
+
+    batches = []
+    start = perf_counter()
+    for pp_seq_no in range(1, BATCHES_COUNT + 1):
+        batch_reqs, invalid_indices, rejects = orderer._consume_req_queue_for_pre_prepare(
+            DOMAIN_LEDGER_ID, 0, orderer.view_no, pp_seq_no)
+        valid_req_ids = orderer._get_valid_req_ids_from_all_requests(batch_reqs, invalid_indices)
+        batches.append((batch_reqs, invalid_indices, valid_req_ids))
+    batch_time = (perf_counter() - start) / BATCHES_COUNT
+
+    expected_reqs = reqs[:batch_size * BATCHES_COUNT]
+    assert [req for batch_reqs, _, _ in batches for req in batch_reqs] == expected_reqs
+    assert [key for _, _, valid_req_ids in batches for key in valid_req_ids] == \
+        [req.key for req in expected_reqs if req.key not in rejected]
+    assert len(queue) == pending_reqs_count - batch_size * BATCHES_COUNT
+
+    print_perf_result(capsys,
+                      'Batch of {} requests with {}% rejected made from {} pending ones in {:.2f} ms'
+                      .format(batch_size, rejected_share, pending_reqs_count, batch_time * 1000))
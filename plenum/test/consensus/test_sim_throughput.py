@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from plenum.test.consensus.throughput_benchmark import DEFAULT_CONFIG, PHASES, run_benchmark, percentiles
+from plenum.test.perf_helper import perf_param, print_perf_result
+
+CONFIG = DEFAULT_CONFIG._replace(writes=40, large_writes=4, large_payload_size=1024, reads=20, batch_size=10)
+
+
+def test_percentiles():
+    assert percentiles(list(range(1, 101))) == {'p50': 50, 'p90': 90, 'p99': 99, 'max': 100}
+    assert percentiles([3, 1, 2]) == {'p50': 2, 'p90': 3, 'p99': 3, 'max': 3}
+    assert percentiles([]) == {'p50': None, 'p90': None, 'p99': None, 'max': None}
+
+
+@pytest.mark.parametrize('node_count', [4, perf_param(7), perf_param(13), perf_param(25)])
+def test_sim_throughput(node_count, capsys):
+    result = run_benchmark(node_count, CONFIG)
+
+    assert result['nodes'] == node_count
+    assert result['ordered_txns'] == CONFIG.writes + CONFIG.large_writes
+    assert result['batches'] == -(-result['ordered_txns'] // CONFIG.batch_size)
+    for phase in PHASES:
+        latency = result['phase_latency'][phase]
+        assert 0 <= latency['p50'] <= latency['p90'] <= latency['p99'] <= latency['max']
+    assert result['phase_latency']['total']['max'] <= result['sim_time']
+    json.dumps(result)
+
+    print_perf_result(capsys,
+                      '{} nodes ordered {} txns at {:.1f} txns/sec, {:.2f} ms of CPU per write, '
+                      '{:.2f} ms of CPU per read, total 3PC latency p50 {:.3f} p99 {:.3f} seconds'
+                      .format(node_count, result['ordered_txns'], result['txns_per_sec'],
+                              result['cpu_time_per_write_ms'], result['cpu_time_per_read_ms'],
+                              result['phase_latency']['total']['p50'], result['phase_latency']['total']['p99']))
+
+
+def test_sim_throughput_is_deterministic():
+    first, second = run_benchmark(4, CONFIG), run_benchmark(4, CONFIG)
+
+    # Everything but measurements of the real time is the same for the same seed
+    assert first['phase_latency'] == second['phase_latency']
+    assert first['sim_time'] == second['sim_time']
+    assert first['batches'] == second['batches']
+
+    third = run_benchmark(4, CONFIG._replace(seed=1))
+    assert first['phase_latency'] != third['phase_latency']
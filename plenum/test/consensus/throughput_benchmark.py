@@ -0,0 +1,275 @@
+"""
+Throughput benchmark of a pool of replicas on the simulated network.
+
+Replicas run real ordering, checkpoint and view change services with their
+ledgers and states and exchange serialized messages through SimNetwork, so
+no sockets are needed and runs with the same seed order the same batches
+at the same simulated time. Results are plain dicts which can be dumped as
+JSON and compared across releases:
+
+    python -m plenum.test.consensus.throughput_benchmark --nodes 4 7 13 25 --output results.json
+"""
+import argparse
+import json
+import logging
+from functools import partial
+from time import perf_counter, process_time
+from typing import NamedTuple, List, Dict, Any, Optional
+
+from plenum.common.constants import TXN_TYPE, DATA, GET_TXN, DOMAIN_LEDGER_ID, CURRENT_PROTOCOL_VERSION
+from plenum.common.messages.node_messages import PrePrepare, Prepare, Commit, Ordered
+from plenum.common.request import Request
+from plenum.common.timer import RepeatingTimer
+from plenum.common.types import f
+from plenum.server.node import Node
+from plenum.server.replica_helper import generateName
+from plenum.server.request_handlers.get_txn_handler import GetTxnHandler
+from plenum.test.constants import BUY
+from plenum.test.consensus.helper import SimPool
+from plenum.test.consensus.order_service.sim_helper import order_requests, check_consistency, \
+    setup_consensus_data
+from plenum.test.helper import create_pool_txn_data
+from plenum.test.simulation.sim_network import SimNetwork
+from plenum.test.simulation.sim_random import DefaultSimRandom, SimRandom
+
+IDENTIFIER = '6ouriXMZkLeHsuXrN1X1fd'
+PERCENTILES = (50, 90, 99)
+PHASES = ('pre_prepare', 'prepare', 'commit', 'total')
+
+BenchmarkConfig = NamedTuple('BenchmarkConfig', [('seed', int),
+                                                 ('writes', int),
+                                                 ('large_writes', int),
+                                                 ('large_payload_size', int),
+                                                 ('reads', int),
+                                                 ('batch_size', int),
+                                                 ('batch_interval', float),
+                                                 ('chk_freq', int),
+                                                 ('min_latency', float),
+                                                 ('max_latency', float)])
+
+DEFAULT_CONFIG = BenchmarkConfig(seed=0,
+                                 writes=1000,
+                                 large_writes=100,
+                                 large_payload_size=8 * 1024,
+                                 reads=500,
+                                 batch_size=100,
+                                 batch_interval=0.1,
+                                 chk_freq=10,
+                                 min_latency=0.02,
+                                 max_latency=0.035)
+
+
+class TracingSimNetwork(SimNetwork):
+    """
+    Simulated network remembering when replicas sent 3PC messages
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pre_prepares_sent = {}  # type: Dict[tuple, float]
+        self.prepares_sent = {}  # type: Dict[tuple, float]
+        self.commits_sent = {}  # type: Dict[tuple, float]
+
+    def _send_message(self, frm: str, msg: Any, dst):
+        now = self._timer.get_current_time()
+        if isinstance(msg, PrePrepare):
+            self.pre_prepares_sent.setdefault((msg.viewNo, msg.ppSeqNo), now)
+        elif isinstance(msg, Prepare):
+            self.prepares_sent.setdefault((frm, msg.viewNo, msg.ppSeqNo), now)
+        elif isinstance(msg, Commit):
+            self.commits_sent.setdefault((frm, msg.viewNo, msg.ppSeqNo), now)
+        super()._send_message(frm, msg, dst)
+
+
+class BenchmarkPool(SimPool):
+    """
+    Pool of replicas with BLS signatures turned off since they are mocked
+    by simulated replicas anyway
+    """
+
+    def __init__(self, node_count: int, random: SimRandom):
+        self.ordered = {}  # type: Dict[tuple, float]
+        self.ordered_reqs = {}  # type: Dict[str, int]
+        super().__init__(node_count, random)
+
+    def _create_network(self) -> SimNetwork:
+        return TracingSimNetwork(self._timer, self._random, self._serialize_deserialize)
+
+    def _generate_genensis_txns(self):
+        self._genesis_txns = create_pool_txn_data(
+            node_names=self._genesis_validators,
+            crypto_factory=None,
+            get_free_port=self._get_free_port,
+            nodes_with_bls=0)['txns']
+
+    def add_new_node(self, name, view_no=None):
+        super().add_new_node(name, view_no)
+        replica_name = generateName(name, 0)
+        self.ordered_reqs[replica_name] = 0
+        self._internal_buses[name].subscribe(Ordered, partial(self._on_ordered, replica_name))
+
+    def _on_ordered(self, replica_name, msg: Ordered):
+        self.ordered.setdefault((replica_name, msg.viewNo, msg.ppSeqNo), self._timer.get_current_time())
+        self.ordered_reqs[replica_name] += len(msg.valid_reqIdr)
+
+
+class LedgerReader:
+    """
+    What GetTxnHandler needs from a node
+    """
+    ledger_ids = Node.ledger_ids
+    getReplyFromLedger = Node.getReplyFromLedger
+    update_txn_with_extra_data = Node.update_txn_with_extra_data
+
+
+def create_write_requests(random: SimRandom, count: int, first_req_id: int, payload_size: int = 0) -> List[Request]:
+    reqs = []
+    for req_id in range(first_req_id, first_req_id + count):
+        operation = {TXN_TYPE: BUY, 'amount': random.integer(10, 100000)}
+        if payload_size:
+            operation[DATA] = random.string(16) * (payload_size // 16)
+        reqs.append(Request(identifier=IDENTIFIER, reqId=req_id, operation=operation,
+                            protocolVersion=CURRENT_PROTOCOL_VERSION))
+    return reqs
+
+
+def create_read_requests(random: SimRandom, count: int, first_req_id: int, max_seq_no: int) -> List[Request]:
+    return [Request(identifier=IDENTIFIER, reqId=req_id,
+                    operation={TXN_TYPE: GET_TXN, f.LEDGER_ID.nm: DOMAIN_LEDGER_ID,
+                               DATA: random.integer(1, max_seq_no)},
+                    protocolVersion=CURRENT_PROTOCOL_VERSION)
+            for req_id in range(first_req_id, first_req_id + count)]
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    result = {}
+    for p in PERCENTILES:
+        # Nearest-rank percentile
+        result['p{}'.format(p)] = values[max(0, -(-len(values) * p // 100) - 1)] if values else None
+    result['max'] = values[-1] if values else None
+    return result
+
+
+def phase_latencies(pool: BenchmarkPool) -> Dict[str, Dict[str, Optional[float]]]:
+    network = pool.network
+    latencies = {phase: [] for phase in PHASES}
+    for (replica_name, view_no, pp_seq_no), ordered_at in pool.ordered.items():
+        pre_prepared_at = network.pre_prepares_sent.get((view_no, pp_seq_no))
+        if pre_prepared_at is None:
+            continue
+        # The primary does not send PREPARE, it is prepared since sending PRE-PREPARE
+        prepared_at = network.prepares_sent.get((replica_name, view_no, pp_seq_no), pre_prepared_at)
+        committed_at = network.commits_sent.get((replica_name, view_no, pp_seq_no))
+        if committed_at is None:
+            continue
+        latencies['pre_prepare'].append(prepared_at - pre_prepared_at)
+        latencies['prepare'].append(committed_at - prepared_at)
+        latencies['commit'].append(ordered_at - committed_at)
+        latencies['total'].append(ordered_at - pre_prepared_at)
+    return {phase: percentiles(values) for phase, values in latencies.items()}
+
+
+def serve_reads(pool: BenchmarkPool, reqs: List[Request]):
+    handlers = [GetTxnHandler(LedgerReader(), replica._write_manager.database_manager)
+                for replica in pool.nodes]
+    for idx, req in enumerate(reqs):
+        handler = handlers[idx % len(handlers)]
+        handler.static_validation(req)
+        assert handler.get_result(req)[DATA] is not None
+
+
+def run_benchmark(node_count: int, config: BenchmarkConfig = DEFAULT_CONFIG) -> Dict[str, Any]:
+    """
+    Orders writes of the request mix on a pool of `node_count` replicas,
+    then serves reads of the mix by the replicas in turn
+    """
+    # Messages sent in response to a message never overtake it this way, so
+    # replicas do not have to request 3PC messages they have not received yet
+    assert config.max_latency < 2 * config.min_latency, "latency jitter is too large"
+
+    random = DefaultSimRandom(config.seed)
+    pool = BenchmarkPool(node_count, random)
+    pool.network.set_latency(config.min_latency, config.max_latency)
+
+    writes = create_write_requests(random, config.writes, 1)
+    writes += create_write_requests(random, config.large_writes, len(writes) + 1,
+                                    payload_size=config.large_payload_size)
+    writes = random.shuffle(writes)
+
+    orderer_config = pool.nodes[0]._orderer._config
+    updated_config = {'Max3PCBatchSize': config.batch_size,
+                      'Max3PCBatchWait': config.batch_interval,
+                      'CHK_FREQ': config.chk_freq,
+                      'LOG_SIZE': 3 * config.chk_freq}
+    # Replicas share the global config, so it is restored after the run
+    old_config = {name: getattr(orderer_config, name) for name in updated_config}
+    for name, value in updated_config.items():
+        setattr(orderer_config, name, value)
+    for replica in pool.nodes:
+        setup_consensus_data(replica._data)
+    try:
+        pool.sim_send_requests(writes)
+
+        sim_start = pool.timer.get_current_time()
+        wall_start, cpu_start = perf_counter(), process_time()
+        batch_timer = RepeatingTimer(pool.timer, config.batch_interval, partial(order_requests, pool))
+        pool.timer.wait_for(lambda: all(count == len(writes) for count in pool.ordered_reqs.values()),
+                            max_iterations=100 * len(writes) * node_count ** 2)
+        batch_timer.stop()
+        write_wall_time, write_cpu_time = perf_counter() - wall_start, process_time() - cpu_start
+        sim_time = pool.timer.get_current_time() - sim_start
+    finally:
+        for name, value in old_config.items():
+            setattr(orderer_config, name, value)
+
+    check_consistency(pool)
+
+    ledger_size = pool.nodes[0]._write_manager.database_manager.get_ledger(DOMAIN_LEDGER_ID).size
+    reads = create_read_requests(random, config.reads, len(writes) + 1, ledger_size)
+    read_cpu_start = process_time()
+    serve_reads(pool, reads)
+    read_cpu_time = process_time() - read_cpu_start
+
+    return {
+        'nodes': node_count,
+        'ordered_txns': len(writes),
+        'batches': len(pool.network.pre_prepares_sent),
+        'sim_time': sim_time,
+        'sim_txns_per_sec': len(writes) / sim_time if sim_time else None,
+        'wall_time': write_wall_time,
+        'txns_per_sec': len(writes) / write_wall_time,
+        'cpu_time_per_write_ms': 1000 * write_cpu_time / len(writes),
+        'cpu_time_per_read_ms': 1000 * read_cpu_time / len(reads) if reads else None,
+        'phase_latency': phase_latencies(pool),
+    }
+
+
+def run_benchmarks(node_counts: List[int], config: BenchmarkConfig = DEFAULT_CONFIG) -> Dict[str, Any]:
+    return {
+        'config': config._asdict(),
+        'results': [run_benchmark(node_count, config) for node_count in node_counts]
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Throughput benchmark of a pool on the simulated network')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[4, 7, 13, 25])
+    parser.add_argument('--output', help='file to write results to, stdout by default')
+    for name, value in DEFAULT_CONFIG._asdict().items():
+        parser.add_argument('--' + name.replace('_', '-'), type=type(value), default=value)
+    parsed = parser.parse_args(args)
+
+    config = BenchmarkConfig(**{name: getattr(parsed, name) for name in BenchmarkConfig._fields})
+    # Replicas log every 3PC message, which would be measured as well
+    logging.disable(logging.WARNING)
+    results = json.dumps(run_benchmarks(parsed.nodes, config), indent=2, sort_keys=True)
+    if parsed.output:
+        with open(parsed.output, 'w') as output:
+            output.write(results)
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -1336,6 +1336,20 @@ def generate_state_root():
     return base58.b58encode(os.urandom(32)).decode("utf-8")
 
 
+def create_sample_prepare():
+    return Prepare(0, 1, 10, get_utc_epoch(), 'd' * 32,
+                   generate_state_root(), generate_state_root(), generate_state_root())
+
+
+def create_sample_commit():
+    return Commit(0, 1, 10)
+
+
+def create_sample_pre_prepare(reqs_count=1000, identifier='6ouriXMZkLeHsuXrN1X1fd'):
+    reqs = sdk_random_request_objects(reqs_count, identifier=identifier, protocol_version=2)
+    return PrePrepare(*create_pre_prepare_params(generate_state_root(), reqs=reqs))
+
+
 def init_discarded(value=None):
     """init discarded field with value and return message like representation"""
     discarded = []
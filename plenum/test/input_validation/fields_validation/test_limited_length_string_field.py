@@ -1,7 +1,7 @@
 import pytest
 
 from common.exceptions import PlenumValueError
-from plenum.common.messages.fields import LimitedLengthStringField
+from plenum.common.messages.fields import LimitedLengthStringField, IterableField, JsonField
 
 
 def test_incorrect_max_length():
@@ -24,3 +24,25 @@ def test_valid_string():
 def test_long_string():
     validator = LimitedLengthStringField(max_length=1)
     assert validator.validate("xx")
+
+
+@pytest.mark.parametrize('invalid_value', ['', 'xxx', 42, None, b'x'])
+def test_validate_items_reports_first_invalid_value(invalid_value):
+    validator = LimitedLengthStringField(max_length=2)
+    vals = ['x', 'xx', invalid_value, 'xxxx']
+    expected = validator.validate(invalid_value)
+    assert expected
+    assert validator.validate_items(vals) == expected
+    assert IterableField(validator).validate(vals) == expected
+
+
+def test_validate_items_of_valid_values():
+    validator = LimitedLengthStringField(max_length=2)
+    assert not validator.validate_items([])
+    assert not validator.validate_items(['x', 'xx'])
+    assert not LimitedLengthStringField(max_length=2, can_be_empty=True).validate_items(['', 'xx'])
+
+
+def test_validate_items_of_subclass_checks_each_value():
+    validator = JsonField(max_length=10)
+    assert validator.validate_items(['{}', 'not json']) == 'should be a valid JSON string'
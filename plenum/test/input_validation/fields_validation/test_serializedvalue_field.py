@@ -18,3 +18,11 @@ def test_non_empty_bytes():
 
 def test_empty_bytes():
     assert validator.validate(b"")
+
+
+def test_non_empty_memoryview():
+    assert not validator.validate(memoryview(b"hello"))
+
+
+def test_empty_memoryview():
+    assert validator.validate(memoryview(b""))
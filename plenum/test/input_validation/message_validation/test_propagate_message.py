@@ -1,7 +1,11 @@
 from collections import OrderedDict
+
+from plenum.common.constants import CURRENT_PROTOCOL_VERSION, NYM, TARGET_NYM, TXN_TYPE
 from plenum.common.messages.fields import LimitedLengthStringField
 from plenum.common.messages.client_request import ClientMessageValidator
 from plenum.common.messages.node_messages import Propagate
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
 
 EXPECTED_ORDERED_FIELDS = OrderedDict([
     ("request", ClientMessageValidator),
@@ -22,3 +26,17 @@ def test_has_expected_validators():
     schema = dict(Propagate.schema)
     for field, validator in EXPECTED_ORDERED_FIELDS.items():
         assert isinstance(schema[field], validator)
+
+
+def test_request_is_created_once():
+    request = Request(identifier=SimpleSigner().identifier,
+                      reqId=1,
+                      operation={TXN_TYPE: NYM, TARGET_NYM: SimpleSigner().identifier},
+                      protocolVersion=CURRENT_PROTOCOL_VERSION,
+                      signature='signature')
+    msg = Propagate(request.as_dict, 'client')
+
+    propagated_request = msg.get_request(Request)
+    assert propagated_request == request
+    assert msg.get_request(Request) is propagated_request
+    assert msg == Propagate(request.as_dict, 'client')
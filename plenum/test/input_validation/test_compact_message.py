@@ -0,0 +1,125 @@
+import tracemalloc
+from time import perf_counter
+
+import pytest
+
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.message_base import MessageBase
+from plenum.common.messages.node_message_factory import node_message_factory
+from plenum.common.messages.node_messages import Prepare, Commit, Checkpoint
+from plenum.common.types import f
+from plenum.common.util import get_utc_epoch
+from plenum.test.bls.helper import generate_state_root
+from plenum.test.perf_helper import print_perf_result
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC
+from stp_zmq.zstack import ZStack
+
+MSGS_COUNT = 10000
+# Messages about the same batch have the same roots
+STATE_ROOT, TXN_ROOT, AUDIT_ROOT = (generate_state_root() for _ in range(3))
+
+
+def dict_backed(msg_type):
+    return type('Dict' + msg_type.__name__, (MessageBase,),
+                {'typename': msg_type.typename, 'schema': msg_type.schema})
+
+
+def prepare_args(pp_seq_no=10):
+    return 0, 1, pp_seq_no, get_utc_epoch(), 'd' * 32, STATE_ROOT, TXN_ROOT, AUDIT_ROOT
+
+
+def commit_args(pp_seq_no=10):
+    return 0, 1, pp_seq_no, 'some_bls_sig'
+
+
+def checkpoint_args(pp_seq_no=10):
+    return 0, 1, 0, pp_seq_no, AUDIT_ROOT
+
+
+@pytest.fixture(params=[(Prepare, prepare_args),
+                        (Commit, commit_args),
+                        (Checkpoint, checkpoint_args)],
+                ids=['PREPARE', 'COMMIT', 'CHECKPOINT'])
+def msg_type_and_args(request):
+    return request.param
+
+
+def test_compact_message_keeps_mapping_interface(msg_type_and_args):
+    msg_type, create_args = msg_type_and_args
+    msg = msg_type(*create_args())
+    expected = dict_backed(msg_type)(*msg)
+
+    assert len(msg) == len(expected)
+    assert list(msg) == list(expected)
+    assert list(msg.keys()) == list(expected.keys())
+    assert list(msg.values()) == list(expected.values())
+    assert list(msg.items()) == list(expected.items())
+    assert msg[0] == expected[0]
+    assert msg[1:3] == expected[1:3]
+    assert msg._asdict() == expected._asdict()
+    assert list(msg._asdict()) == list(expected._asdict())
+    assert str(msg) == str(expected)
+    assert hash(msg) == hash(expected)
+    for name in msg.keys():
+        assert name in msg
+        assert getattr(msg, name) == getattr(expected, name)
+    assert f.PLUGIN_FIELDS.nm not in msg
+    with pytest.raises(AttributeError):
+        getattr(msg, f.PLUGIN_FIELDS.nm)
+    with pytest.raises(TypeError):
+        msg['some_key']
+
+
+@pytest.mark.parametrize('msg_type, create_args', [(Prepare, prepare_args),
+                                                   (Commit, commit_args)])
+def test_compact_message_with_optional_fields(msg_type, create_args):
+    payload = msg_type(*create_args())._asdict()
+    payload[f.PLUGIN_FIELDS.nm] = {'some_plugin': 'some_value'}
+    payload.pop(f.AUDIT_TXN_ROOT_HASH.nm, None)
+
+    msg = msg_type(**payload)
+    expected = dict_backed(msg_type)(**payload)
+
+    assert msg.keys() == tuple(expected.keys())
+    assert msg.plugin_fields == {'some_plugin': 'some_value'}
+    assert f.AUDIT_TXN_ROOT_HASH.nm not in msg
+    assert msg._asdict() == expected._asdict()
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+def test_compact_message_is_wire_compatible(msg_type_and_args, codec_name):
+    msg_type, create_args = msg_type_and_args
+    msg = msg_type(*create_args())
+    expected = dict_backed(msg_type)(*msg)
+
+    serialized = ZStack.serializeMsg(MessageProcessor().toDict(msg), codec_name)
+    assert serialized == ZStack.serializeMsg(MessageProcessor().toDict(expected), codec_name)
+    assert node_message_factory.get_instance(**ZStack.deserializeMsg(serialized)) == msg
+
+
+def measure_creation(msg_type, all_args):
+    start = perf_counter()
+    msgs = [msg_type(*args) for args in all_args]
+    creation_time = perf_counter() - start
+    del msgs
+
+    tracemalloc.start()
+    msgs = [msg_type(*args) for args in all_args]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(msgs) == MSGS_COUNT
+    return memory / MSGS_COUNT, creation_time / MSGS_COUNT
+
+
+def test_compact_message_memory_and_creation_time(msg_type_and_args, capsys):
+    msg_type, create_args = msg_type_and_args
+    all_args = [create_args(pp_seq_no) for pp_seq_no in range(MSGS_COUNT)]
+    dict_memory, dict_time = measure_creation(dict_backed(msg_type), all_args)
+    compact_memory, compact_time = measure_creation(msg_type, all_args)
+
+    print_perf_result(capsys,
+                      '{}: a message backed by a dict takes {:.0f} bytes and is created in {:.2f} us, '
+                      'a compact one takes {:.0f} bytes and is created in {:.2f} us'
+                      .format(msg_type.typename, dict_memory, dict_time * 10 ** 6,
+                              compact_memory, compact_time * 10 ** 6))
+    assert compact_memory < dict_memory
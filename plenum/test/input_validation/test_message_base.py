@@ -30,3 +30,41 @@ def test_message_base_init_with_both_args_kwargs():
     with pytest.raises(ValueError) as excinfo:
         MessageTest(1, b=3)
     assert "*args, **kwargs cannot be used together" == str(excinfo.value)
+
+
+def test_schema_is_compiled_once():
+    MessageTest(1, 2)
+    compiled_schema = MessageTest._compiled_schema
+    assert compiled_schema.schema is MessageTest.schema
+    assert compiled_schema.required == {'a', 'b'}
+
+    MessageTest(a=3, b=4)
+    assert MessageTest._compiled_schema is compiled_schema
+
+
+def test_replaced_schema_is_compiled_again():
+    class ReplacedSchemaMessage(MessageBase):
+        typename = 'ReplacedSchemaMessage'
+        schema = (
+            ('a', NonNegativeNumberField()),
+        )
+
+    assert ReplacedSchemaMessage(1).a == 1
+    ReplacedSchemaMessage.schema = (
+        ('a', NonNegativeNumberField()),
+        ('b', NonNegativeNumberField(optional=True)),
+    )
+    assert ReplacedSchemaMessage(1, 2).b == 2
+    with pytest.raises(TypeError) as excinfo:
+        ReplacedSchemaMessage(1, -2)
+    assert "validation error [ReplacedSchemaMessage]: negative value (b=-2)" == str(excinfo.value)
+
+
+def test_validation_errors():
+    with pytest.raises(TypeError) as excinfo:
+        MessageTest(a=1)
+    assert "validation error [MessageTest]: missed fields - b. " == str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        MessageTest(a=1, b='2')
+    assert "validation error [MessageTest]: expected types 'int', got 'str' (b=2)" == str(excinfo.value)
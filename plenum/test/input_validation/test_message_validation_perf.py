@@ -0,0 +1,25 @@
+from time import perf_counter
+
+import pytest
+
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.node_message_factory import node_message_factory
+from plenum.test.helper import create_sample_prepare, create_sample_commit, create_sample_pre_prepare
+from plenum.test.perf_helper import print_perf_result
+
+ITERATIONS = 100
+
+
+@pytest.mark.parametrize('create_msg', [create_sample_prepare, create_sample_commit, create_sample_pre_prepare])
+def test_message_validation_perf(create_msg, capsys):
+    msg = create_msg()
+    payload = MessageProcessor().toDict(msg)
+
+    start = perf_counter()
+    for _ in range(ITERATIONS):
+        received = node_message_factory.get_instance(**payload)
+    validation_time = (perf_counter() - start) / ITERATIONS
+
+    assert received == msg
+
+    print_perf_result(capsys, 'Validated {} in {:.2f} us'.format(type(msg).__name__, validation_time * 10 ** 6))
@@ -0,0 +1,86 @@
+from time import perf_counter
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.constants import TXN_PAYLOAD, TXN_PAYLOAD_DATA, TXN_METADATA
+from plenum.common.ledger import Ledger
+from plenum.common.util import randomString
+from plenum.test.perf_helper import perf_param, print_perf_result
+from storage.helper import initHashStore
+
+BATCHES_COUNT = 5
+
+
+def create_ledger(data_dir, name, config):
+    hash_store = initHashStore(data_dir, name, config)
+    return Ledger(CompactMerkleTree(hashStore=hash_store),
+                  dataDir=data_dir,
+                  fileName=name + '_transactions',
+                  config=config)
+
+
+def create_txns(count):
+    return [{
+        TXN_PAYLOAD: {
+            TXN_PAYLOAD_DATA: {
+                'dest': randomString(22),
+                'verkey': randomString(44)
+            }
+        },
+        TXN_METADATA: {}
+    } for _ in range(count)]
+
+
+def commit_txns_one_by_one(ledger, count):
+    # This is how `Ledger.commitTxns` used to commit txns before
+    # txns of a batch were written in one batch
+    committed_txns = []
+    for txn in ledger.uncommittedTxns[:count]:
+        txn.update(ledger.append(txn))
+        committed_txns.append(txn)
+    ledger.uncommittedTxns = ledger.uncommittedTxns[count:]
+    if not ledger.uncommittedTxns:
+        ledger.uncommittedTree = None
+        ledger.uncommittedRootHash = None
+    return committed_txns
+
+
+def apply_and_commit(ledger, batches, commit):
+    spent = 0
+    committed = []
+    for txns in batches:
+        ledger.append_txns_metadata(txns, txn_time=1)
+        ledger.appendTxns(txns)
+        start = perf_counter()
+        committed.extend(commit(ledger, len(txns)))
+        spent += perf_counter() - start
+    return committed, spent
+
+
+@pytest.mark.parametrize('txns_in_batch', [10, perf_param(100), perf_param(1000)])
+def test_batched_commit_txns_perf(tdir_for_func, tconf_for_func, txns_in_batch, capsys):
+    batches = [create_txns(txns_in_batch) for _ in range(BATCHES_COUNT)]
+    batches_copy = [[{k: dict(v) for k, v in txn.items()} for txn in txns]
+                    for txns in batches]
+
+    per_txn_ledger = create_ledger(tdir_for_func, 'per_txn', tconf_for_func)
+    batched_ledger = create_ledger(tdir_for_func, 'batched', tconf_for_func)
+
+    per_txn_committed, per_txn_time = apply_and_commit(per_txn_ledger, batches, commit_txns_one_by_one)
+    batched_committed, batched_time = apply_and_commit(batched_ledger, batches_copy,
+                                                       lambda l, c: l.commitTxns(c)[1])
+
+    assert batched_ledger.size == per_txn_ledger.size == BATCHES_COUNT * txns_in_batch
+    assert batched_ledger.root_hash == per_txn_ledger.root_hash
+    assert batched_committed == per_txn_committed
+    assert batched_ledger.tree.leafCount == per_txn_ledger.tree.leafCount
+    assert batched_ledger.tree.nodeCount == per_txn_ledger.tree.nodeCount
+
+    print_perf_result(capsys,
+                      'Committed {} batches of {} txns: one by one in {:.4f} seconds, '
+                      'batched in {:.4f} seconds'.format(BATCHES_COUNT, txns_in_batch,
+                                                         per_txn_time, batched_time))
+
+    per_txn_ledger.stop()
+    batched_ledger.stop()
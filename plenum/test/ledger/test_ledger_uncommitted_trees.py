@@ -0,0 +1,90 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.constants import TXN_PAYLOAD, TXN_PAYLOAD_DATA, TXN_METADATA
+from plenum.common.ledger import Ledger
+from plenum.common.util import randomString
+
+BATCHES_COUNT = 4
+TXNS_IN_BATCH = 5
+
+
+def random_txns(count):
+    return [{
+        TXN_PAYLOAD: {
+            TXN_PAYLOAD_DATA: {'data': randomString(32)}
+        },
+        TXN_METADATA: {}
+    } for _ in range(count)]
+
+
+@pytest.fixture()
+def ledger_with_batches(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(), dataDir=tdir_for_func)
+    ledger.add_txns(random_txns(3))
+    roots = []
+    for _ in range(BATCHES_COUNT):
+        txns = random_txns(TXNS_IN_BATCH)
+        ledger.append_txns_metadata(txns)
+        ledger.appendTxns(txns)
+        roots.append(ledger.uncommittedRootHash)
+    return ledger, roots
+
+
+def rebuilt_root_hash(ledger):
+    return ledger.treeWithAppliedTxns(ledger.uncommittedTxns).root_hash
+
+
+def test_discard_batches_does_not_rebuild_tree(ledger_with_batches):
+    ledger, roots = ledger_with_batches
+
+    def fail(*args, **kwargs):
+        raise AssertionError("uncommitted tree should not be rebuilt")
+
+    ledger.treeWithAppliedTxns = fail
+    for i in reversed(range(1, BATCHES_COUNT)):
+        ledger.discardTxns(TXNS_IN_BATCH)
+        assert ledger.uncommittedRootHash == roots[i - 1]
+        assert ledger.uncommitted_size == ledger.size + i * TXNS_IN_BATCH
+
+    ledger.discardTxns(TXNS_IN_BATCH)
+    assert ledger.uncommittedRootHash is None
+    assert ledger.uncommitted_root_hash == ledger.tree.root_hash
+
+
+def test_discard_several_batches_at_once(ledger_with_batches):
+    ledger, roots = ledger_with_batches
+    ledger.discardTxns(3 * TXNS_IN_BATCH)
+    assert ledger.uncommittedRootHash == roots[0]
+    assert ledger.uncommittedRootHash == rebuilt_root_hash(ledger)
+
+
+def test_discard_part_of_batch(ledger_with_batches):
+    ledger, roots = ledger_with_batches
+    ledger.discardTxns(TXNS_IN_BATCH + 2)
+    assert ledger.uncommittedRootHash == rebuilt_root_hash(ledger)
+
+    ledger.discardTxns(TXNS_IN_BATCH - 2)
+    assert ledger.uncommittedRootHash == roots[1]
+
+    txns = random_txns(TXNS_IN_BATCH)
+    ledger.append_txns_metadata(txns)
+    ledger.appendTxns(txns)
+    ledger.discardTxns(TXNS_IN_BATCH)
+    assert ledger.uncommittedRootHash == roots[1]
+
+
+def test_discard_after_commit(ledger_with_batches):
+    ledger, roots = ledger_with_batches
+    ledger.commitTxns(TXNS_IN_BATCH + 1)
+    assert ledger.uncommittedRootHash == roots[-1]
+
+    ledger.discardTxns(TXNS_IN_BATCH)
+    assert ledger.uncommittedRootHash == roots[-2]
+
+    ledger.discardTxns(TXNS_IN_BATCH)
+    assert ledger.uncommittedRootHash == roots[-3]
+
+    ledger.commitTxns(len(ledger.uncommittedTxns))
+    assert ledger.root_hash == Ledger.hashToStr(roots[-3])
+    assert ledger.uncommittedRootHash is None
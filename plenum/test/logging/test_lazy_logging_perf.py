@@ -0,0 +1,70 @@
+import logging
+from time import perf_counter
+
+import pytest
+
+from plenum.test.helper import create_sample_prepare, create_sample_pre_prepare
+from plenum.test.perf_helper import print_perf_result
+from stp_core.common.log import getlogger, lazy
+
+ITERATIONS = 100
+
+logger = getlogger('test_lazy_logging_perf')
+
+
+class Describe:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, msg):
+        self.calls += 1
+        return str(msg).upper()
+
+
+describe = Describe()
+
+
+def log_formatting(msg, frm):
+    # This is how hot paths used to log messages
+    logger.debug("{} received node message from {}: {}".format('Alpha', frm, msg))
+    logger.trace("{} processing {} from {} with state root {}".format('Alpha', msg, frm, describe(msg)))
+
+
+def log_lazily(msg, frm):
+    logger.debug("%s received node message from %s: %s", 'Alpha', frm, msg)
+    logger.trace("%s processing %s from %s with state root %s", 'Alpha', msg, frm, lazy(describe, msg))
+
+
+def measure(log, msg):
+    start = perf_counter()
+    for _ in range(ITERATIONS):
+        log(msg, 'Beta')
+    return (perf_counter() - start) / ITERATIONS
+
+
+@pytest.fixture()
+def info_log_level():
+    old_level = logger.level
+    logger.setLevel(logging.INFO)
+    yield
+    logger.setLevel(old_level)
+
+
+@pytest.mark.parametrize('create_msg', [create_sample_prepare, create_sample_pre_prepare])
+def test_lazy_logging_perf(create_msg, info_log_level, capsys):
+    msg = create_msg()
+
+    describe.calls = 0
+    formatting_time = measure(log_formatting, msg)
+    assert describe.calls == ITERATIONS
+
+    describe.calls = 0
+    lazy_time = measure(log_lazily, msg)
+    # messages below the enabled level are never formatted when logged lazily
+    assert describe.calls == 0
+
+    print_perf_result(capsys,
+                      'Logging {} at INFO level: formatting takes {:.2f} us per message, '
+                      'deferred formatting takes {:.2f} us per message'.format(type(msg).__name__,
+                                                                                formatting_time * 10 ** 6,
+                                                                                lazy_time * 10 ** 6))
@@ -56,6 +56,10 @@ def test_kv_store_metrics_config(looper, txnPoolNodeSet, tdir, tconf, sdk_pool_h
             MetricsName.NODE_CHECK_NODE_REQUEST_SPIKE,
             MetricsName.NODE_SEND_REJECT_TIME,
             MetricsName.AUTH_RULES_FROM_STATE_COUNT,
+            MetricsName.STATE_PRUNING_TIME,
+            MetricsName.STATE_PRUNED_NODES,
+            MetricsName.LOOPER_IO_WAKEUP_LATENCY,
+            MetricsName.LOOPER_TIMER_WAKEUP_LATENCY,
 
             # Obsolete metrics
             MetricsName.SERVICE_VIEW_CHANGER_TIME,
@@ -1,9 +1,11 @@
 import pytest
 
-from plenum.server.quota_control import QuotaControl, StaticQuotaControl, RequestQueueQuotaControl
+from plenum.server.quota_control import QuotaControl, StaticQuotaControl, RequestQueueQuotaControl, \
+    SigVerificationQueueQuotaControl, CompositeQuotaControl
 from stp_zmq.zstack import Quota
 
 MAX_REQUEST_QUEUE_SIZE = 1000
+MAX_SIG_VERIFICATION_QUEUE_SIZE = 500
 MAX_NODE_QUOTA = Quota(count=100, size=1024 * 1024)
 MAX_CLIENT_QUOTA = Quota(count=100, size=1024 * 1024)
 ZERO_QUOTA = Quota(count=0, size=0)
@@ -21,6 +23,13 @@ def request_queue_qc():
                                     max_client_quota=MAX_CLIENT_QUOTA)
 
 
+@pytest.fixture()
+def sig_verification_qc():
+    return SigVerificationQueueQuotaControl(max_sig_verification_queue_size=MAX_SIG_VERIFICATION_QUEUE_SIZE,
+                                            max_node_quota=MAX_NODE_QUOTA,
+                                            max_client_quota=MAX_CLIENT_QUOTA)
+
+
 def test_static_quota_control_gives_maximum_quotas_initially(static_qc):
     assert static_qc.node_quota == MAX_NODE_QUOTA
     assert static_qc.client_quota == MAX_CLIENT_QUOTA
@@ -54,3 +63,31 @@ def test_request_queue_quota_control_restores_client_quotas_when_request_queue_s
     request_queue_qc.update_state({'request_queue_size': MAX_REQUEST_QUEUE_SIZE - 1})
     assert request_queue_qc.node_quota == MAX_NODE_QUOTA
     assert request_queue_qc.client_quota == MAX_CLIENT_QUOTA
+
+
+def test_sig_verification_queue_quota_control_gives_no_quota_for_client_when_queue_size_reaches_limit(
+        sig_verification_qc):
+    sig_verification_qc.update_state({'sig_verification_queue_size': MAX_SIG_VERIFICATION_QUEUE_SIZE - 1})
+    assert sig_verification_qc.node_quota == MAX_NODE_QUOTA
+    assert sig_verification_qc.client_quota == MAX_CLIENT_QUOTA
+
+    sig_verification_qc.update_state({'sig_verification_queue_size': MAX_SIG_VERIFICATION_QUEUE_SIZE})
+    assert sig_verification_qc.node_quota == MAX_NODE_QUOTA
+    assert sig_verification_qc.client_quota == ZERO_QUOTA
+
+    sig_verification_qc.update_state({'sig_verification_queue_size': 0})
+    assert sig_verification_qc.client_quota == MAX_CLIENT_QUOTA
+
+
+def test_composite_quota_control_accounts_for_both_request_and_sig_verification_queues(
+        request_queue_qc, sig_verification_qc):
+    qc = CompositeQuotaControl(request_queue_qc, sig_verification_qc)
+    qc.update_state({'request_queue_size': 0, 'sig_verification_queue_size': 0})
+    assert qc.client_quota == MAX_CLIENT_QUOTA
+
+    qc.update_state({'request_queue_size': 0, 'sig_verification_queue_size': MAX_SIG_VERIFICATION_QUEUE_SIZE})
+    assert qc.node_quota == MAX_NODE_QUOTA
+    assert qc.client_quota == ZERO_QUOTA
+
+    qc.update_state({'request_queue_size': MAX_REQUEST_QUEUE_SIZE, 'sig_verification_queue_size': 0})
+    assert qc.client_quota == ZERO_QUOTA
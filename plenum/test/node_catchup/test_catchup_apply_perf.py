@@ -0,0 +1,178 @@
+from time import perf_counter
+
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from ledger.merkle_verifier import MerkleVerifier
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import TXN_PAYLOAD, TXN_PAYLOAD_DATA, TXN_METADATA, DOMAIN_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.common.metrics_collector import NullMetricsCollector
+from plenum.common.txn_util import get_payload_data
+from plenum.common.util import randomString, SortedDict
+from plenum.server.catchup.catchup_rep_service import CatchupRepService
+from plenum.server.catchup.node_catchup_data import CatchupNodeDataProvider
+from plenum.server.catchup.seeder_service import SeederService
+from plenum.server.catchup.utils import CatchupTill
+from plenum.test.perf_helper import perf_param, print_perf_result
+from plenum.test.testing_utils import FakeSomething
+from state.pruning_state import PruningState
+from storage.helper import initHashStore, initKeyValueStorage
+
+TXNS_COUNT = 2000
+
+
+def create_ledger(data_dir, name, config):
+    hash_store = initHashStore(data_dir, name, config)
+    return Ledger(CompactMerkleTree(hashStore=hash_store),
+                  dataDir=data_dir,
+                  fileName=name + '_transactions',
+                  config=config)
+
+
+def create_state(data_dir, name, config):
+    return PruningState(initKeyValueStorage(config.domainStateStorage, data_dir, name + '_state'))
+
+
+def create_txns(count):
+    return [{
+        TXN_PAYLOAD: {
+            TXN_PAYLOAD_DATA: {
+                'dest': randomString(22),
+                'verkey': randomString(44)
+            }
+        },
+        TXN_METADATA: {}
+    } for _ in range(count)]
+
+
+def create_catchup_reps(ledger, txns_in_reply):
+    reps = []
+    for start in range(1, ledger.size + 1, txns_in_reply):
+        end = min(start + txns_in_reply - 1, ledger.size)
+        txns = SortedDict((str(seq_no), txn) for seq_no, txn in ledger.getAllTxn(start, end))
+        reps.append(CatchupRep(DOMAIN_LEDGER_ID, txns,
+                               SeederService._make_consistency_proof(ledger, end, ledger.size)))
+    return reps
+
+
+def create_catchup_rep_service(ledger, state, update_state=True):
+    def restore_state(ledger_id, txn):
+        # This is what a node does for every txn added during catchup
+        if update_state:
+            data = get_payload_data(txn)
+            state.set(data['dest'].encode(), data['verkey'].encode())
+        state.commit(rootHash=state.headHash)
+
+    ledger_info = FakeSomething(ledger=ledger,
+                                verifier=MerkleVerifier(),
+                                postTxnAddedToLedgerClbk=restore_state,
+                                postCatchupCompleteClbk=None)
+    node = FakeSomething(name='Alpha',
+                         ledgerManager=FakeSomething(ledgerRegistry={DOMAIN_LEDGER_ID: ledger_info},
+                                                     postCatchupClbk=None),
+                         states={DOMAIN_LEDGER_ID: state},
+                         transform_txn_for_ledger=lambda txn: txn)
+    output, _ = create_direct_channel()
+    _, input_rx = create_direct_channel()
+    return CatchupRepService(ledger_id=DOMAIN_LEDGER_ID,
+                             config=None,
+                             input=input_rx,
+                             output=output,
+                             timer=None,
+                             metrics=NullMetricsCollector(),
+                             provider=CatchupNodeDataProvider(node))
+
+
+def start_catchup(service, seeder_ledger):
+    service._catchup_till = CatchupTill(start_size=0,
+                                        final_size=seeder_ledger.size,
+                                        final_hash=seeder_ledger.root_hash)
+    service._is_working = True
+
+
+def apply_one_by_one(service, reps):
+    # This is how catchup replies used to be applied before all the txns
+    # of verified replies were added to the ledger and the state at once
+    ledger = service._ledger
+    for rep in reps:
+        txns = sorted((int(seq_no), txn) for seq_no, txn in rep.txns.items())
+        service._received_catchup_replies_from['Beta'].append(rep)
+        result, _, ledger_txns, _ = service._has_valid_catchup_replies(txns[0][0], txns, ledger.tree)
+        assert result
+        for (_, txn), ledger_txn in zip(txns, ledger_txns):
+            service._add_txns([txn], [ledger_txn])
+        service._remove_processed_catchup_reply('Beta', txns[0][0])
+
+
+def apply_batched(service, reps):
+    for rep in reps:
+        service.process_catchup_rep(rep, 'Beta')
+
+
+@pytest.mark.parametrize('update_state', [False, True])
+@pytest.mark.parametrize('txns_count, txns_in_reply', [(100, 10),
+                                                        perf_param(TXNS_COUNT, 10),
+                                                        perf_param(TXNS_COUNT, 100),
+                                                        perf_param(TXNS_COUNT, 1000)])
+def test_catchup_apply_perf(tdir_for_func, tconf_for_func, txns_count, txns_in_reply, update_state, capsys):
+    seeder_ledger = create_ledger(tdir_for_func, 'seeder', tconf_for_func)
+    seeder_ledger.add_txns(create_txns(txns_count))
+    reps = create_catchup_reps(seeder_ledger, txns_in_reply)
+
+    results = {}
+    for name, apply in (('one_by_one', apply_one_by_one), ('batched', apply_batched)):
+        ledger = create_ledger(tdir_for_func, name, tconf_for_func)
+        state = create_state(tdir_for_func, name, tconf_for_func)
+        service = create_catchup_rep_service(ledger, state, update_state)
+        start_catchup(service, seeder_ledger)
+
+        start = perf_counter()
+        apply(service, reps)
+        spent = perf_counter() - start
+
+        assert ledger.size == seeder_ledger.size
+        assert ledger.root_hash == seeder_ledger.root_hash
+        assert ledger.tree.hashStore.is_consistent
+        assert state.committedHeadHash == state.headHash
+        results[name] = spent, state.committedHeadHash
+        ledger.stop()
+        state.close()
+
+    assert results['one_by_one'][1] == results['batched'][1]
+
+    print_perf_result(capsys,
+                      'Caught up {} txns in replies of {} txns {} state updates: one by one at {:.0f} txns/sec, '
+                      'batched at {:.0f} txns/sec'.format(txns_count, txns_in_reply,
+                                                          'with' if update_state else 'without',
+                                                          txns_count / results['one_by_one'][0],
+                                                          txns_count / results['batched'][0]))
+    seeder_ledger.stop()
+
+
+def test_catchup_applies_verified_replies_before_invalid_one(tdir_for_func, tconf_for_func):
+    seeder_ledger = create_ledger(tdir_for_func, 'seeder', tconf_for_func)
+    seeder_ledger.add_txns(create_txns(30))
+    reps = create_catchup_reps(seeder_ledger, 10)
+    # The last reply does not match the consistency proof anymore
+    next(iter(reps[2].txns.values()))[TXN_PAYLOAD][TXN_PAYLOAD_DATA]['verkey'] = randomString(44)
+
+    ledger = create_ledger(tdir_for_func, 'leecher', tconf_for_func)
+    state = create_state(tdir_for_func, 'leecher', tconf_for_func)
+    service = create_catchup_rep_service(ledger, state)
+    blacklisted = []
+    service._provider.blacklist_node = lambda node_name, reason: blacklisted.append(node_name)
+    start_catchup(service, seeder_ledger)
+
+    service.process_catchup_rep(reps[2], 'Gamma')
+    service.process_catchup_rep(reps[1], 'Beta')
+    assert ledger.size == 0
+
+    service.process_catchup_rep(reps[0], 'Beta')
+    assert ledger.size == 20
+    assert blacklisted == ['Gamma']
+    assert state.committedHeadHash == state.headHash
+    assert not service._received_catchup_txns
+    ledger.stop()
+    state.close()
@@ -8,6 +8,7 @@ from plenum.test.helper import sdk_send_random_and_check
 from plenum.test.node_catchup.helper import waitNodeDataEquality
 
 from stp_core.validators.message_length_validator import MessageLenValidator
+from stp_zmq.codec import JSON_CODEC
 
 TestRunningTimeLimitSec = 300
 
@@ -15,15 +16,15 @@ TestRunningTimeLimitSec = 300
 def decrease_max_request_size(node):
     old = node.nodestack.prepare_for_sending
 
-    def prepare_for_sending(msg, signer, message_splitter=lambda x: None):
+    def prepare_for_sending(msg, signer, message_splitter=lambda x: None, codec_name=JSON_CODEC):
         if isinstance(msg, CatchupRep) and len(msg.txns) > 6:
             node.nodestack.prepare_for_sending = old
-            part_bytes = node.nodestack.sign_and_serialize(msg, signer)
+            part_bytes = node.nodestack.sign_and_serialize(msg, signer, codec_name)
             # Decrease at least 6 times to increase probability of
             # unintentional shuffle
             new_limit = len(part_bytes) // 6
             node.nodestack.msg_len_val = MessageLenValidator(new_limit)
-        return old(msg, signer, message_splitter)
+        return old(msg, signer, message_splitter, codec_name)
 
     node.nodestack.prepare_for_sending = prepare_for_sending
 
@@ -24,9 +24,9 @@ def _add_txns_to_ledger(node, looper, sdk_wallet_client, num_txns_in_reply, repl
     catchup_rep_service = ledger_manager._node_leecher._leechers[ledger_id]._catchup_rep_service
     reqs = sdk_signed_random_requests(looper, sdk_wallet_client, txn_count)
     # add transactions to ledger
-    for req in reqs:
-        txn = append_txn_metadata(reqToTxn(req), txn_time=12345678)
-        catchup_rep_service._add_txn(txn)
+    txns = [append_txn_metadata(reqToTxn(req), txn_time=12345678) for req in reqs]
+    catchup_rep_service._add_txns(txns, [catchup_rep_service._provider.transform_txn_for_ledger(txn)
+                                         for txn in txns])
     # generate CatchupReps
     replies = []
     for i in range(ledger.seqNo - txn_count + 1, ledger.seqNo + 1, num_txns_in_reply):
@@ -0,0 +1,135 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.channel import create_direct_channel
+from plenum.common.constants import TXN_PAYLOAD, TXN_PAYLOAD_DATA, TXN_METADATA, DOMAIN_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.messages.node_messages import CatchupReq
+from plenum.common.perf_util import get_size
+from plenum.common.util import randomString
+from plenum.server.catchup.seeder_service import NodeSeederService, CatchupRepCache
+from plenum.test.testing_utils import FakeSomething
+from storage.helper import initHashStore
+from stp_zmq.zstack import ZStack
+
+MSG_LEN_LIMIT = 16 * 1024
+TXNS_COUNT = 100
+
+
+@pytest.fixture()
+def ledger(tdir_for_func, tconf_for_func):
+    hash_store = initHashStore(tdir_for_func, 'domain', tconf_for_func)
+    ledger = Ledger(CompactMerkleTree(hashStore=hash_store),
+                    dataDir=tdir_for_func,
+                    fileName='domain_transactions',
+                    config=tconf_for_func)
+    # Every 10th txn is much larger than others
+    ledger.add_txns([{
+        TXN_PAYLOAD: {TXN_PAYLOAD_DATA: {'data': randomString(4000 if i % 10 == 0 else 100)}},
+        TXN_METADATA: {}
+    } for i in range(TXNS_COUNT)])
+    yield ledger
+    ledger.stop()
+
+
+def create_seeder(ledger, cache_size=1024 * 1024):
+    sent = []
+    provider = FakeSomething(node_name=lambda: 'Alpha',
+                             ledger=lambda ledger_id: ledger if ledger_id == DOMAIN_LEDGER_ID else None,
+                             update_txn_with_extra_data=lambda txn: txn,
+                             send_to=lambda msg, to, message_splitter=None: sent.append((msg, to)))
+    config = FakeSomething(MSG_LEN_LIMIT=MSG_LEN_LIMIT, CATCHUP_REP_CACHE_SIZE=cache_size)
+    _, rx = create_direct_channel()
+    return NodeSeederService(rx, provider, config), sent
+
+
+def check_reps(ledger, reps, start, end, catchup_till):
+    seq_nos = [seq_no for rep in reps for seq_no in rep.txns]
+    assert seq_nos == list(range(start, end + 1))
+    for rep in reps:
+        assert len(ZStack.serializeMsg(rep._asdict())) <= MSG_LEN_LIMIT
+        last_seq_no = max(rep.txns)
+        assert rep.consProof == NodeSeederService._make_consistency_proof(ledger, last_seq_no, catchup_till)
+        for seq_no, txn in rep.txns.items():
+            assert txn == ledger.getBySeqNo(seq_no)
+
+
+def test_catchup_reps_fit_into_messages(ledger):
+    seeder, sent = create_seeder(ledger)
+
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 5, 95, TXNS_COUNT), 'Beta')
+
+    reps = [msg for msg, _ in sent]
+    assert len(reps) > 1
+    check_reps(ledger, reps, 5, 95, TXNS_COUNT)
+    assert all(to == 'Beta' for _, to in sent)
+
+
+def test_catchup_reps_for_same_range_are_served_from_cache(ledger, monkeypatch):
+    seeder, sent = create_seeder(ledger)
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Beta')
+    first_reps = [msg for msg, _ in sent]
+    sent.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('txns must not be read again')
+
+    monkeypatch.setattr(ledger, 'getAllTxn', fail)
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Gamma')
+
+    assert [msg for msg, _ in sent] == first_reps
+    assert all(to == 'Gamma' for _, to in sent)
+    assert seeder._reps_cache.hits == 1
+    check_reps(ledger, first_reps, 1, 50, 80)
+
+
+def test_catchup_reps_are_not_cached_when_cache_is_disabled(ledger):
+    seeder, sent = create_seeder(ledger, cache_size=0)
+
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Beta')
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Gamma')
+
+    assert len(seeder._reps_cache) == 0
+    beta_reps = [msg for msg, to in sent if to == 'Beta']
+    gamma_reps = [msg for msg, to in sent if to == 'Gamma']
+    assert beta_reps == gamma_reps
+    check_reps(ledger, gamma_reps, 1, 50, 80)
+
+
+def test_catchup_rep_cache_evicts_least_recently_used():
+    cache = CatchupRepCache(max_size=100)
+    cache.put('a', ['rep_a'], 40)
+    cache.put('b', ['rep_b'], 40)
+    assert cache.get('a') == ['rep_a']
+
+    cache.put('c', ['rep_c'], 40)
+    assert cache.get('b') is None
+    assert cache.get('a') == ['rep_a']
+    assert cache.get('c') == ['rep_c']
+    assert cache.size == 80
+
+    cache.put('d', ['rep_d'], 101)
+    assert cache.get('d') is None
+    assert len(cache) == 2
+
+
+def test_catchup_rep_cache_is_charged_with_memory_taken_by_reps(ledger):
+    seeder, sent = create_seeder(ledger)
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Beta')
+    reps = [msg for msg, _ in sent]
+
+    assert seeder._reps_cache.size == sum(get_size(rep) for rep in reps)
+    assert seeder._reps_cache.size > sum(len(ZStack.serializeMsg(rep._asdict())) for rep in reps)
+
+
+def test_catchup_reps_taking_more_memory_than_cache_size_are_not_cached(ledger):
+    seeder, sent = create_seeder(ledger, cache_size=0)
+    serialized_size = sum(len(ZStack.serializeMsg(rep._asdict()))
+                          for rep in seeder._stream_catchup_reps(DOMAIN_LEDGER_ID, ledger, 1, 50, 80))
+    # The serialized replies fit into the cache but their objects don't
+    seeder, sent = create_seeder(ledger, cache_size=serialized_size + 1)
+    seeder.process_catchup_req(CatchupReq(DOMAIN_LEDGER_ID, 1, 50, 80), 'Beta')
+
+    assert len(seeder._reps_cache) == 0
+    assert seeder._reps_cache.size == 0
+    check_reps(ledger, [msg for msg, _ in sent], 1, 50, 80)
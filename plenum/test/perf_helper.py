@@ -0,0 +1,24 @@
+"""
+Performance measurements take long and their numbers depend on the machine, so
+like the tests in `test_performance.py` they are skipped by default and only
+run when a perf check is required: set the `PLENUM_PERF_TESTS` environment
+variable to run them. Light variants of the same tests keep checking the
+functional part in every run.
+"""
+import os
+
+import pytest
+
+RUN_PERF_TESTS = bool(os.environ.get('PLENUM_PERF_TESTS'))
+perf_test = pytest.mark.skipif(not RUN_PERF_TESTS, reason='Perf test, set PLENUM_PERF_TESTS to run it')
+
+
+def perf_param(*values):
+    return pytest.param(*values, marks=perf_test)
+
+
+def print_perf_result(capsys, result: str):
+    if not RUN_PERF_TESTS:
+        return
+    with capsys.disabled():
+        print('\n' + result)
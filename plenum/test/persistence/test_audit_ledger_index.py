@@ -0,0 +1,108 @@
+import pytest
+
+from ledger.compact_merkle_tree import CompactMerkleTree
+from plenum.common.constants import AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO, AUDIT_TXN_STATE_ROOT, TXN_PAYLOAD, \
+    TXN_PAYLOAD_DATA, TXN_METADATA, DOMAIN_LEDGER_ID, POOL_LEDGER_ID, CONFIG_LEDGER_ID
+from plenum.common.ledger import Ledger
+from plenum.common.txn_util import append_txn_metadata
+from plenum.persistence.audit_ledger_index import AuditLedgerIndex
+from storage.helper import initKeyValueStorage
+
+# (view_no, pp_seq_no, state roots)
+AUDIT_BATCHES = [
+    (0, 1, {POOL_LEDGER_ID: 'pool1', DOMAIN_LEDGER_ID: 'domain1'}),
+    (0, 2, {DOMAIN_LEDGER_ID: 'domain2'}),
+    (0, 3, {}),
+    (1, 3, {CONFIG_LEDGER_ID: 'config1'}),
+    (1, 4, {DOMAIN_LEDGER_ID: 'domain3'}),
+    (2, 5, {}),
+]
+
+
+def audit_txn(view_no, pp_seq_no, state_roots):
+    return {
+        TXN_PAYLOAD: {
+            TXN_PAYLOAD_DATA: {
+                AUDIT_TXN_VIEW_NO: view_no,
+                AUDIT_TXN_PP_SEQ_NO: pp_seq_no,
+                AUDIT_TXN_STATE_ROOT: dict(state_roots)
+            }
+        },
+        TXN_METADATA: {}
+    }
+
+
+@pytest.fixture()
+def audit_ledger(tdir_for_func):
+    ledger = Ledger(CompactMerkleTree(), dataDir=tdir_for_func)
+    for view_no, pp_seq_no, state_roots in AUDIT_BATCHES:
+        txn = audit_txn(view_no, pp_seq_no, state_roots)
+        ledger.append_txns_metadata([txn], 0)
+        ledger.appendTxns([txn])
+        ledger.commitTxns(1)
+    return ledger
+
+
+@pytest.fixture()
+def audit_index(tdir_for_func, tconf):
+    return AuditLedgerIndex(initKeyValueStorage(tconf.auditIndexStorage,
+                                                tdir_for_func,
+                                                tconf.auditIndexDbName))
+
+
+def check_index(audit_index):
+    assert audit_index.last_seq_no == len(AUDIT_BATCHES)
+    for seq_no, (view_no, pp_seq_no, _) in enumerate(AUDIT_BATCHES, start=1):
+        assert audit_index.get_seq_no_by_3pc_key(view_no, pp_seq_no) == seq_no
+    assert audit_index.get_seq_no_by_3pc_key(2, 6) is None
+
+    assert audit_index.get_seq_no_by_pp_seq_no(1) == 1
+    assert audit_index.get_seq_no_by_pp_seq_no(3) == 4
+    assert audit_index.get_seq_no_by_pp_seq_no(6) is None
+
+    assert audit_index.get_first_seq_no_in_view(0) == 1
+    assert audit_index.get_first_seq_no_in_view(1) == 4
+    assert audit_index.get_first_seq_no_in_view(2) == 6
+    assert audit_index.get_first_seq_no_in_view(3) is None
+
+    assert audit_index.get_last_state_root(POOL_LEDGER_ID) == (1, 'pool1')
+    assert audit_index.get_last_state_root(DOMAIN_LEDGER_ID) == (5, 'domain3')
+    assert audit_index.get_last_state_root(CONFIG_LEDGER_ID) == (4, 'config1')
+    assert audit_index.get_last_state_root(42) == (None, None)
+
+
+def test_add_txns(audit_ledger, audit_index):
+    audit_index.add_txns(txn for _, txn in audit_ledger.getAllTxn(to=2))
+    assert audit_index.last_seq_no == 2
+    assert not audit_index.covers(audit_ledger)
+
+    audit_index.add_txns(txn for _, txn in audit_ledger.getAllTxn(frm=3))
+    assert audit_index.covers(audit_ledger)
+    check_index(audit_index)
+
+
+def test_add_txns_with_gap_fails(audit_ledger, audit_index):
+    with pytest.raises(ValueError):
+        audit_index.add_txns([audit_ledger.getBySeqNo(2)])
+    assert audit_index.last_seq_no == 0
+
+
+def test_sync(audit_ledger, audit_index):
+    audit_index.SYNC_CHUNK_SIZE = 4
+    audit_index.sync(audit_ledger)
+    assert audit_index.covers(audit_ledger)
+    check_index(audit_index)
+
+    # syncing an up to date index does nothing
+    audit_index.sync(audit_ledger)
+    check_index(audit_index)
+
+
+def test_sync_rebuilds_index_ahead_of_ledger(audit_ledger, audit_index):
+    audit_index.add_txns(txn for _, txn in audit_ledger.getAllTxn())
+    audit_index.add_txns([append_txn_metadata(audit_txn(3, 6, {POOL_LEDGER_ID: 'pool2'}),
+                                              seq_no=len(AUDIT_BATCHES) + 1)])
+    assert audit_index.last_seq_no == len(AUDIT_BATCHES) + 1
+
+    audit_index.sync(audit_ledger)
+    check_index(audit_index)
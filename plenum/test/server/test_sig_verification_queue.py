@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from plenum.server.sig_verification_queue import SigVerificationQueue
+
+
+class InvalidSig(Exception):
+    pass
+
+
+def verify(msg):
+    # later messages are verified faster to check that order is preserved
+    time.sleep(0.001 * (10 - msg % 10))
+    if msg % 7 == 0:
+        raise InvalidSig(msg)
+
+
+@pytest.fixture()
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture()
+def queue(executor):
+    return SigVerificationQueue(verify, executor, batch_size=3)
+
+
+class Output:
+    def __init__(self):
+        self.verified = []
+        self.failed = []
+        self.order = []
+
+    def on_verified(self, msg, frm):
+        self.verified.append(msg)
+        self.order.append(msg)
+
+    def on_failed(self, msg, frm, ex):
+        assert isinstance(ex, InvalidSig)
+        self.failed.append(msg)
+        self.order.append(msg)
+
+
+def service_until_empty(queue, output, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while len(queue) > 0:
+        assert time.perf_counter() < deadline
+        queue.service(output.on_verified, output.on_failed)
+        time.sleep(0.001)
+
+
+def test_messages_are_handed_out_in_order(queue):
+    output = Output()
+    for msg in range(1, 31):
+        queue.add(msg, 'client')
+    queue.submit()
+    assert len(queue) == 30
+
+    service_until_empty(queue, output)
+    assert output.order == list(range(1, 31))
+    assert output.failed == [7, 14, 21, 28]
+
+
+def test_messages_not_needing_verification_are_not_verified_but_keep_order(queue):
+    output = Output()
+    queue.add(1, 'client')
+    queue.add(14, 'client', need_verification=False)
+    queue.add(2, 'client')
+    queue.add(21, 'client', need_verification=False)
+    queue.submit()
+
+    service_until_empty(queue, output)
+    assert output.order == [1, 14, 2, 21]
+    assert output.failed == []
+
+
+def test_not_submitted_messages_are_not_handed_out(queue):
+    output = Output()
+    queue.add(1, 'client')
+    queue.add(2, 'client')
+    time.sleep(0.05)
+    assert queue.service(output.on_verified, output.on_failed) == 0
+    assert len(queue) == 2
+
+    # the batch is submitted automatically once it is full
+    queue.add(3, 'client')
+    service_until_empty(queue, output)
+    assert output.order == [1, 2, 3]
+
+
+def test_verification_runs_in_parallel(executor):
+    num_msgs = 40
+    # Every verification waits for another one to be in flight at the same time
+    barrier = threading.Barrier(2, timeout=5)
+
+    def verify_in_pairs(msg):
+        barrier.wait()
+
+    queue = SigVerificationQueue(verify_in_pairs, executor, batch_size=1)
+    output = Output()
+    for msg in range(num_msgs):
+        queue.add(msg, 'client')
+    service_until_empty(queue, output, timeout=10)
+
+    assert output.order == list(range(num_msgs))
+    assert output.failed == []
+
+
+def test_cleared_messages_are_not_handed_out(queue):
+    output = Output()
+    for msg in range(1, 31):
+        queue.add(msg, 'client')
+    queue.submit()
+    queue.add(31, 'client')
+
+    queue.clear()
+    assert len(queue) == 0
+    time.sleep(0.1)
+    assert queue.service(output.on_verified, output.on_failed) == 0
+    assert output.order == []
+
+    queue.add(32, 'client')
+    queue.submit()
+    service_until_empty(queue, output)
+    assert output.order == [32]
+
+
+def test_data_for_verification_is_prepared_when_message_is_added(executor):
+    prepared_in = {}
+    verified_with = {}
+
+    def prepare(msg):
+        prepared_in[msg] = threading.current_thread()
+        return msg * 10
+
+    def verify_prepared(msg, prepared):
+        verified_with[msg] = prepared
+
+    queue = SigVerificationQueue(verify_prepared, executor, batch_size=2, prepare=prepare)
+    output = Output()
+    queue.add(1, 'client')
+    queue.add(2, 'client', need_verification=False)
+    queue.add(3, 'client')
+    assert prepared_in == {1: threading.current_thread(), 3: threading.current_thread()}
+
+    queue.submit()
+    service_until_empty(queue, output)
+    assert output.order == [1, 2, 3]
+    assert verified_with == {1: 10, 3: 30}
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+
+from plenum.common.constants import CURRENT_PROTOCOL_VERSION
+from plenum.common.exceptions import InsufficientCorrectSignatures, RequestNackedException
+from plenum.test.helper import sdk_send_random_and_check, sdk_random_request_objects, \
+    sdk_multisign_request_object, sdk_send_signed_requests, sdk_get_and_check_replies
+from plenum.test.node_catchup.helper import ensure_all_nodes_have_same_data
+from plenum.test.node_request.test_reply_from_ledger_for_request import deserialize_req
+from plenum.test.pool_transactions.helper import disconnect_node_and_ensure_disconnected
+from plenum.test.test_node import checkNodesConnected
+from stp_core.loop.eventually import eventually
+
+whitelist = ['InvalidSignature']
+
+
+@pytest.fixture(scope="module")
+def tconf(tconf):
+    old_workers = tconf.SIG_VERIFICATION_WORKERS
+    old_batch_size = tconf.SIG_VERIFICATION_BATCH_SIZE
+    tconf.SIG_VERIFICATION_WORKERS = 2
+    tconf.SIG_VERIFICATION_BATCH_SIZE = 3
+    yield tconf
+    tconf.SIG_VERIFICATION_WORKERS = old_workers
+    tconf.SIG_VERIFICATION_BATCH_SIZE = old_batch_size
+
+
+def test_requests_are_ordered_with_parallel_sig_verification(looper, txnPoolNodeSet,
+                                                             sdk_pool_handle, sdk_wallet_client):
+    for node in txnPoolNodeSet:
+        assert node.client_sig_verifier is not None
+        assert node.node_sig_verifier is not None
+
+    sdk_send_random_and_check(looper, txnPoolNodeSet, sdk_pool_handle, sdk_wallet_client, 10)
+
+    for node in txnPoolNodeSet:
+        assert len(node.client_sig_verifier) == 0
+        assert len(node.node_sig_verifier) == 0
+
+
+def test_request_with_incorrect_signature_is_nacked_with_parallel_sig_verification(
+        looper, sdk_pool_handle, sdk_wallet_client, sdk_wallet_client2):
+    req = sdk_random_request_objects(1, identifier=sdk_wallet_client[1], protocol_version=CURRENT_PROTOCOL_VERSION)[0]
+
+    req = sdk_multisign_request_object(looper, sdk_wallet_client, json.dumps(req.as_dict))
+    req = deserialize_req(req)
+    req.signatures[req.identifier] = 'garbage'
+
+    multisig_req = sdk_multisign_request_object(looper, sdk_wallet_client2, json.dumps(req.as_dict))
+
+    rep = sdk_send_signed_requests(sdk_pool_handle, [multisig_req])
+
+    invalid_signatures = 'did={}, signature={}'.format(req.identifier, req.signatures[req.identifier])
+    expected_error_message = 'Reason: client request invalid: {}'. \
+        format(InsufficientCorrectSignatures.reason.format(2, 1, 1, invalid_signatures))
+
+    with pytest.raises(RequestNackedException, match=expected_error_message):
+        sdk_get_and_check_replies(looper, rep)
+
+
+def test_sig_verification_workers_exit_when_node_stops(looper, txnPoolNodeSet,
+                                                       sdk_pool_handle, sdk_wallet_client):
+    # Workers are started once there are signatures to verify
+    sdk_send_random_and_check(looper, txnPoolNodeSet, sdk_pool_handle, sdk_wallet_client, 1)
+    node = txnPoolNodeSet[-1]
+
+    def worker_threads():
+        return [t for t in threading.enumerate() if t.name.startswith('{}_sig'.format(node.name))]
+
+    assert worker_threads()
+    disconnect_node_and_ensure_disconnected(looper, txnPoolNodeSet, node, stopNode=True)
+    looper.removeProdable(node)
+
+    def check_no_workers():
+        assert not worker_threads()
+
+    looper.run(eventually(check_no_workers))
+
+
+def test_sig_verification_workers_restart_with_node(looper, txnPoolNodeSet,
+                                                    sdk_pool_handle, sdk_wallet_client):
+    # The node was stopped by the previous test
+    node = txnPoolNodeSet[-1]
+    assert node.client_sig_verifier is None
+    assert node.node_sig_verifier is None
+
+    looper.add(node)
+    looper.run(checkNodesConnected(txnPoolNodeSet))
+    assert node.client_sig_verifier is not None
+    assert node.node_sig_verifier is not None
+
+    sdk_send_random_and_check(looper, txnPoolNodeSet, sdk_pool_handle, sdk_wallet_client, 5)
+    ensure_all_nodes_have_same_data(looper, txnPoolNodeSet)
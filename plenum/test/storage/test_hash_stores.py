@@ -6,6 +6,7 @@ from ledger.test.test_file_hash_store import nodesLeaves
 from ledger.ledger import Ledger
 from plenum.common.constants import HS_LEVELDB, HS_ROCKSDB, HS_MEMORY
 from plenum.persistence.db_hash_store import DbHashStore
+from storage.kv_store import KeyValueStorage
 
 
 @pytest.yield_fixture(scope="module", params=[HS_MEMORY, HS_ROCKSDB, HS_LEVELDB])
@@ -60,3 +61,45 @@ def testRecoverLedgerFromHashStore(hashStore, tconf, tdir):
     assert restartedLedger.tree.hashes == updatedTree.hashes
     assert restartedLedger.tree.root_hash == updatedTree.root_hash
     restartedLedger.stop()
+
+
+@pytest.mark.parametrize('db_type', [HS_ROCKSDB, HS_LEVELDB])
+def test_counts_are_read_without_iterating_on_open(db_type, tdir_for_func, monkeypatch):
+    hs = DbHashStore(tdir_for_func, db_type=db_type)
+    tree = CompactMerkleTree(hashStore=hs)
+    for d in range(10):
+        tree.append(str(d).encode())
+    tree.extend([str(d).encode() for d in range(10, 25)])
+    leaf_count, node_count = hs.leafCount, hs.nodeCount
+    assert leaf_count == 25
+    assert node_count == CompactMerkleTree.get_expected_node_count(leaf_count)
+    hs.close()
+
+    def fail(self):
+        raise AssertionError('database must not be iterated over')
+
+    monkeypatch.setattr(KeyValueStorage, 'size', property(fail))
+    hs = DbHashStore(tdir_for_func, db_type=db_type)
+    assert hs.leafCount == leaf_count
+    assert hs.nodeCount == node_count
+    assert hs.is_consistent
+    hs.close()
+
+
+@pytest.mark.parametrize('db_type', [HS_ROCKSDB, HS_LEVELDB])
+@pytest.mark.parametrize('leaf_count', [0, 1, 2, 7, 8, 9, 100])
+def test_databases_keep_only_hashes(db_type, leaf_count, tdir_for_func):
+    hs = DbHashStore(tdir_for_func, db_type=db_type)
+    tree = CompactMerkleTree(hashStore=hs)
+    tree.extend([str(d).encode() for d in range(leaf_count)])
+    node_count = CompactMerkleTree.get_expected_node_count(leaf_count)
+    hs.close()
+
+    hs = DbHashStore(tdir_for_func, db_type=db_type)
+    assert hs.leafCount == leaf_count
+    assert hs.nodeCount == node_count
+    assert hs.leavesDb.size == leaf_count
+    assert hs.nodesDb.size == node_count
+    assert sorted(int(k) for k in hs.leavesDb.iterator(include_value=False)) == list(range(1, leaf_count + 1))
+    assert sorted(int(k) for k in hs.nodesDb.iterator(include_value=False)) == list(range(1, node_count + 1))
+    hs.close()
@@ -10,6 +10,7 @@ class Q1(Motor, HasActionQueue):
     def __init__(self, name):
         self.name = name
         self.results = {}
+        self.prods = 0
         Motor.__init__(self)
         HasActionQueue.__init__(self)
 
@@ -17,8 +18,13 @@ class Q1(Motor, HasActionQueue):
         pass
 
     async def prod(self, limit: int = None) -> int:
+        self.prods += 1
         return self._serviceActions()
 
+    def time_to_next_event(self):
+        t = HasActionQueue.time_to_next_event(self)
+        return float('inf') if t is None else t
+
     def meth(self, meth_name, x):
         if meth_name not in self.results:
             self.results[meth_name] = []
@@ -84,3 +90,20 @@ def test_action_cancellation_by_action():
 
         assert 'meth2' in q1.results
         assert 'meth3' not in q1.results
+
+
+def test_action_scheduling_with_event_driven_looper():
+    with Looper(event_driven=True) as looper:
+        q1 = Q1('q1')
+        q1.meth1 = partial(q1.meth, 'meth1')
+
+        looper.add(q1)
+        scheduled_at = time.perf_counter()
+        q1._schedule(partial(q1.meth1, 1), 0.5)
+
+        looper.runFor(1)
+
+        assert [t[0] for t in q1.results['meth1']] == [1]
+        assert 0.5 <= q1.results['meth1'][0][1] - scheduled_at < 0.5 + Looper.POLL_INTERVAL
+        # the looper does not poll an idle prodable
+        assert q1.prods < 1 / Looper.POLL_INTERVAL / 2
@@ -226,3 +226,19 @@ def test_timer_cancels_all_instances_of_callback():
     ts.value += 6
     timer.service()
     assert cb.call_count == 0
+
+
+def test_timer_reports_time_to_next_event():
+    ts = MockTimestamp(0)
+    timer = QueueTimer(ts)
+    assert timer.time_to_next_event() is None
+
+    timer.schedule(5, Callback())
+    timer.schedule(3, Callback())
+    assert timer.time_to_next_event() == 3
+
+    ts.value += 4
+    assert timer.time_to_next_event() == -1
+
+    timer.service()
+    assert timer.time_to_next_event() == 1
@@ -0,0 +1,104 @@
+import pickle
+from copy import copy, deepcopy
+
+import pytest
+
+from common.serializers.serialization import serialize_msg_for_signing
+from plenum.common.constants import NYM, TXN_TYPE, TARGET_NYM, CURRENT_PROTOCOL_VERSION
+from plenum.common.request import ReadOnlyRequestData, Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.types import f
+from plenum.server.client_authn import CoreAuthNr
+from plenum.server.req_authenticator import ReqAuthenticator
+
+
+@pytest.fixture()
+def signer():
+    return SimpleSigner()
+
+
+@pytest.fixture(params=['with_endorser', 'no_endorser'])
+def request_obj(request, signer):
+    req = Request(identifier=signer.identifier,
+                  reqId=1,
+                  operation={TXN_TYPE: NYM, TARGET_NYM: 'some_nym'},
+                  protocolVersion=CURRENT_PROTOCOL_VERSION,
+                  endorser=SimpleSigner().identifier if request.param == 'with_endorser' else None)
+    req.signature = signer.sign(req.as_dict)
+    return req
+
+
+@pytest.fixture()
+def req_authnr(signer):
+    authnr = CoreAuthNr([NYM], [], [])
+    authnr.addIdr(signer.identifier, signer.verkey)
+    req_authnr = ReqAuthenticator()
+    req_authnr.register_authenticator(authnr)
+    return req_authnr
+
+
+def test_read_only_request_data_cannot_be_modified(request_obj):
+    data = request_obj.as_read_only_dict()
+    assert data == request_obj.as_dict
+
+    with pytest.raises(TypeError):
+        data[f.REQ_ID.nm] = 2
+    with pytest.raises(TypeError):
+        del data[f.REQ_ID.nm]
+    with pytest.raises(TypeError):
+        data.pop(f.REQ_ID.nm)
+    with pytest.raises(TypeError):
+        data.update({f.REQ_ID.nm: 2})
+    with pytest.raises(TypeError):
+        data.setdefault('new_field', 2)
+    with pytest.raises(TypeError):
+        data.clear()
+    assert data == request_obj.as_dict
+
+
+def test_copies_of_read_only_request_data_are_mutable(request_obj):
+    data = request_obj.as_read_only_dict()
+    for data_copy in (copy(data), deepcopy(data), pickle.loads(pickle.dumps(data))):
+        assert type(data_copy) is dict
+        assert data_copy == data
+        data_copy[f.REQ_ID.nm] = 2
+
+
+def test_serialization_for_signing_is_shared_with_payload_digest(request_obj):
+    data = request_obj.as_read_only_dict()
+    expected = serialize_msg_for_signing(request_obj.as_dict, topLevelKeysToIgnore=Request.not_signed_fields)
+
+    serialized = data.without(CoreAuthNr.excluded_from_signing).serialized_for_signing()
+    assert serialized == expected
+    assert serialized is request_obj.serialized_payload()
+
+
+def test_serialization_for_signing_is_cached(request_obj):
+    data = ReadOnlyRequestData(request_obj.as_dict)
+    serialized = data.serialized_for_signing([f.SIG.nm])
+    assert serialized == serialize_msg_for_signing(request_obj.as_dict, topLevelKeysToIgnore=[f.SIG.nm])
+    assert data.serialized_for_signing([f.SIG.nm]) is serialized
+    assert data.without([f.SIG.nm]).serialized_for_signing() is serialized
+
+
+def test_authenticate_read_only_request_data(req_authnr, request_obj, signer):
+    assert req_authnr.authenticate(request_obj.as_read_only_dict()) == {signer.identifier}
+    # plain dicts are still accepted
+    assert req_authnr.authenticate(request_obj.as_dict) == {signer.identifier}
+
+
+def test_authenticate_does_not_modify_request_data(req_authnr, request_obj):
+    data = request_obj.as_dict
+    expected = deepcopy(data)
+    req_authnr.authenticate(data, key=request_obj.key)
+    assert data == expected
+
+
+def test_authenticate_with_verkeys_taken_in_advance(req_authnr, request_obj, signer):
+    data = request_obj.as_read_only_dict()
+    verkeys = req_authnr.get_verkeys(data)
+    assert verkeys == {0: {signer.identifier: signer.verkey}}
+
+    # verkeys are not looked up once again
+    req_authnr.core_authenticator.addIdr(signer.identifier, SimpleSigner().verkey)
+    assert req_authnr.authenticate(data, verkeys=verkeys) == {signer.identifier}
@@ -0,0 +1,149 @@
+import pytest
+
+from plenum.common.constants import NYM, TXN_TYPE, TARGET_NYM, VERKEY
+from plenum.common.exceptions import InsufficientCorrectSignatures, CouldNotAuthenticate
+from plenum.common.request import Request
+from plenum.common.signer_simple import SimpleSigner
+from plenum.common.txn_util import reqToTxn
+from plenum.server.client_authn import VerifierCache, CoreAuthNr
+from plenum.server.database_manager import DatabaseManager
+from plenum.server.request_handlers.nym_handler import NymHandler
+from plenum.test.testing_utils import FakeSomething
+from state.pruning_state import PruningState
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+
+def signed_request(signer, req_id=1):
+    req = Request(identifier=signer.identifier,
+                  reqId=req_id,
+                  operation={TXN_TYPE: NYM, TARGET_NYM: 'some_nym'},
+                  protocolVersion=2)
+    req.signature = signer.sign(req.as_dict)
+    return req.as_dict
+
+
+def test_verifier_cache_returns_same_verifier():
+    cache = VerifierCache(10)
+    signer = SimpleSigner()
+    verifier = cache.get(signer.identifier, signer.verkey)
+    assert cache.get(signer.identifier, signer.verkey) is verifier
+    assert len(cache) == 1
+
+    other_signer = SimpleSigner()
+    assert cache.get(signer.identifier, other_signer.verkey) is not verifier
+    assert len(cache) == 2
+
+
+def test_verifier_cache_evicts_least_recently_used():
+    cache = VerifierCache(2)
+    signers = [SimpleSigner() for _ in range(3)]
+    first = cache.get(signers[0].identifier, signers[0].verkey)
+    cache.get(signers[1].identifier, signers[1].verkey)
+    cache.get(signers[0].identifier, signers[0].verkey)
+    cache.get(signers[2].identifier, signers[2].verkey)
+
+    assert len(cache) == 2
+    assert cache.get(signers[0].identifier, signers[0].verkey) is first
+    assert len(cache) == 2
+
+
+def test_verifier_cache_invalidate():
+    cache = VerifierCache(10)
+    signer = SimpleSigner()
+    other_signer = SimpleSigner()
+    verifier = cache.get(signer.identifier, signer.verkey)
+    cache.get(signer.identifier, other_signer.verkey)
+    other_verifier = cache.get(other_signer.identifier, other_signer.verkey)
+
+    cache.invalidate(signer.identifier)
+    assert len(cache) == 1
+    assert cache.get(signer.identifier, signer.verkey) is not verifier
+    assert cache.get(other_signer.identifier, other_signer.verkey) is other_verifier
+
+
+def test_authentication_uses_cached_verifiers():
+    authnr = CoreAuthNr([NYM], [], [], verifier_cache_size=10)
+    verifier_cache = authnr.verifier_cache
+    signer = SimpleSigner()
+    authnr.addIdr(signer.identifier, signer.verkey)
+
+    assert authnr.authenticate(signed_request(signer, 1)) == [signer.identifier]
+    assert len(verifier_cache) == 1
+    assert authnr.authenticate(signed_request(signer, 2)) == [signer.identifier]
+    assert len(verifier_cache) == 1
+
+    # a request signed with an old key is not authenticated after the key rotation
+    new_signer = SimpleSigner(identifier=signer.identifier)
+    authnr.addIdr(signer.identifier, new_signer.verkey)
+    assert len(verifier_cache) == 0
+    with pytest.raises(InsufficientCorrectSignatures):
+        authnr.authenticate(signed_request(signer, 3))
+    assert authnr.authenticate(signed_request(new_signer, 4)) == [signer.identifier]
+
+
+def test_authenticators_do_not_share_cached_verifiers():
+    signer = SimpleSigner()
+    authnrs = [CoreAuthNr([NYM], [], [], verifier_cache_size=10) for _ in range(2)]
+    for authnr in authnrs:
+        authnr.addIdr(signer.identifier, signer.verkey)
+    authnrs[0].authenticate(signed_request(signer))
+    authnrs[1].authenticate(signed_request(signer))
+
+    authnrs[0].addIdr(signer.identifier, SimpleSigner().verkey)
+    assert len(authnrs[0].verifier_cache) == 0
+    assert len(authnrs[1].verifier_cache) == 1
+
+
+def test_authentication_without_verifier_cache():
+    authnr = CoreAuthNr([NYM], [], [])
+    assert authnr.verifier_cache is None
+    signer = SimpleSigner()
+    authnr.addIdr(signer.identifier, signer.verkey)
+
+    assert authnr.authenticate(signed_request(signer)) == [signer.identifier]
+    authnr.addIdr(signer.identifier, SimpleSigner().verkey)
+    with pytest.raises(InsufficientCorrectSignatures):
+        authnr.authenticate(signed_request(signer, 2))
+
+
+def test_nym_verkey_change_invalidates_cached_verifiers(tconf):
+    db_manager = DatabaseManager()
+    handler = NymHandler(tconf, db_manager)
+    db_manager.register_new_database(handler.ledger_id, FakeSomething(), PruningState(KeyValueStorageInMemory()))
+    verifier_cache = VerifierCache(10)
+    handler.verifier_cache = verifier_cache
+    signer = SimpleSigner()
+
+    def add_nym(verkey):
+        handler.update_state(reqToTxn(Request(identifier=signer.identifier,
+                                              operation={TXN_TYPE: NYM,
+                                                         TARGET_NYM: signer.identifier,
+                                                         VERKEY: verkey})),
+                             None, None)
+
+    add_nym(signer.verkey)
+    verifier_cache.get(signer.identifier, signer.verkey)
+
+    # same verkey
+    add_nym(signer.verkey)
+    assert len(verifier_cache) == 1
+
+    add_nym(SimpleSigner().verkey)
+    assert len(verifier_cache) == 0
+
+
+def test_authentication_with_verkeys_taken_in_advance():
+    authnr = CoreAuthNr([NYM], [], [], verifier_cache_size=10)
+    signer = SimpleSigner()
+    unknown_signer = SimpleSigner()
+    authnr.addIdr(signer.identifier, signer.verkey)
+
+    verkeys = authnr.get_verkeys(signed_request(signer))
+    assert verkeys == {signer.identifier: signer.verkey}
+    assert authnr.authenticate(signed_request(signer), verkeys=verkeys) == [signer.identifier]
+
+    # an identifier without a verkey taken in advance is not authenticated
+    # even if its verkey is known by now
+    authnr.addIdr(unknown_signer.identifier, unknown_signer.verkey)
+    with pytest.raises(CouldNotAuthenticate):
+        authnr.authenticate(signed_request(unknown_signer), verkeys=verkeys)
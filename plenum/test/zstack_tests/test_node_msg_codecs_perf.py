@@ -0,0 +1,78 @@
+from time import perf_counter
+
+import pytest
+
+from plenum.common.constants import DOMAIN_LEDGER_ID
+from plenum.common.message_processor import MessageProcessor
+from plenum.common.messages.node_message_factory import node_message_factory
+from plenum.common.messages.node_messages import CatchupRep, Batch
+from plenum.common.txn_util import reqToTxn, append_txn_metadata
+from plenum.common.types import f
+from plenum.common.util import get_utc_epoch
+from plenum.test.helper import sdk_random_request_objects, generate_state_root, create_sample_prepare, \
+    create_sample_commit, create_sample_pre_prepare
+from plenum.test.perf_helper import print_perf_result
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC, pack_batch
+from stp_zmq.zstack import ZStack
+
+ITERATIONS = 100
+IDENTIFIER = '6ouriXMZkLeHsuXrN1X1fd'
+
+
+def create_catchup_rep():
+    reqs = sdk_random_request_objects(100, identifier=IDENTIFIER, protocol_version=2)
+    txns = {seq_no: append_txn_metadata(reqToTxn(req), seq_no=seq_no, txn_time=get_utc_epoch())
+            for seq_no, req in enumerate(reqs, start=1)}
+    return CatchupRep(DOMAIN_LEDGER_ID, txns, [generate_state_root() for _ in range(7)])
+
+
+def measure(func, arg):
+    start = perf_counter()
+    for _ in range(ITERATIONS):
+        result = func(arg)
+    return result, (perf_counter() - start) / ITERATIONS
+
+
+@pytest.mark.parametrize('create_msg', [create_sample_prepare, create_sample_commit, create_sample_pre_prepare,
+                                        create_catchup_rep])
+def test_node_msg_codecs_perf(create_msg, capsys):
+    msg = create_msg()
+    payload = MessageProcessor().toDict(msg)
+
+    results = {}
+    for codec_name in (JSON_CODEC, MSGPACK_CODEC):
+        serialized, encode_time = measure(lambda m: ZStack.serializeMsg(m, codec_name), payload)
+        deserialized, decode_time = measure(ZStack.deserializeMsg, serialized)
+        results[codec_name] = deserialized
+        print_perf_result(capsys,
+                          '{} {}: {} bytes, encoded in {:.1f} us, decoded in {:.1f} us'
+                          .format(msg.typename, codec_name, len(serialized), encode_time * 1e6, decode_time * 1e6))
+
+    # a message is received identically no matter which codec was used
+    assert results[MSGPACK_CODEC] == results[JSON_CODEC]
+    assert node_message_factory.get_instance(**results[MSGPACK_CODEC]) == \
+        node_message_factory.get_instance(**results[JSON_CODEC])
+
+
+def test_node_msg_batch_codecs_perf(capsys):
+    payloads = [MessageProcessor().toDict(create_sample_prepare()) for _ in range(100)]
+
+    def json_batch(msgs):
+        serialized = [ZStack.serializeMsg(m).decode() for m in msgs]
+        return ZStack.serializeMsg(MessageProcessor().toDict(Batch(serialized, None)))
+
+    def binary_batch(msgs):
+        return pack_batch([ZStack.serializeMsg(m, MSGPACK_CODEC) for m in msgs])
+
+    def unpack(batch):
+        return [ZStack.deserializeMsg(m) for m in ZStack.deserializeMsg(batch)[f.MSGS.nm]]
+
+    results = {}
+    for codec_name, make_batch in ((JSON_CODEC, json_batch), (MSGPACK_CODEC, binary_batch)):
+        batch, encode_time = measure(make_batch, payloads)
+        results[codec_name], decode_time = measure(unpack, batch)
+        print_perf_result(capsys,
+                          'BATCH of {} PREPAREs {}: {} bytes, encoded in {:.1f} us, decoded in {:.1f} us'
+                          .format(len(payloads), codec_name, len(batch), encode_time * 1e6, decode_time * 1e6))
+
+    assert results[MSGPACK_CODEC] == results[JSON_CODEC]
@@ -136,6 +136,8 @@ setup(
              'scripts/udp_sender', 'scripts/udp_receiver', 'scripts/filter_log',
              'scripts/log_stats',
              'scripts/init_bls_keys',
+             'scripts/build_audit_ledger_index',
+             'scripts/migrate_rocksdb_int_keys',
              'scripts/process_logs/process_logs',
              'scripts/process_logs/process_logs.yml']
 )
@@ -0,0 +1,97 @@
+from typing import Iterable, Set, Tuple
+
+from state.db.db import BaseDB
+from state.util.fast_rlp import decode_optimized as rlp_decode
+from storage.kv_store import KeyValueStorage
+
+
+class WriteBackDB(BaseDB):
+    """
+    Keeps trie nodes written by uncommitted updates in memory instead of
+    writing each of them to the storage right away. Nodes reachable from a
+    committed root are written to the storage in one batch when the root is
+    flushed, nodes which are not needed anymore are dropped by `retain` and
+    `discard`.
+    """
+
+    def __init__(self, keyValueStorage: KeyValueStorage):
+        self._keyValueStorage = keyValueStorage
+        self._dirty = {}
+
+    @property
+    def dirty_count(self):
+        return len(self._dirty)
+
+    def get(self, key: bytes) -> bytes:
+        node = self._dirty.get(bytes(key))
+        if node is not None:
+            return node
+        return self._keyValueStorage.get(key)
+
+    def _has_key(self, key: bytes):
+        if bytes(key) in self._dirty:
+            return True
+        try:
+            self._keyValueStorage.get(key)
+            return True
+        except KeyError:
+            return False
+
+    def __contains__(self, key):
+        return self._has_key(key)
+
+    def __eq__(self, other):
+        is_k_eq = self._keyValueStorage == other._keyValueStorage
+        return isinstance(other, self.__class__) and is_k_eq
+
+    def inc_refcount(self, key, value):
+        self._dirty[key] = value
+
+    def dec_refcount(self, key):
+        pass
+
+    def flush(self, root_hash: bytes, batch: Iterable[Tuple] = (),
+              other_roots: Iterable[bytes] = ()) -> Set[bytes]:
+        """
+        Write all the buffered nodes reachable from the given root to the storage
+
+        :param root_hash: hash of the root node to be persisted
+        :param batch: other (key, value) pairs to be written in the same batch
+        :param other_roots: hashes of other root nodes to be persisted as well
+        :return: keys of the written nodes
+        """
+        batch = list(batch)
+        keys = self._reachable_dirty_nodes(root_hash, *other_roots)
+        for key in keys:
+            batch.append((key, self._dirty.pop(key)))
+        if batch:
+            self._keyValueStorage.setBatch(batch)
+        return keys
+
+    def discard(self):
+        """
+        Drop all the buffered nodes
+        """
+        self._dirty.clear()
+
+    def retain(self, *root_hashes):
+        """
+        Drop the buffered nodes not reachable from any of the given roots
+        """
+        reachable = self._reachable_dirty_nodes(*root_hashes)
+        if len(reachable) < len(self._dirty):
+            self._dirty = {key: self._dirty[key] for key in reachable}
+
+    def _reachable_dirty_nodes(self, *root_hashes):
+        # Nodes in the storage can reference only nodes in the storage,
+        # so it's enough to walk through the buffered nodes only
+        result = set()
+        stack = list(root_hashes)
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif item in self._dirty and item not in result:
+                result.add(item)
+                stack.extend(rlp_decode(self._dirty[item]))
+        return result
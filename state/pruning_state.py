@@ -1,8 +1,11 @@
 from binascii import unhexlify
-from typing import Optional
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional, List
 
-from state.db.persistent_db import PersistentDB
+from state.db.write_back_db import WriteBackDB
 from state.state import State
+from state.trie.node_cache import TrieNodeCache
+from state.trie.trie_pruner import TriePruner
 from state.trie.pruning_trie import BLANK_ROOT, Trie, BLANK_NODE, \
     bin_to_nibbles
 from state.util.fast_rlp import encode_optimized as rlp_encode, \
@@ -25,16 +28,44 @@ class PruningState(State):
     # SOME KEY THAT DOES NOT COLLIDE WITH ANY STATE VARIABLE'S NAME
     rootHashKey = b'\x88\xc8\x88 \x9a\xa7\x89\x1b'
 
-    def __init__(self, keyValueStorage: KeyValueStorage):
+    def __init__(self, keyValueStorage: KeyValueStorage, node_cache: Optional[TrieNodeCache] = None):
         self._kv = keyValueStorage
+        self._node_cache = node_cache
         if self.rootHashKey in self._kv:
             rootHash = bytes(self._kv.get(self.rootHashKey))
         else:
             rootHash = BLANK_ROOT
             self._kv.put(self.rootHashKey, BLANK_ROOT)
-        self._trie = Trie(
-            PersistentDB(self._kv),
-            rootHash)
+        # Trie nodes are buffered in memory until the root referencing them is committed
+        self._db = WriteBackDB(self._kv)
+        self._trie = Trie(self._db, rootHash, node_cache=node_cache)
+        self._pruner = None  # type: Optional[TriePruner]
+        # Roots committed inside `batched_commit` which are not written yet
+        self._pending_roots = None  # type: Optional[List[bytes]]
+        # Roots of applied but not committed batches, oldest first
+        self._uncommitted_roots = []  # type: List[bytes]
+
+    @property
+    def node_cache(self) -> Optional[TrieNodeCache]:
+        return self._node_cache
+
+    @property
+    def pruner(self) -> Optional[TriePruner]:
+        return self._pruner
+
+    def create_pruner(self, get_retained_roots: Callable[[], Iterable[bytes]]) -> TriePruner:
+        """
+        Create a pruner removing trie nodes not reachable from the roots returned
+        by `get_retained_roots`. The committed head and all uncommitted nodes
+        are always retained.
+        """
+
+        def retained_roots():
+            yield self.committedHeadHash
+            yield from get_retained_roots()
+
+        self._pruner = TriePruner(self._kv, retained_roots)
+        return self._pruner
 
     @property
     def head(self):
@@ -95,11 +126,62 @@ class PruningState(State):
             rootHash = rootHash
         else:
             rootHash = self.headHash
-        self._kv.put(self.rootHashKey, rootHash)
+        if rootHash in self._uncommitted_roots:
+            del self._uncommitted_roots[:self._uncommitted_roots.index(rootHash) + 1]
+        if self._pending_roots is not None:
+            self._pending_roots.append(rootHash)
+        else:
+            self._flush([rootHash])
+
+    @contextmanager
+    def batched_commit(self):
+        """
+        Roots committed inside the context become committed right away, but
+        they are written to the storage in one batch when the context exits,
+        so committing after every one of many updates is cheap
+        """
+        if self._pending_roots is not None:
+            yield
+            return
+        self._pending_roots = []
+        try:
+            yield
+        finally:
+            roots, self._pending_roots = self._pending_roots, None
+            if roots:
+                self._flush(roots)
+
+    def _flush(self, roots: List[bytes]):
+        # All the committed roots are persisted since they may be referenced
+        # later, like roots of the state at some time are
+        root_hash = roots[-1]
+        written = self._db.flush(root_hash, [(self.rootHashKey, root_hash)], other_roots=roots[:-1])
+        if self._pruner:
+            self._pruner.on_nodes_written(written)
+        if root_hash == self.headHash:
+            # nothing uncommitted is left, so the rest of the buffered nodes are not needed
+            self._db.discard()
+        else:
+            # nodes of overwritten and reverted branches are not needed either
+            self._db.retain(self.headHash, *self._uncommitted_roots)
+
+    def add_uncommitted_root(self, root_hash: bytes):
+        """
+        Keep nodes reachable from the given root of an applied batch until
+        the batch is committed or reverted. Buffered nodes not reachable from
+        the committed head, the current head or such roots are dropped on commit.
+        """
+        self._uncommitted_roots.append(root_hash)
 
     def revertToHead(self, headHash=None):
         head = self._hash_to_node(headHash)
         self._trie.replace_root_hash(self._trie.root_node, head)
+        if headHash in self._uncommitted_roots:
+            del self._uncommitted_roots[self._uncommitted_roots.index(headHash) + 1:]
+        else:
+            self._uncommitted_roots.clear()
+        if headHash == self.committedHeadHash and not self._pending_roots:
+            self._db.discard()
 
     # Proofs are always generated over committed state
     def generate_state_proof(self, key: bytes, root=None, serialize=False, get_value=False):
@@ -143,6 +225,8 @@ class PruningState(State):
 
     @property
     def committedHeadHash(self):
+        if self._pending_roots:
+            return self._pending_roots[-1]
         return self._kv.get(self.rootHashKey)
 
     @property
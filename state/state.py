@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from contextlib import contextmanager
 from typing import Optional
 
 
@@ -32,6 +33,17 @@ class State:
     def commit(self, rootHash=None, rootNode=None):
         raise NotImplementedError
 
+    @contextmanager
+    def batched_commit(self):
+        # Commits made inside the context may be written to the storage
+        # together when the context exits
+        yield
+
+    def add_uncommitted_root(self, root_hash):
+        # The given root of an applied but not committed batch may be
+        # committed or reverted to later
+        pass
+
     @abstractmethod
     def revertToHead(self, headHash=None):
         # Revert to the given head
@@ -4,6 +4,7 @@ import pytest
 from storage.kv_store import KeyValueStorage
 from state.pruning_state import PruningState
 from state.state import State
+from state.trie.node_cache import TrieNodeCache
 from state.trie.pruning_trie import BLANK_NODE, BLANK_ROOT
 from storage.kv_in_memory import KeyValueStorageInMemory
 from storage.kv_store_leveldb import KeyValueStorageLeveldb
@@ -21,16 +22,23 @@ def db(request, tempdir) -> KeyValueStorage:
     return KeyValueStorageInMemory()
 
 
+@pytest.fixture(scope="function", params=['no_cache', 'node_cache'])
+def node_cache(request):
+    if request.param == 'node_cache':
+        return TrieNodeCache(1024 * 1024)
+    return None
+
+
 @pytest.yield_fixture(scope="function")
-def state(db) -> State:
-    state = PruningState(db)
+def state(db, node_cache) -> State:
+    state = PruningState(db, node_cache=node_cache)
     yield state
     state.close()
 
 
 @pytest.yield_fixture(scope="function")
-def state2(db) -> State:
-    state = PruningState(db)
+def state2(db, node_cache) -> State:
+    state = PruningState(db, node_cache=node_cache)
     yield state
     state.close()
 
@@ -320,3 +328,127 @@ def test_get_all_leaves_for_root_hash_commited(state):
 def get_decoded_dict_values(state, head_hash):
     encoded_values = state.get_all_leaves_for_root_hash(head_hash)
     return {k: state.get_decoded(v) for k, v in encoded_values.items()}
+
+
+def test_uncommitted_nodes_are_written_on_commit_only(state, db, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("trie nodes should not be written before commit")
+
+    monkeypatch.setattr(db, 'put', fail)
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), 'v{}'.format(i).encode())
+    head_hash = state.headHash
+    assert head_hash not in db
+    monkeypatch.undo()
+
+    state.commit(head_hash)
+    assert head_hash in db
+
+    state2 = PruningState(db)
+    for i in range(100):
+        assert state2.get('k{}'.format(i).encode()) == 'v{}'.format(i).encode()
+
+
+def test_commit_to_old_head_keeps_newer_uncommitted_heads(state):
+    head_hashes = []
+    for i in range(3):
+        state.set(b'k1', 'v{}'.format(i).encode())
+        state.set('k{}'.format(i + 2).encode(), b'v')
+        head_hashes.append(state.headHash)
+        state.add_uncommitted_root(state.headHash)
+
+    state.commit(head_hashes[0])
+    assert b'v0' == state.get(b'k1', isCommitted=True)
+    assert b'v2' == state.get(b'k1', isCommitted=False)
+
+    state.revertToHead(head_hashes[1])
+    assert b'v1' == state.get(b'k1', isCommitted=False)
+    assert b'v' == state.get(b'k3', isCommitted=False)
+    assert not state.get(b'k4', isCommitted=False)
+
+    state.commit(head_hashes[1])
+    assert b'v1' == state.get(b'k1', isCommitted=True)
+    assert b'v' == state.get(b'k3', isCommitted=True)
+
+
+def test_revert_to_committed_head_drops_buffered_nodes(state):
+    state.set(b'k1', b'v1')
+    state.commit()
+    state.set(b'k1', b'v2')
+    state.set(b'k2', b'v2')
+    head_hash = state.headHash
+    assert head_hash in state._db
+
+    state.revertToHead(state.committedHeadHash)
+    assert head_hash not in state._db
+    assert b'v1' == state.get(b'k1', isCommitted=False)
+
+
+def test_batched_commit_writes_all_committed_roots_once(state, db, monkeypatch):
+    batches = []
+    set_batch = db.setBatch
+    monkeypatch.setattr(db, 'setBatch', lambda batch: batches.append(batch) or set_batch(batch))
+
+    head_hashes = []
+    with state.batched_commit():
+        for i in range(10):
+            state.set(b'k1', 'v{}'.format(i).encode())
+            state.set('k{}'.format(i + 2).encode(), b'v')
+            state.commit(state.headHash)
+            head_hashes.append(state.headHash)
+            # Committed state can be read before it is written
+            assert 'v{}'.format(i).encode() == state.get(b'k1', isCommitted=True)
+            assert state.committedHeadHash == state.headHash
+        assert not batches
+        assert all(head_hash not in db for head_hash in head_hashes)
+
+    assert len(batches) == 1
+    assert state.committedHeadHash == head_hashes[-1]
+    state2 = PruningState(db)
+    assert state2.headHash == head_hashes[-1]
+    # Intermediate committed roots are kept as well
+    for i, head_hash in enumerate(head_hashes):
+        assert 'v{}'.format(i).encode() == state2.get_for_root_hash(head_hash, b'k1')
+
+
+def test_batched_commit_keeps_uncommitted_nodes(state, db):
+    with state.batched_commit():
+        state.set(b'k1', b'v1')
+        state.commit()
+        committed_hash = state.headHash
+        state.set(b'k1', b'v2')
+        state.revertToHead(committed_hash)
+        state.set(b'k2', b'v2')
+    assert state.committedHeadHash == committed_hash
+    assert b'v2' == state.get(b'k2', isCommitted=False)
+    assert state.get(b'k2', isCommitted=True) is None
+
+    state.commit()
+    assert b'v2' == PruningState(db).get(b'k2')
+
+
+def test_buffered_nodes_stay_bounded_with_uncommitted_batches_in_flight(state):
+    in_flight = 3
+    batch_roots = []
+    dirty_counts = []
+    for i in range(300):
+        for k in range(20):
+            state.set('k{}'.format(k).encode(), 'v{}_{}'.format(i, k).encode())
+        if i % 10 == 9:
+            # the last batch is reverted and applied again with other values
+            state.revertToHead(batch_roots[-1])
+            state.set(b'k0', 'reapplied{}'.format(i).encode())
+        batch_roots.append(state.headHash)
+        state.add_uncommitted_root(state.headHash)
+        if len(batch_roots) > in_flight:
+            state.commit(rootHash=batch_roots[-in_flight - 1])
+            dirty_counts.append(state._db.dirty_count)
+
+    assert max(dirty_counts[-50:]) <= max(dirty_counts[:50])
+    assert state.get(b'k0', isCommitted=False) == b'reapplied299'
+
+    # batches in flight can still be committed or reverted to
+    state.revertToHead(batch_roots[-2])
+    assert state.get(b'k1', isCommitted=False) == b'v298_1'
+    state.commit(rootHash=batch_roots[-2])
+    assert state.get(b'k1') == b'v298_1'
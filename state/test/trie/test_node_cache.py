@@ -0,0 +1,65 @@
+from state.pruning_state import PruningState
+from state.trie.node_cache import TrieNodeCache
+from storage.kv_in_memory import KeyValueStorageInMemory
+
+
+def test_get_returns_copy_of_cached_node():
+    cache = TrieNodeCache(1000)
+    node = [b'a', [b'b', b'c'], b'']
+    cache.put(b'k', node, 10)
+    node[1][0] = b'x'
+
+    cached = cache.get(b'k')
+    assert cached == [b'a', [b'b', b'c'], b'']
+    cached[1][1] = b'y'
+    assert cache.get(b'k') == [b'a', [b'b', b'c'], b'']
+
+
+def test_hits_and_misses():
+    cache = TrieNodeCache(1000)
+    assert cache.get(b'k') is None
+    cache.put(b'k', [b'v'], 10)
+    assert cache.get(b'k') == [b'v']
+    assert cache.get(bytearray(b'k')) == [b'v']
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    cache.reset_stats()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_least_recently_used_nodes_are_evicted_by_size():
+    entry_size = 100 + TrieNodeCache.ENTRY_OVERHEAD
+    cache = TrieNodeCache(3 * entry_size)
+    for key in [b'k1', b'k2', b'k3']:
+        cache.put(key, [key], 100)
+    assert cache.size == 3 * entry_size
+
+    cache.get(b'k1')
+    cache.put(b'k4', [b'k4'], 100)
+    assert len(cache) == 3
+    assert cache.size == 3 * entry_size
+    assert cache.get(b'k2') is None
+    assert cache.get(b'k1') == [b'k1']
+
+    # a node that is bigger than the whole cache is not cached
+    cache.put(b'big', [b'big'], 3 * entry_size)
+    assert cache.get(b'big') is None
+    assert len(cache) == 3
+
+
+def test_states_share_node_cache():
+    cache = TrieNodeCache(1024 * 1024)
+    kv = KeyValueStorageInMemory()
+    state = PruningState(kv, node_cache=cache)
+    for i in range(100):
+        state.set('k{}'.format(i).encode(), 'v{}'.format(i).encode())
+    state.commit()
+    for i in range(100):
+        state.get('k{}'.format(i).encode())
+
+    other_state = PruningState(kv, node_cache=cache)
+    cache.reset_stats()
+    for i in range(100):
+        assert other_state.get('k{}'.format(i).encode()) == 'v{}'.format(i).encode()
+    assert cache.hits > 0
+    assert cache.misses == 0
@@ -1,10 +1,11 @@
 from collections import OrderedDict
 from copy import deepcopy
 from random import randint, choice
+from threading import Event, Thread
 
 from plenum.common.util import randomString
 from state.db.persistent_db import PersistentDB
-from state.trie.pruning_trie import Trie, rlp_encode, rlp_decode
+from state.trie.pruning_trie import Trie, rlp_encode, rlp_decode, proof, RECORDING
 from storage.kv_in_memory import KeyValueStorageInMemory
 
 
@@ -393,3 +394,38 @@ def test_get_proof_and_value():
 def test_get_proof_and_value_no_key():
     node_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
     assert ([], None) == node_trie.produce_spv_proof(b"unknown_key", get_value=True)
+
+
+def test_proof_recording_does_not_affect_other_threads():
+    node_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    client_trie = Trie(PersistentDB(KeyValueStorageInMemory()))
+    test_data = gen_test_data(100)
+    for k, v in test_data.items():
+        node_trie.update(k, v)
+    key = choice(list(test_data))
+    root_hash = node_trie.root_hash
+
+    # The thread recording a proof waits while another thread reads the trie
+    recording = Event()
+    read = Event()
+
+    def read_trie():
+        recording.wait(5)
+        for k in test_data:
+            node_trie.get(k)
+        read.set()
+
+    reader = Thread(target=read_trie)
+    reader.start()
+    proof.push(RECORDING)
+    recording.set()
+    read.wait(5)
+    node_trie.get(key)
+    p = proof.get_nodelist()
+    proof.pop()
+    reader.join()
+
+    # Only the nodes on the path to the key are in the proof
+    assert len(p) < len(test_data)
+    p.append(node_trie.root_node)
+    assert client_trie.verify_spv_proof(root_hash, key, test_data[key], p)
@@ -0,0 +1,176 @@
+import time
+
+import pytest
+
+from plenum.test.perf_helper import print_perf_result
+from state.pruning_state import PruningState
+from state.trie.trie_pruner import NODE_KEY_LENGTH
+from storage.kv_in_memory import KeyValueStorageInMemory
+from storage.kv_store_leveldb import KeyValueStorageLeveldb
+
+
+def update_state(state, batches, keys_per_batch, offset=0):
+    roots = []
+    for b in range(batches):
+        for k in range(keys_per_batch):
+            state.set('key{}'.format(k).encode(), 'value{}_{}'.format(offset + b, k).encode())
+        state.commit(state.headHash)
+        roots.append(state.committedHeadHash)
+    return roots
+
+
+def node_keys(kv):
+    return [bytes(k) for k in kv.iterator(include_value=False) if len(k) == NODE_KEY_LENGTH]
+
+
+def check_state_at(state, root, batch, keys_per_batch):
+    for k in range(keys_per_batch):
+        assert state.get_for_root_hash(root, 'key{}'.format(k).encode()) == \
+            'value{}_{}'.format(batch, k).encode()
+
+
+@pytest.fixture()
+def kv():
+    return KeyValueStorageInMemory()
+
+
+def test_pruner_removes_nodes_of_not_retained_roots(kv):
+    state = PruningState(kv)
+    roots = update_state(state, batches=10, keys_per_batch=20)
+    retained = roots[-3:]
+    pruner = state.create_pruner(lambda: retained)
+
+    nodes_before = len(node_keys(kv))
+    pruned = pruner.run_cycle()
+    assert pruned > 0
+    assert pruner.pruned_count == pruned
+    assert len(node_keys(kv)) == nodes_before - pruned
+
+    for batch, root in enumerate(roots[-3:], start=7):
+        check_state_at(state, root, batch, 20)
+    with pytest.raises(KeyError):
+        check_state_at(state, roots[0], 0, 20)
+
+    # nothing is left to prune
+    assert pruner.run_cycle() == 0
+
+
+def test_committed_head_is_always_retained(kv):
+    state = PruningState(kv)
+    update_state(state, batches=5, keys_per_batch=10)
+    pruner = state.create_pruner(lambda: [])
+
+    assert pruner.run_cycle() > 0
+    check_state_at(state, state.committedHeadHash, 4, 10)
+    assert state.get(b'key0') == b'value4_0'
+
+
+def test_uncommitted_state_is_not_affected(kv):
+    state = PruningState(kv)
+    update_state(state, batches=5, keys_per_batch=10)
+    state.set(b'key0', b'uncommitted')
+    pruner = state.create_pruner(lambda: [])
+
+    pruner.run_cycle()
+    assert state.get(b'key0', isCommitted=False) == b'uncommitted'
+    state.commit(state.headHash)
+    assert state.get(b'key0') == b'uncommitted'
+    assert state.get(b'key9') == b'value4_9'
+
+
+def test_pruner_does_nothing_without_new_nodes(kv):
+    state = PruningState(kv)
+    update_state(state, batches=5, keys_per_batch=10)
+    pruner = state.create_pruner(lambda: [])
+
+    pruner.run(1000000)
+    assert not pruner.in_progress
+    assert pruner.cycles_count == 1
+    assert pruner.run(1000000) == 0
+    assert pruner.cycles_count == 1
+
+    update_state(state, batches=1, keys_per_batch=10, offset=5)
+    assert pruner.run(1000000) > 0
+    assert pruner.cycles_count == 2
+
+
+def test_nodes_committed_during_cycle_are_not_pruned(kv):
+    state = PruningState(kv)
+    update_state(state, batches=5, keys_per_batch=50)
+    pruner = state.create_pruner(lambda: [])
+
+    # do a part of the cycle
+    pruner.run(10)
+    assert pruner.in_progress
+
+    update_state(state, batches=3, keys_per_batch=50, offset=5)
+    while pruner.in_progress:
+        pruner.run(10)
+    check_state_at(state, state.committedHeadHash, 7, 50)
+    assert pruner.cycles_count == 1
+
+    # new cycle prunes the nodes which became garbage during the previous one
+    assert pruner.run_cycle() > 0
+    check_state_at(state, state.committedHeadHash, 7, 50)
+
+
+def test_pruning_reduces_disk_usage_and_keeps_read_latency(tempdir, capsys):
+    batches, keys_per_batch, retained_batches = 100, 30, 10
+    kv = KeyValueStorageLeveldb(tempdir, 'pruning_state')
+    state = PruningState(kv)
+    roots = update_state(state, batches, keys_per_batch)
+    pruner = state.create_pruner(lambda: roots[-retained_batches:])
+
+    def disk_usage():
+        keys = node_keys(kv)
+        return len(keys), sum(len(kv.get(k)) for k in keys)
+
+    def read():
+        """
+        Returns time of reading all the keys and the number of storage
+        lookups made by the reads
+        """
+        lookups = 0
+        kv_get = kv.get
+
+        def counting_get(key):
+            nonlocal lookups
+            lookups += 1
+            return kv_get(key)
+
+        kv.get = counting_get
+        start = time.perf_counter()
+        for k in range(keys_per_batch):
+            state.get('key{}'.format(k).encode())
+        spent = time.perf_counter() - start
+        del kv.get
+        return spent, lookups
+
+    nodes_before, bytes_before = disk_usage()
+    read_time_before, read_lookups_before = read()
+
+    step_times = []
+    while True:
+        start = time.perf_counter()
+        pruner.run(500)
+        step_times.append(time.perf_counter() - start)
+        if not pruner.in_progress:
+            break
+
+    nodes_after, bytes_after = disk_usage()
+    read_time_after, read_lookups_after = read()
+    print_perf_result(capsys,
+                      "Trie nodes: {} -> {}, bytes: {} -> {}\n"
+                      "Read of {} keys: {:.6f}s -> {:.6f}s, {} pruning steps, longest one {:.6f}s".
+                      format(nodes_before, nodes_after, bytes_before, bytes_after,
+                             keys_per_batch, read_time_before, read_time_after, len(step_times), max(step_times)))
+
+    # Reads go through the same trie nodes, so their latency is kept
+    assert read_lookups_before > 0
+    assert read_lookups_after == read_lookups_before
+    assert nodes_after < nodes_before / 5
+    assert bytes_after < bytes_before / 5
+    assert len(step_times) > 1
+    for batch in range(batches - retained_batches, batches):
+        check_state_at(state, roots[batch], batch, keys_per_batch)
+    kv.close()
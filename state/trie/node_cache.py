@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+
+def _copy_node(node):
+    return [_copy_node(item) if isinstance(item, list) else item for item in node]
+
+
+class TrieNodeCache:
+    """
+    LRU cache of decoded trie nodes keyed by node hash. The cache is limited
+    by the approximate memory taken by the nodes rather than by their number.
+    Nodes are content-addressed, so a cached node never gets stale and the
+    cache does not need any invalidation.
+    The cache can be shared by threads reading the state concurrently.
+    """
+
+    # Rough estimate of memory taken by a cached node in addition to its encoded size
+    ENTRY_OVERHEAD = 200
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._nodes = OrderedDict()  # node hash -> (decoded node, size)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def get(self, key: bytes) -> Optional[list]:
+        """
+        :return: copy of the cached node (callers are free to modify it) or None
+        """
+        key = bytes(key)
+        with self._lock:
+            entry = self._nodes.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._nodes.move_to_end(key)
+            self.hits += 1
+        return _copy_node(entry[0])
+
+    def put(self, key: bytes, node: list, encoded_size: int):
+        key = bytes(key)
+        size = encoded_size + self.ENTRY_OVERHEAD
+        if size > self.max_size:
+            return
+        node = _copy_node(node)
+        with self._lock:
+            if key in self._nodes:
+                self._nodes.move_to_end(key)
+                return
+            self._nodes[key] = (node, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._nodes.popitem(last=False)
+                self.size -= evicted_size
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._nodes.clear()
+            self.size = 0
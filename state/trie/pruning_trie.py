@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import copy
+import threading
 
 from common.exceptions import PlenumTypeError, PlenumValueError
 
@@ -53,19 +54,22 @@ NONE = 0
 VERIFYING = -1
 ZERO_ENCODED = encode_int(0)
 
-proving = False
-
-
-class ProofConstructor:
+class ProofConstructor(threading.local):
+    """
+    Nodes of the proofs being produced or verified. Proofs made by a thread
+    are kept apart from the ones of other threads.
+    """
 
     def __init__(self):
         self.mode = []
         self.nodes = []
         self.exempt = []
 
+    @property
+    def proving(self):
+        return bool(self.mode)
+
     def push(self, mode, nodes=None):
-        global proving
-        proving = True
         self.mode.append(mode)
         self.exempt.append(set())
         if mode == VERIFYING:
@@ -75,12 +79,9 @@ class ProofConstructor:
             self.nodes.append(set())
 
     def pop(self):
-        global proving
         self.mode.pop()
         self.nodes.pop()
         self.exempt.pop()
-        if not self.mode:
-            proving = False
 
     def get_nodelist(self):
         return list(map(rlp.decode, list(self.nodes[-1])))
@@ -215,13 +216,15 @@ def transient_trie_exception(*args):
 
 class Trie:
 
-    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False):
+    def __init__(self, db: BaseDB, root_hash=BLANK_ROOT, transient=False, node_cache=None):
         '''it also present a dictionary like interface
 
         :param db key value database
         :root: blank or trie node in form of [key, value] or [v0,v1..v15,v]
+        :param node_cache: optional TrieNodeCache of decoded nodes
         '''
         self._db = db  # Pass in a database object directly
+        self._node_cache = node_cache
         self.transient = transient
         if self.transient:
             self.update = self.get = self.delete = transient_trie_exception
@@ -232,8 +235,7 @@ class Trie:
 
     # For SPV proof production/verification purposes
     def spv_grabbing(self, node):
-        global proving
-        if not proving:
+        if not proof.proving:
             pass
         elif proof.get_mode() == RECORDING:
             proof.add_node(copy.copy(node))
@@ -244,8 +246,7 @@ class Trie:
                 raise InvalidSPVProof("Proof invalid!")
 
     def spv_storing(self, node):
-        global proving
-        if not proving:
+        if not proof.proving:
             pass
         elif proof.get_mode() == RECORDING:
             proof.add_exempt(copy.copy(node))
@@ -349,7 +350,14 @@ class Trie:
             return BLANK_NODE
         if isinstance(encoded, list):
             return encoded
-        o = rlp.decode(self._db.get(encoded))
+        if self._node_cache is None:
+            o = rlp.decode(self._db.get(encoded))
+        else:
+            o = self._node_cache.get(encoded)
+            if o is None:
+                rlpnode = self._db.get(encoded)
+                o = rlp.decode(rlpnode)
+                self._node_cache.put(encoded, o, len(rlpnode))
         self.spv_grabbing(o)
         return o
 
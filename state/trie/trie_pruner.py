@@ -0,0 +1,144 @@
+from typing import Callable, Iterable, Iterator
+
+from state.util.fast_rlp import decode_optimized as rlp_decode
+from storage.kv_store import KeyValueStorage
+from stp_core.common.log import getlogger
+
+logger = getlogger()
+
+NODE_KEY_LENGTH = 32
+
+
+class TriePruner:
+    """
+    Incremental mark-and-sweep garbage collector of trie nodes which are not
+    reachable from any of the retained roots.
+    A pruning cycle first marks all the nodes reachable from the retained
+    roots and then removes all the other nodes from the storage. Each call of
+    `run` does a limited amount of work, so that a cycle can be spread over
+    many looper iterations without blocking anything else.
+    Nodes written to the storage while a cycle is in progress are never
+    removed by this cycle.
+    """
+
+    IDLE = 0
+    MARKING = 1
+    SWEEPING = 2
+
+    def __init__(self, keyValueStorage: KeyValueStorage,
+                 get_retained_roots: Callable[[], Iterable[bytes]]):
+        self._kv = keyValueStorage
+        self._get_retained_roots = get_retained_roots
+        self._phase = self.IDLE
+        self._has_new_nodes = True
+        self._marked = set()
+        self._to_mark = []
+        self._to_sweep = None  # type: Iterator[bytes]
+        self.pruned_count = 0
+        self.cycles_count = 0
+
+    @property
+    def in_progress(self) -> bool:
+        return self._phase != self.IDLE
+
+    def on_nodes_written(self, keys: Iterable[bytes]):
+        self._has_new_nodes = True
+        if self._phase != self.IDLE:
+            self._marked.update(bytes(key) for key in keys)
+
+    def run(self, budget: int) -> int:
+        """
+        Continue the current pruning cycle (or start a new one if there are
+        new nodes since the last cycle) visiting at most `budget` nodes
+
+        :return: number of nodes removed from the storage
+        """
+        if self._phase == self.IDLE:
+            if not self._has_new_nodes:
+                return 0
+            self._start_cycle()
+
+        pruned = 0
+        while budget > 0 and self._phase != self.IDLE:
+            if self._phase == self.MARKING:
+                budget -= self._mark(budget)
+            else:
+                visited, removed = self._sweep(budget)
+                budget -= visited
+                pruned += removed
+        return pruned
+
+    def run_cycle(self) -> int:
+        """
+        Run a whole pruning cycle at once
+
+        :return: number of nodes removed from the storage
+        """
+        self._has_new_nodes = True
+        pruned = self.run(1)
+        while self.in_progress:
+            pruned += self.run(1000)
+        return pruned
+
+    def _start_cycle(self):
+        self._has_new_nodes = False
+        self._marked = set()
+        self._to_mark = [bytes(root) for root in self._get_retained_roots()]
+        self._phase = self.MARKING
+        logger.debug("{} started pruning cycle with {} retained roots".format(self, len(self._to_mark)))
+
+    def _mark(self, budget: int) -> int:
+        visited = 0
+        while self._to_mark and visited < budget:
+            key = self._to_mark.pop()
+            if key in self._marked:
+                continue
+            visited += 1
+            try:
+                node = self._kv.get(key)
+            except KeyError:
+                continue
+            self._marked.add(key)
+            self._push_children(rlp_decode(node))
+
+        if not self._to_mark:
+            keys = self._kv.iterator(include_value=False)
+            # Views of in-memory containers must not be iterated while the container changes
+            self._to_sweep = keys if isinstance(keys, Iterator) else iter(list(keys))
+            self._phase = self.SWEEPING
+        return max(visited, 1)
+
+    def _push_children(self, node):
+        for item in node:
+            if isinstance(item, list):
+                # embedded node
+                self._push_children(item)
+            elif len(item) == NODE_KEY_LENGTH:
+                # may be a leaf value as well, which is fine since it's not in the storage
+                self._to_mark.append(bytes(item))
+
+    def _sweep(self, budget: int) -> (int, int):
+        visited = 0
+        garbage = []
+        for key in self._to_sweep:
+            key = bytes(key)
+            visited += 1
+            if len(key) == NODE_KEY_LENGTH and key not in self._marked:
+                garbage.append(key)
+            if visited >= budget:
+                break
+        else:
+            self._finish_cycle()
+
+        if garbage:
+            self._kv.do_ops_in_batch([(KeyValueStorage.REMOVE_OP, key, None) for key in garbage])
+            self.pruned_count += len(garbage)
+        return max(visited, 1), len(garbage)
+
+    def _finish_cycle(self):
+        logger.debug("{} finished pruning cycle, {} nodes retained, {} nodes pruned in total".
+                     format(self, len(self._marked), self.pruned_count))
+        self._phase = self.IDLE
+        self._marked = set()
+        self._to_sweep = None
+        self.cycles_count += 1
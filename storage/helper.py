@@ -62,10 +62,16 @@ def initKeyValueStorageIntKeys(keyValueType, dataLocation, keyValueStorageName,
                                open=True, read_only=False, db_config=None, txn_serializer=None) -> KeyValueStorage:
     from storage.kv_store_leveldb_int_keys import KeyValueStorageLeveldbIntKeys
     from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
+    from storage.kv_store_rocksdb_fixed_width_int_keys import KeyValueStorageRocksdbFixedWidthIntKeys, \
+        uses_integer_comparator
     if keyValueType == KeyValueStorageType.Leveldb:
         return KeyValueStorageLeveldbIntKeys(dataLocation, keyValueStorageName, open, read_only)
     if keyValueType == KeyValueStorageType.Rocksdb:
-        return KeyValueStorageRocksdbIntKeys(dataLocation, keyValueStorageName, open, read_only, db_config)
+        if uses_integer_comparator(os.path.join(dataLocation, keyValueStorageName)):
+            # Stores created before keys were kept as fixed width integers
+            # are used as they are until migrated with migrate_rocksdb_int_keys
+            return KeyValueStorageRocksdbIntKeys(dataLocation, keyValueStorageName, open, read_only, db_config)
+        return KeyValueStorageRocksdbFixedWidthIntKeys(dataLocation, keyValueStorageName, open, read_only, db_config)
     return initKeyValueStorage(keyValueType, dataLocation, keyValueStorageName, open, read_only, db_config, txn_serializer)
 
 
@@ -0,0 +1,219 @@
+import glob
+import os
+import shutil
+import struct
+from typing import Iterable, Tuple, Optional
+
+from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+
+try:
+    import rocksdb
+except ImportError:
+    print('Cannot import rocksdb, please install')
+
+BYTEWISE_COMPARATOR = 'leveldb.BytewiseComparator'
+
+# Suffixes of directories made while migrating a store created with
+# IntegerComparator
+MIGRATING_SUFFIX = '.migrating'
+BACKUP_SUFFIX = '.int_comparator_backup'
+
+# Keys are 64 bit signed integers shifted to be unsigned, so big-endian bytes
+# of them are ordered as the integers are
+_key_struct = struct.Struct('>Q')
+_KEY_OFFSET = 1 << 63
+
+
+def encode_int_key(key) -> bytes:
+    """
+    :param key: integer or its decimal representation as str or bytes
+    """
+    try:
+        return _key_struct.pack(int(key) + _KEY_OFFSET)
+    except struct.error:
+        raise ValueError('key {} does not fit into 64 bit signed integer'.format(key))
+
+
+def decode_int_key(key: bytes) -> bytes:
+    """
+    :return: decimal representation of the key like in stores with
+    IntegerComparator
+    """
+    value, = _key_struct.unpack(key)
+    return str(value - _KEY_OFFSET).encode()
+
+
+def rocksdb_comparator_name(db_path: str) -> Optional[str]:
+    """
+    Returns name of the comparator of the existing RocksDB database as
+    recorded in its latest OPTIONS file or None if there is no such file
+    """
+    options_files = glob.glob(os.path.join(db_path, 'OPTIONS-*'))
+    if not options_files:
+        return None
+    latest = max(options_files, key=lambda path: int(path.rsplit('-', 1)[1]))
+    with open(latest) as options:
+        for line in options:
+            name, _, value = line.strip().partition('=')
+            if name == 'comparator':
+                return value
+    return None
+
+
+def uses_integer_comparator(db_path: str) -> bool:
+    """
+    Whether the existing RocksDB database orders keys with the Python
+    IntegerComparator. Databases without OPTIONS files are considered
+    created with it since all of them used to be.
+    """
+    if not os.path.exists(os.path.join(db_path, 'CURRENT')):
+        return False
+    return rocksdb_comparator_name(db_path) != BYTEWISE_COMPARATOR
+
+
+class KeyValueStorageRocksdbFixedWidthIntKeys(KeyValueStorageRocksdb):
+    """
+    RocksDB store with integer keys kept as fixed width big-endian bytes, so
+    they are ordered by the built-in bytewise comparator of RocksDB rather
+    than by a comparator calling back into Python. Keys are accepted and
+    returned in the same decimal representation as by
+    KeyValueStorageRocksdbIntKeys, they must fit into 64 bit signed integers.
+    """
+
+    def open(self):
+        if uses_integer_comparator(self._db_path):
+            raise RuntimeError('{} was created with IntegerComparator, it has to be migrated '
+                               'with migrate_rocksdb_int_keys first'.format(self._db_path))
+        super().open()
+
+    def put(self, key, value):
+        self._db.put(encode_int_key(key), self.to_byte_repr(value))
+
+    def get(self, key):
+        vv = self._db.get(encode_int_key(key))
+        if vv is None:
+            raise KeyError
+        return vv
+
+    def remove(self, key):
+        self._db.delete(encode_int_key(key))
+
+    def setBatch(self, batch: Iterable[Tuple]):
+        b = rocksdb.WriteBatch()
+        for key, value in batch:
+            b.put(encode_int_key(key), self.to_byte_repr(value))
+        self._db.write(b, sync=False)
+
+    def do_ops_in_batch(self, batch: Iterable[Tuple], is_committed=False):
+        b = rocksdb.WriteBatch()
+        for op, key, value in batch:
+            key = encode_int_key(key)
+            if op == self.WRITE_OP:
+                b.put(key, self.to_byte_repr(value))
+            elif op == self.REMOVE_OP:
+                b.delete(key)
+            else:
+                raise ValueError('Unknown operation')
+        self._db.write(b, sync=False)
+
+    def has_key(self, key):
+        return self._db.key_may_exist(encode_int_key(key))[0]
+
+    def iterator(self, start=None, end=None, include_key=True, include_value=True, prefix=None):
+        if not include_value:
+            itr = self._db.iterkeys()
+        else:
+            itr = self._db.iteritems()
+
+        if start is not None:
+            itr.seek(encode_int_key(start))
+        else:
+            itr.seek_to_first()
+
+        end = encode_int_key(end) if end is not None else None
+        if not include_value:
+            return self._keys(itr, end)
+        return self._items(itr, end)
+
+    @staticmethod
+    def _keys(itr, end):
+        for key in itr:
+            if end is not None and key > end:
+                return
+            yield decode_int_key(key)
+
+    @staticmethod
+    def _items(itr, end):
+        for key, value in itr:
+            if end is not None and key > end:
+                return
+            yield decode_int_key(key), value
+
+    def get_equal_or_prev(self, key):
+        # return value can be:
+        #    None, if required key less then minimal key from DB
+        #    Equal by key if key exist in DB
+        #    Previous if key does not exist in Db, but there is key less than required
+        itr = self._db.itervalues()
+        itr.seek_for_prev(encode_int_key(key))
+        try:
+            value = next(itr)
+        except StopIteration:
+            value = None
+        return value
+
+    def get_last_key(self):
+        itr = self._db.iterkeys()
+        itr.seek_to_last()
+        try:
+            key = next(itr)
+        except StopIteration:
+            return None
+        return decode_int_key(key)
+
+
+def migrate_from_integer_comparator(db_path: str, db_config=None,
+                                    batch_size: int = 10000, keep_backup: bool = True) -> int:
+    """
+    Rewrites a store created with IntegerComparator into a store with fixed
+    width keys at the same path. Nothing else may use the store meanwhile.
+    The old store is kept next to the new one with BACKUP_SUFFIX unless
+    `keep_backup` is False.
+
+    :return: number of migrated records
+    """
+    from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
+
+    db_path = os.path.normpath(db_path)
+    if not uses_integer_comparator(db_path):
+        raise ValueError('{} is not a store created with IntegerComparator'.format(db_path))
+    db_dir, db_name = os.path.split(db_path)
+    migrating_path = db_path + MIGRATING_SUFFIX
+    if os.path.exists(migrating_path):
+        # Left by an interrupted migration
+        shutil.rmtree(migrating_path)
+
+    old = KeyValueStorageRocksdbIntKeys(db_dir, db_name, read_only=True, db_config=db_config)
+    new = KeyValueStorageRocksdbFixedWidthIntKeys(db_dir, db_name + MIGRATING_SUFFIX, db_config=db_config)
+    count = 0
+    try:
+        batch = []
+        for key, value in old.iterator():
+            batch.append((key, value))
+            if len(batch) == batch_size:
+                new.setBatch(batch)
+                count += len(batch)
+                batch = []
+        new.setBatch(batch)
+        count += len(batch)
+    finally:
+        old.close()
+        new.close()
+
+    # The old store is not touched until the new one is complete
+    if keep_backup:
+        os.rename(db_path, db_path + BACKUP_SUFFIX)
+    else:
+        shutil.rmtree(db_path)
+    os.rename(migrating_path, db_path)
+    return count
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from plenum.common.constants import KeyValueStorageType
+from storage.helper import initKeyValueStorageIntKeys
+from storage.kv_store_rocksdb_fixed_width_int_keys import KeyValueStorageRocksdbFixedWidthIntKeys, \
+    encode_int_key, decode_int_key, rocksdb_comparator_name, uses_integer_comparator, \
+    migrate_from_integer_comparator, BYTEWISE_COMPARATOR, BACKUP_SUFFIX
+from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
+
+
+def create_old_store(db_dir, db_name, count):
+    db = KeyValueStorageRocksdbIntKeys(db_dir, db_name)
+    db.setBatch([(str(i), 'value{}'.format(i)) for i in range(1, count + 1)])
+    db.close()
+
+
+def test_encoded_keys_are_ordered_as_integers():
+    keys = [-2 ** 63, -100, -1, 0, 1, 9, 10, 255, 256, 2 ** 32, 2 ** 63 - 1]
+    encoded = [encode_int_key(k) for k in keys]
+    assert all(len(k) == 8 for k in encoded)
+    assert sorted(encoded) == encoded
+    assert [decode_int_key(k) for k in encoded] == [str(k).encode() for k in keys]
+    assert encode_int_key('10') == encode_int_key(b'10') == encode_int_key(10)
+    with pytest.raises(ValueError):
+        encode_int_key(2 ** 63)
+
+
+def test_iterator_bounds(tempdir):
+    db = KeyValueStorageRocksdbFixedWidthIntKeys(tempdir, 'kv')
+    db.setBatch([(str(i), str(i)) for i in range(1, 200, 2)])
+
+    assert [int(k) for k, _ in db.iterator(start=10, end=20)] == [11, 13, 15, 17, 19]
+    assert [int(k) for k in db.iterator(start='190', include_value=False)] == [191, 193, 195, 197, 199]
+    assert list(db.iterator(start=300)) == []
+    assert db.get_last_key() == b'199'
+    assert db.get_equal_or_prev(100) == b'99'
+    db.close()
+
+
+def test_store_created_by_helper_uses_native_comparator(tempdir):
+    db = initKeyValueStorageIntKeys(KeyValueStorageType.Rocksdb, tempdir, 'kv')
+    assert isinstance(db, KeyValueStorageRocksdbFixedWidthIntKeys)
+    db.put('1', 'a')
+    db.close()
+    assert rocksdb_comparator_name(os.path.join(tempdir, 'kv')) == BYTEWISE_COMPARATOR
+
+
+def test_helper_keeps_using_stores_with_integer_comparator(tempdir):
+    create_old_store(tempdir, 'kv', 10)
+
+    db = initKeyValueStorageIntKeys(KeyValueStorageType.Rocksdb, tempdir, 'kv')
+    assert isinstance(db, KeyValueStorageRocksdbIntKeys)
+    assert db.get('10') == b'value10'
+    db.close()
+
+    # Opening it with bytewise comparator would mess up the order of keys
+    with pytest.raises(RuntimeError):
+        KeyValueStorageRocksdbFixedWidthIntKeys(tempdir, 'kv')
+
+
+@pytest.mark.parametrize('keep_backup', [True, False])
+def test_migrate_from_integer_comparator(tempdir, keep_backup):
+    create_old_store(tempdir, 'kv', 2500)
+    db_path = os.path.join(tempdir, 'kv')
+    assert uses_integer_comparator(db_path)
+
+    assert migrate_from_integer_comparator(db_path, batch_size=1000, keep_backup=keep_backup) == 2500
+
+    assert not uses_integer_comparator(db_path)
+    assert os.path.exists(db_path + BACKUP_SUFFIX) == keep_backup
+    assert sorted(os.listdir(tempdir)) == (['kv', 'kv' + BACKUP_SUFFIX] if keep_backup else ['kv'])
+    db = initKeyValueStorageIntKeys(KeyValueStorageType.Rocksdb, tempdir, 'kv')
+    assert isinstance(db, KeyValueStorageRocksdbFixedWidthIntKeys)
+    assert [(int(k), v) for k, v in db.iterator()] == \
+        [(i, 'value{}'.format(i).encode()) for i in range(1, 2501)]
+    db.close()
+
+    with pytest.raises(ValueError):
+        migrate_from_integer_comparator(db_path)
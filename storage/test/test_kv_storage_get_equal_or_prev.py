@@ -1,13 +1,17 @@
 import pytest
 from storage.kv_store_leveldb_int_keys import KeyValueStorageLeveldbIntKeys
+from storage.kv_store_rocksdb_fixed_width_int_keys import KeyValueStorageRocksdbFixedWidthIntKeys
 from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
 
 
-@pytest.fixture(scope="module", params=['rocksdb', 'leveldb'])
+@pytest.fixture(scope="module", params=['rocksdb', 'leveldb', 'rocksdb_fixed_width'])
 def storage_with_ts_root_hashes(request, tmpdir_factory):
     if request.param == 'leveldb':
         storage = KeyValueStorageLeveldbIntKeys(tmpdir_factory.mktemp('').strpath,
                                                 "test_db")
+    elif request.param == 'rocksdb_fixed_width':
+        storage = KeyValueStorageRocksdbFixedWidthIntKeys(tmpdir_factory.mktemp('').strpath,
+                                                          "test_db")
     else:
         storage = KeyValueStorageRocksdbIntKeys(tmpdir_factory.mktemp('').strpath,
                                                 "test_db")
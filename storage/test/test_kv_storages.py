@@ -142,3 +142,15 @@ def test_batch_bytes(kv):
 
     for i in range(5):
         assert 'v'.format(i).encode() == kv.get('k'.format(i))
+
+
+def test_do_ops_in_batch(kv):
+    kv.put('k0', 'v0')
+    batch = [(KeyValueStorage.WRITE_OP, 'k{}'.format(i), 'v{}'.format(i))
+             for i in range(1, 5)]
+    batch.append((KeyValueStorage.REMOVE_OP, 'k0', None))
+    kv.do_ops_in_batch(batch)
+
+    assert 'k0' not in kv
+    for i in range(1, 5):
+        assert 'v{}'.format(i).encode() == kv.get('k{}'.format(i))
@@ -5,16 +5,19 @@ import pytest
 from storage.kv_store_leveldb import KeyValueStorageLeveldb
 from storage.kv_store_leveldb_int_keys import KeyValueStorageLeveldbIntKeys
 from storage.kv_store_rocksdb import KeyValueStorageRocksdb
+from storage.kv_store_rocksdb_fixed_width_int_keys import KeyValueStorageRocksdbFixedWidthIntKeys
 from storage.kv_store_rocksdb_int_keys import KeyValueStorageRocksdbIntKeys
 
 db_no = 0
 
 
-@pytest.yield_fixture(params=['rocksdb', 'leveldb'])
+@pytest.yield_fixture(params=['rocksdb', 'leveldb', 'rocksdb_fixed_width'])
 def db_with_int_comparator(request, tempdir) -> KeyValueStorageLeveldb:
     global db_no
     if request.param == 'leveldb':
         db = KeyValueStorageLeveldbIntKeys(tempdir, 'kv{}'.format(db_no))
+    elif request.param == 'rocksdb_fixed_width':
+        db = KeyValueStorageRocksdbFixedWidthIntKeys(tempdir, 'kv{}'.format(db_no))
     else:
         db = KeyValueStorageRocksdbIntKeys(tempdir, 'kv{}'.format(db_no))
     db_no += 1
@@ -156,6 +159,12 @@ def test_large_integer_keys(db_with_int_comparator):
     k3 = b'1157920892373161954235709850086879078532699846656405640394575840079131296398450'
     k4 = b'2157920892373161954235709850086879078532699846656405640394575840079131296398550'
 
+    if isinstance(db, KeyValueStorageRocksdbFixedWidthIntKeys):
+        # Keys of this store have to fit into 64 bits
+        with pytest.raises(ValueError):
+            db.put(k3, '1')
+        return
+
     db.put(k3, '1')
     db.put(k4, '2')
     assert db.get(k3) == bytearray(b'1')
@@ -3,6 +3,8 @@ import logging
 import os
 import sys
 import time
+from typing import Callable
+
 from stp_core.common.logging.CompressingFileHandler import CompressingFileHandler
 from stp_core.common.util import Singleton
 from stp_core.common.logging.handlers import CliHandler
@@ -14,6 +16,43 @@ DISPLAY_LOG_LEVEL = 25
 # TODO: move it to plenum-utils
 
 
+class LazyArg:
+    """
+    Argument of a log record which is computed only when the record is
+    emitted. Together with %-style arguments it makes logging on hot paths
+    cost nothing but a level check when the level is disabled:
+
+        logger.debug("%s got %s from %s", self, msg, lazy(z85_to_friendly, ident))
+    """
+    __slots__ = ('_func', '_args', '_value')
+
+    _NOT_COMPUTED = object()
+
+    def __init__(self, func: Callable, *args):
+        self._func = func
+        self._args = args
+        self._value = self._NOT_COMPUTED
+
+    def _get_value(self):
+        # A record is formatted by each of the handlers
+        if self._value is self._NOT_COMPUTED:
+            self._value = self._func(*self._args)
+        return self._value
+
+    def __str__(self):
+        return str(self._get_value())
+
+    def __repr__(self):
+        return repr(self._get_value())
+
+
+def lazy(func: Callable, *args) -> LazyArg:
+    """
+    Defer calling `func` with `args` till the log record is emitted
+    """
+    return LazyArg(func, *args)
+
+
 class CustomAdapter(logging.LoggerAdapter):
     def trace(self, msg, *args, **kwargs):
         self.log(TRACE_LOG_LEVEL, msg, *args, **kwargs)
@@ -56,8 +56,24 @@ REMOVE_CLIENT_MSG_TIMEOUT = 60 * 5
 PINGS_BEFORE_SOCKET_RECONNECTION = 3
 PING_RECONNECT_ENABLED = False
 
+# Send node-to-node messages in msgpack instead of JSON to the remotes which
+# advertise its support in their pings and pongs
+ENABLE_BINARY_CODEC = False
+
+# Messages from a socket are received without copying them out of zmq frames
+# once the socket delivered a message of at least this many bytes, copying
+# small messages is cheaper than wrapping their frames
+ZMQ_ZERO_COPY_RECV_THRESHOLD = 64 * 1024
+
 MAX_WAIT_FOR_BIND_SUCCESS = 120  # seconds
 
 RETRY_CONNECT = False
 RETRY_SOCKET_RECONNECT = False
 NEW_CTXT_INSTANCE = False
+
+# Looper waits until sockets of idle prodables become readable or their
+# timers are due instead of prodding them every 10 ms
+LOOPER_EVENT_DRIVEN = False
+# Maximum time in seconds the looper waits for events, prodables can have
+# periodic checks not driven by timers
+LOOPER_MAX_IDLE_WAIT = 0.1
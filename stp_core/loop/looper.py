@@ -5,9 +5,10 @@ import signal
 import sys
 import time
 from asyncio.coroutines import CoroWrapper
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # import uvloop
+from stp_core.common.config.util import getConfig
 from stp_core.common.log import getlogger
 from stp_core.common.util import lxor
 from stp_core.loop.exceptions import ProdableAlreadyAdded
@@ -15,6 +16,10 @@ from stp_core.loop.startable import Status
 
 logger = getlogger()
 
+# Reasons of the looper waking up when it waits for events
+WAKEUP_IO = 'io'
+WAKEUP_TIMER = 'timer'
+
 # TODO: move it to plenum-util repo
 
 
@@ -60,17 +65,49 @@ class Prodable:
         raise NotImplementedError("subclass {} should implement this method"
                                   .format(self))
 
+    def wakeup_sources(self) -> Iterable:
+        """
+        Objects having `fileno` (like ZMQ sockets) which become readable when
+        the Prodable receives something, so the looper waiting for events
+        wakes up to prod it. The readiness can be edge-triggered, the
+        Prodable reports already received input in `time_to_next_event`.
+        """
+        return ()
+
+    def time_to_next_event(self) -> Optional[float]:
+        """
+        Time in seconds after which the Prodable has something to do even if
+        nothing is received, 0 if it has something to do right now or None
+        if it has to be prodded regularly.
+        """
+        return None
+
+    def on_wakeup(self, reason: str, latency: float):
+        """
+        Called when the looper waiting for events wakes up.
+
+        :param reason: `WAKEUP_IO` or `WAKEUP_TIMER`
+        :param latency: time in seconds passed since the event the looper
+        was woken up by till the prodables are prodded
+        """
+        pass
+
 
 class Looper:
     """
     A helper class for asyncio's event_loop
     """
 
+    # Time to sleep between prodding idle prodables when not waiting for events
+    POLL_INTERVAL = 0.01
+
     def __init__(self,
                  prodables: List[Prodable]=None,
                  loop=None,
                  debug=False,
-                 autoStart=True):
+                 autoStart=True,
+                 event_driven: bool = None,
+                 config=None):
         """
         Initialize looper with an event loop.
 
@@ -78,10 +115,20 @@ class Looper:
         :param loop: the event loop to use
         :param debug: set_debug on event loop will be set to this value
         :param autoStart: start immediately?
+        :param event_driven: wait for events of the prodables instead of
+        sleeping when they are idle, `LOOPER_EVENT_DRIVEN` config by default
         """
         self.prodables = list(prodables) if prodables is not None \
             else []  # type: List[Prodable]
 
+        self.config = config or getConfig()
+        self.event_driven = self.config.LOOPER_EVENT_DRIVEN \
+            if event_driven is None else event_driven
+        self._readers = {}  # type: Dict[Any, int]
+        self._reader_sources = None  # type: Optional[List[Iterable]]
+        self._wakeup_fut = None  # type: Optional[asyncio.Future]
+        self._wakeup = None  # type: Optional[Tuple[str, float]]
+
         # if sys.platform == 'linux':
         #     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
@@ -207,15 +254,91 @@ class Looper:
         can complete their other asynchronous tasks not running on the event-loop.
         """
         start = time.perf_counter()
+        if self._wakeup is not None:
+            self._report_wakeup(start)
         msgsProcessed = await self.prodAllOnce()
         if msgsProcessed == 0:
             # if no let other stuff run
-            await asyncio.sleep(0.01, loop=self.loop)
+            if self.event_driven:
+                await self.wait_for_events()
+            else:
+                await asyncio.sleep(self.POLL_INTERVAL, loop=self.loop)
         dur = time.perf_counter() - start
         if dur >= 15:
             logger.info("it took {:.3f} seconds to run once nicely".
                         format(dur), extra={"cli": False})
 
+    async def wait_for_events(self):
+        """
+        Wait until some prodable receives something or has something to do,
+        but not longer than `LOOPER_MAX_IDLE_WAIT` seconds. Prodables which
+        do not tell when they have something to do are prodded every
+        `POLL_INTERVAL` seconds.
+        """
+        self._update_readers()
+        timeout = self.config.LOOPER_MAX_IDLE_WAIT
+        reason = None
+        for p in self.prodables:
+            t = p.time_to_next_event()
+            if t is not None and t <= 0:
+                # let other stuff run
+                await asyncio.sleep(0, loop=self.loop)
+                return
+            if t is None:
+                t, r = self.POLL_INTERVAL, None
+            else:
+                r = WAKEUP_TIMER
+            if t < timeout:
+                timeout, reason = t, r
+
+        self._wakeup_fut = self.loop.create_future()
+        timer = self.loop.call_later(timeout, self._wake_up, reason,
+                                     time.perf_counter() + timeout)
+        try:
+            await self._wakeup_fut
+        finally:
+            timer.cancel()
+            self._wakeup_fut = None
+
+    def _wake_up(self, reason: Optional[str], event_time: float):
+        if self._wakeup_fut is None or self._wakeup_fut.done():
+            return
+        if reason is not None:
+            self._wakeup = (reason, event_time)
+        self._wakeup_fut.set_result(None)
+
+    def _on_readable(self):
+        self._wake_up(WAKEUP_IO, time.perf_counter())
+
+    def _update_readers(self):
+        # Readers are changed only when prodables or their sources change
+        # which happens rarely compared to waiting for events
+        prodable_sources = [p.wakeup_sources() for p in self.prodables]
+        if prodable_sources == self._reader_sources:
+            return
+        self._reader_sources = prodable_sources
+        sources = {src for srcs in prodable_sources for src in srcs}
+        for src in [src for src in self._readers if src not in sources]:
+            self.loop.remove_reader(self._readers.pop(src))
+        for src in sources:
+            if src not in self._readers:
+                fd = src.fileno()
+                self.loop.add_reader(fd, self._on_readable)
+                self._readers[src] = fd
+
+    def _remove_readers(self):
+        for fd in self._readers.values():
+            self.loop.remove_reader(fd)
+        self._readers.clear()
+        self._reader_sources = None
+
+    def _report_wakeup(self, now: float):
+        reason, event_time = self._wakeup
+        self._wakeup = None
+        latency = max(now - event_time, 0)
+        for p in self.prodables:
+            p.on_wakeup(reason, latency)
+
     def runFor(self, timeout):
         self.run(asyncio.sleep(timeout))
 
@@ -275,8 +398,11 @@ class Looper:
         logger.display("Looper shutting down now...", extra={"cli": False})
         self.running = False
         start = time.perf_counter()
+        # do not wait till the looper waiting for events wakes up on its own
+        self._wake_up(None, start)
         if not self.runFut.done():
             await self.runFut
+        self._remove_readers()
         self.stopall()
         logger.display("Looper shut down in {:.3f} seconds.".
                        format(time.perf_counter() - start), extra={"cli": False})
@@ -1,9 +1,76 @@
+import logging
+
 import pytest
 
-from stp_core.common.log import Logger
+from stp_core.common.log import Logger, lazy
+from stp_core.common.logging.handlers import TestingHandler
 
 
 def test_apply_config():
     logger = Logger()
     with pytest.raises(ValueError):
         logger.apply_config(None)
+
+
+class CountingFunc:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.result.format(*args)
+
+
+@pytest.fixture()
+def lazy_logger():
+    records = []
+    handler = TestingHandler(records.append)
+    logger = logging.getLogger('test_lazy_logging')
+    logger.addHandler(handler)
+    yield logger, records
+    logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+
+
+def test_lazy_arg_is_not_computed_when_level_is_disabled(lazy_logger):
+    logger, records = lazy_logger
+    logger.setLevel(logging.INFO)
+    func = CountingFunc('{} is expensive')
+
+    logger.debug('%s got %s', 'Alpha', lazy(func, 'msg'))
+    logger.trace('%s got %s', 'Alpha', lazy(func, 'msg'))
+
+    assert func.calls == 0
+    assert records == []
+
+
+def test_lazy_arg_is_computed_when_level_is_enabled(lazy_logger):
+    logger, records = lazy_logger
+    logger.setLevel(logging.DEBUG)
+    func = CountingFunc('{} is expensive')
+
+    logger.debug('%s got %s', 'Alpha', lazy(func, 'msg'))
+
+    assert [record.getMessage() for record in records] == ['Alpha got msg is expensive']
+    assert func.calls == 1
+
+
+def test_lazy_arg_is_computed_once_for_all_handlers(lazy_logger):
+    logger, records = lazy_logger
+    logger.setLevel(logging.DEBUG)
+    messages = []
+    handlers = [TestingHandler(lambda record: messages.append(record.getMessage())) for _ in range(3)]
+    for handler in handlers:
+        logger.addHandler(handler)
+    func = CountingFunc('{} is expensive')
+
+    try:
+        logger.debug('%s got %s', 'Alpha', lazy(func, 'msg'))
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    assert messages == ['Alpha got msg is expensive'] * 3
+    assert len(records) == 1
+    assert func.calls == 1
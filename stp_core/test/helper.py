@@ -82,6 +82,15 @@ class SMotor(Motor):
     def stop(self):
         self.stack.stop()
 
+    def wakeup_sources(self):
+        return self.stack.wakeup_sockets()
+
+    def time_to_next_event(self):
+        if isinstance(self.stack, KITNetworkInterface):
+            # connections are maintained by polling
+            return None
+        return 0 if self.stack.has_pending_input() else float('inf')
+
 
 def prepStacks(looper, *stacks, connect=True, useKeys=True):
     motors = []
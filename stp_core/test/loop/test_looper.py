@@ -1,7 +1,10 @@
+import socket
+import time
+
 import pytest
 import asyncio
 
-from stp_core.loop.looper import Looper, Prodable
+from stp_core.loop.looper import Looper, Prodable, WAKEUP_IO, WAKEUP_TIMER
 
 
 def test_hasProdable():
@@ -9,3 +12,111 @@ def test_hasProdable():
     with pytest.raises(ValueError):
         Looper().hasProdable(Prodable(), 'prodable')
     looper.shutdownSync()
+
+
+class WaitingProdable(Prodable):
+    def __init__(self, name, deadline=None):
+        self.name = name
+        self.deadline = deadline
+        self.reader, self.writer = socket.socketpair()
+        self.reader.setblocking(False)
+        self.received = []
+        self.prods = 0
+        self.wakeups = []
+
+    async def prod(self, limit=None) -> int:
+        self.prods += 1
+        try:
+            self.received.append(self.reader.recv(1024))
+        except BlockingIOError:
+            return 0
+        return 1
+
+    def start(self, loop):
+        pass
+
+    def stop(self):
+        self.reader.close()
+        self.writer.close()
+
+    def wakeup_sources(self):
+        return [self.reader]
+
+    def time_to_next_event(self):
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline - time.perf_counter()
+
+    def on_wakeup(self, reason, latency):
+        self.wakeups.append((reason, latency))
+
+
+class PollingProdable(WaitingProdable):
+    def time_to_next_event(self):
+        return None
+
+
+def run_idle(looper, seconds):
+    looper.run(asyncio.sleep(seconds))
+
+
+def test_event_driven_looper_waits_for_input():
+    prodable = WaitingProdable('waiting')
+    with Looper([prodable], event_driven=True) as looper:
+        run_idle(looper, 0.2)
+        # woken up only when the limit of idle waiting is over
+        assert prodable.prods <= 0.2 / looper.config.LOOPER_MAX_IDLE_WAIT + 2
+        prods = prodable.prods
+
+        looper.loop.call_later(0.05, prodable.writer.send, b'msg')
+        run_idle(looper, 0.1)
+        assert prodable.received == [b'msg']
+        assert prodable.prods - prods <= 4
+        assert prodable.wakeups and prodable.wakeups[0][0] == WAKEUP_IO
+
+
+def test_event_driven_looper_wakes_up_on_time():
+    prodable = WaitingProdable('timer', deadline=time.perf_counter() + 0.05)
+    with Looper([prodable], event_driven=True) as looper:
+        run_idle(looper, 0.1)
+        prodable.deadline = None
+        reasons = [reason for reason, _ in prodable.wakeups]
+        assert WAKEUP_TIMER in reasons
+        assert all(latency < 0.05 for _, latency in prodable.wakeups)
+
+
+def test_event_driven_looper_polls_prodables_not_reporting_events():
+    prodable = PollingProdable('polling')
+    with Looper([prodable], event_driven=True) as looper:
+        run_idle(looper, 0.2)
+        assert prodable.prods > 0.2 / looper.config.LOOPER_MAX_IDLE_WAIT + 2
+        assert prodable.wakeups == []
+
+
+def test_event_driven_looper_updates_readers_only_when_sources_change(monkeypatch):
+    first, second = WaitingProdable('first'), WaitingProdable('second')
+    with Looper([first], event_driven=True) as looper:
+        reader_updates = []
+        add_reader, remove_reader = looper.loop.add_reader, looper.loop.remove_reader
+        monkeypatch.setattr(looper.loop, 'add_reader',
+                            lambda fd, *args: reader_updates.append(('add', fd)) or add_reader(fd, *args))
+        monkeypatch.setattr(looper.loop, 'remove_reader',
+                            lambda fd: reader_updates.append(('remove', fd)) or remove_reader(fd))
+        looper._remove_readers()
+        reader_updates.clear()
+
+        run_idle(looper, 0.2)
+        assert reader_updates == [('add', first.reader.fileno())]
+
+        looper.add(second)
+        run_idle(looper, 0.2)
+        assert reader_updates == [('add', first.reader.fileno()), ('add', second.reader.fileno())]
+
+        looper.removeProdable(first)
+        run_idle(looper, 0.1)
+        assert reader_updates[2:] == [('remove', first.reader.fileno())]
+
+        looper.loop.call_later(0.05, second.writer.send, b'msg')
+        run_idle(looper, 0.1)
+        assert second.received == [b'msg']
+        assert len(reader_updates) == 3
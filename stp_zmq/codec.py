@@ -0,0 +1,161 @@
+"""
+Wire codecs of node-to-node messages.
+
+Every frame is self-describing: JSON frames are UTF-8 text while binary frames
+start with a byte which never occurs in UTF-8, so a receiver understands both
+codecs no matter which one the sender has chosen. Binary batches are a
+sequence of length-prefixed frames, so messages put into a batch are neither
+escaped on sending nor parsed twice on receiving.
+
+Received frames can be deserialized from memoryviews of the buffers they
+were received into, binary frames and messages of binary batches are not
+copied then.
+"""
+import struct
+from typing import Any, Iterable, List, Mapping, Union
+
+import msgpack
+
+from plenum.common.constants import OP_FIELD_NAME, BATCH
+from plenum.common.types import f
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+JSON_CODEC = 'json'
+MSGPACK_CODEC = 'msgpack'
+
+MSGPACK_FRAME_PREFIX = b'\xff'
+BATCH_FRAME_PREFIX = b'\xfe'
+_BINARY_FRAME_PREFIXES = (MSGPACK_FRAME_PREFIX[0], BATCH_FRAME_PREFIX[0])
+
+# Field of a health message listing the codecs supported by its sender
+CODECS_FIELD = 'codecs'
+
+_frame_len = struct.Struct('>I')
+
+# The pure Python fallback of msgpack unpacks only bytes
+_unpacks_buffers = msgpack.unpackb.__module__ != 'msgpack.fallback'
+
+
+def is_binary_frame(msg: Union[bytes, memoryview]) -> bool:
+    return len(msg) > 0 and msg[0] in _BINARY_FRAME_PREFIXES
+
+
+def serialize(msg: Any, codec: str = JSON_CODEC) -> bytes:
+    if isinstance(msg, Mapping):
+        if codec == MSGPACK_CODEC:
+            return MSGPACK_FRAME_PREFIX + msgpack.packb(_with_str_keys(msg),
+                                                        use_bin_type=True,
+                                                        default=_to_dict)
+        msg = json.dumps(msg)
+    if isinstance(msg, str):
+        msg = msg.encode()
+    assert isinstance(msg, bytes)
+    return msg
+
+
+def deserialize(msg: Any) -> Any:
+    if isinstance(msg, (bytes, memoryview)):
+        if is_binary_frame(msg):
+            if msg[0] == BATCH_FRAME_PREFIX[0]:
+                return {OP_FIELD_NAME: BATCH,
+                        f.MSGS.nm: unpack_batch(msg),
+                        f.SIG.nm: None}
+            packed = msg[1:]
+            if not _unpacks_buffers and not isinstance(packed, bytes):
+                packed = packed.tobytes()
+            return msgpack.unpackb(packed, encoding='utf-8')
+        msg = str(msg, 'utf-8')
+    return json.loads(msg)
+
+
+def pack_batch(msgs: Iterable[bytes]) -> bytes:
+    """
+    Joins already serialized messages into one binary batch frame
+    """
+    return BATCH_FRAME_PREFIX + b''.join(binary_batch_item(msg) for msg in msgs)
+
+
+def binary_batch_item(msg: bytes) -> bytes:
+    """
+    Serialized message as it is put into a binary batch frame
+    """
+    return _frame_len.pack(len(msg)) + msg
+
+
+def json_batch_item(msg: Any) -> bytes:
+    """
+    Serialized message as it is put into the list of messages of a JSON batch
+    """
+    if isinstance(msg, bytes):
+        msg = msg.decode()
+    return json.dumps(msg).encode()
+
+
+def unpack_batch(batch: Union[bytes, memoryview]) -> List[Union[bytes, memoryview]]:
+    """
+    Splits a binary batch frame into serialized messages, messages of
+    a batch received into a memoryview are memoryviews of it
+    """
+    msgs = []
+    offset = len(BATCH_FRAME_PREFIX)
+    end = len(batch)
+    while offset < end:
+        if offset + _frame_len.size > end:
+            raise ValueError('truncated batch frame')
+        size, = _frame_len.unpack_from(batch, offset)
+        offset += _frame_len.size
+        if offset + size > end:
+            raise ValueError('truncated batch frame')
+        msgs.append(batch[offset:offset + size])
+        offset += size
+    return msgs
+
+
+def to_json_frame(msg: Union[bytes, memoryview]) -> bytes:
+    """
+    Serializes a message received or prepared in any codec as JSON, messages
+    of a binary batch are re-serialized one by one
+    """
+    if not is_binary_frame(msg):
+        return msg
+    msg = deserialize(msg)
+    if msg.get(OP_FIELD_NAME) == BATCH:
+        msg[f.MSGS.nm] = [to_json_frame(m).decode() for m in msg[f.MSGS.nm]]
+    return serialize(msg)
+
+
+def codecs_advertisement(health_msg: str, codecs: Iterable[str]) -> bytes:
+    """
+    Wraps a health message into a JSON batch which also lists the codecs
+    supported by the sender. Nodes which do not know about codecs treat it
+    as a batch with a single health message in it.
+    """
+    return serialize({OP_FIELD_NAME: BATCH,
+                      f.MSGS.nm: [health_msg],
+                      f.SIG.nm: None,
+                      CODECS_FIELD: list(codecs)})
+
+
+def _with_str_keys(value: Union[Mapping, list, tuple]):
+    # Mapping keys are always strings in JSON, so they are turned into
+    # strings at any depth for a message to be received identically with any
+    # codec. Values of node messages can have other keys not only in their
+    # own fields (like txns of CATCHUP_REP keyed by seq_no) but deep inside
+    # too (like ledger sizes of audit txns keyed by ledger id).
+    if isinstance(value, (list, tuple)):
+        return [_with_str_keys(v) if isinstance(v, _CONTAINERS) else v for v in value]
+    return {(k if type(k) is str else str(k)): (_with_str_keys(v) if isinstance(v, _CONTAINERS) else v)
+            for k, v in value.items()}
+
+
+_CONTAINERS = (dict, list, tuple)
+
+
+def _to_dict(obj):
+    if hasattr(obj, '_asdict'):
+        return _with_str_keys(obj._asdict())
+    raise TypeError('{} is not serializable'.format(type(obj).__name__))
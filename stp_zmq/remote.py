@@ -4,6 +4,7 @@ import zmq
 
 from stp_core.common.constants import ZMQ_NETWORK_PROTOCOL
 from stp_core.common.log import getlogger
+from stp_zmq.codec import JSON_CODEC
 import sys
 from zmq.utils.monitor import recv_monitor_message
 from zmq.sugar.socket import Socket
@@ -50,6 +51,9 @@ class Remote:
         self._lastConnectedAt = None
         self.config = config or getConfig()
         self.uid = name
+        # Codec of messages sent to the other end, it is switched to a binary
+        # one only after the other end advertises its support
+        self.codec = JSON_CODEC
 
     def __repr__(self):
         return '{}:{}'.format(self.name, self.ha)
@@ -85,6 +89,7 @@ class Remote:
         logger.trace('connecting socket {} to remote {}, addr: {}'.format(sock.FD, self, addr))
         sock.connect(addr)
         self.socket = sock
+        self.codec = JSON_CODEC
 
     def close_monitor_socket(self):
         if self.socket._monitor_socket:
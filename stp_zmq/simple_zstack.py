@@ -18,7 +18,8 @@ class SimpleZStack(ZStack):
                  metrics=NullMetricsCollector(),
                  mt_incoming_size=None,
                  mt_outgoing_size=None,
-                 timer=None):
+                 timer=None,
+                 mt_incoming_copied=None):
 
         # TODO: sighex is unused as of now, remove once test is removed or
         # maybe use sighex to generate all keys, DECISION DEFERRED
@@ -49,4 +50,5 @@ class SimpleZStack(ZStack):
                          metrics=metrics,
                          mt_incoming_size=mt_incoming_size,
                          mt_outgoing_size=mt_outgoing_size,
-                         timer=timer)
+                         timer=timer,
+                         mt_incoming_copied=mt_incoming_copied)
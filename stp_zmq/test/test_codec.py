@@ -0,0 +1,202 @@
+import pytest
+
+from plenum.common.constants import AUDIT_LEDGER_ID, AUDIT, TXN_PAYLOAD, TXN_PAYLOAD_TYPE, TXN_PAYLOAD_DATA, \
+    TXN_METADATA, TXN_METADATA_SEQ_NO, AUDIT_TXN_LEDGERS_SIZE, AUDIT_TXN_LEDGER_ROOT, AUDIT_TXN_STATE_ROOT, \
+    AUDIT_TXN_VIEW_NO, AUDIT_TXN_PP_SEQ_NO
+from plenum.common.messages.node_messages import CatchupRep
+from plenum.common.metrics_collector import MetricsName
+from plenum.common.util import SortedDict
+from plenum.test.metrics.helper import MockMetricsCollector
+from stp_core.common.util import adict
+from stp_core.loop.eventually import eventually
+from stp_core.network.port_dispenser import genHa
+from stp_core.test.helper import Printer, prepStacks, chkPrinted
+from stp_zmq.codec import serialize, deserialize, pack_batch, unpack_batch, is_binary_frame, \
+    codecs_advertisement, JSON_CODEC, MSGPACK_CODEC
+from stp_zmq.test.helper import genKeys
+from stp_zmq.zstack import ZStack
+
+MSG = {'op': 'SOME_MSG', 'str': 'abc', 'int': 1, 'float': 1.5, 'none': None, 'bool': True,
+       'list': ['a', 1, {'b': 2}], 'tuple': ('a', 'b'), 'dict': {1: 'a', 'b': {'c': 2}}}
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+def test_message_is_deserialized_the_same_way_with_any_codec(codec_name):
+    serialized = serialize(MSG, codec_name)
+    assert is_binary_frame(serialized) == (codec_name == MSGPACK_CODEC)
+    assert deserialize(serialized) == deserialize(serialize(MSG, JSON_CODEC))
+    assert deserialize(serialized)['dict'] == {'1': 'a', 'b': {'c': 2}}
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+def test_audit_txn_in_catchup_rep_is_received_the_same_way_with_any_codec(codec_name):
+    # Txns read from a ledger keep integer keys of their mappings
+    audit_txn = {
+        TXN_PAYLOAD: {
+            TXN_PAYLOAD_TYPE: AUDIT,
+            TXN_PAYLOAD_DATA: {
+                AUDIT_TXN_VIEW_NO: 0,
+                AUDIT_TXN_PP_SEQ_NO: 5,
+                AUDIT_TXN_LEDGERS_SIZE: {0: 4, 1: 10, 2: 3},
+                AUDIT_TXN_LEDGER_ROOT: {1: 'ledger_root', 2: 3},
+                AUDIT_TXN_STATE_ROOT: {1: 'state_root'},
+            }
+        },
+        TXN_METADATA: {TXN_METADATA_SEQ_NO: 5}
+    }
+    rep = CatchupRep(AUDIT_LEDGER_ID, SortedDict({'5': audit_txn}), ['GKot5hBsd81kMupNCXHaqbhv3huEbxAFMLnpcX2hniwn'])
+
+    received = deserialize(serialize(rep._asdict(), codec_name))
+    received_as_json = deserialize(serialize(rep._asdict(), JSON_CODEC))
+    assert received == received_as_json
+    assert received['txns']['5'][TXN_PAYLOAD][TXN_PAYLOAD_DATA][AUDIT_TXN_LEDGERS_SIZE] == \
+        {'0': 4, '1': 10, '2': 3}
+    assert CatchupRep(**received).txns == CatchupRep(**received_as_json).txns
+
+
+def test_json_frame_is_not_binary():
+    for msg in ('pi', 'po', '{}', '"ab"'):
+        assert not is_binary_frame(msg.encode())
+
+
+def test_binary_batch():
+    msgs = [serialize(MSG, MSGPACK_CODEC), serialize(MSG, JSON_CODEC), b'']
+    batch = pack_batch(msgs)
+    assert is_binary_frame(batch)
+    assert unpack_batch(batch) == msgs
+
+    batch_msg = deserialize(batch)
+    assert batch_msg == {'op': 'BATCH', 'messages': msgs, 'signature': None}
+    assert [deserialize(m) for m in batch_msg['messages'][:2]] == [deserialize(serialize(MSG))] * 2
+
+
+@pytest.mark.parametrize('codec_name', [JSON_CODEC, MSGPACK_CODEC])
+def test_message_is_deserialized_from_memoryview(codec_name):
+    serialized = serialize(MSG, codec_name)
+    assert deserialize(memoryview(serialized)) == deserialize(serialized)
+
+
+def test_binary_batch_in_memoryview_is_not_copied():
+    msgs = [serialize(MSG, MSGPACK_CODEC), serialize(MSG, JSON_CODEC)]
+    batch = memoryview(pack_batch(msgs))
+
+    batch_msgs = deserialize(batch)['messages']
+    assert all(isinstance(m, memoryview) and m.obj is batch.obj for m in batch_msgs)
+    assert batch_msgs == msgs
+    assert [deserialize(m) for m in batch_msgs] == [deserialize(m) for m in msgs]
+
+
+def test_truncated_binary_batch():
+    batch = pack_batch([serialize(MSG, MSGPACK_CODEC)] * 2)
+    with pytest.raises(ValueError):
+        unpack_batch(batch[:-1])
+    with pytest.raises(ValueError):
+        unpack_batch(batch[:-len(serialize(MSG, MSGPACK_CODEC)) - 2])
+
+
+def test_codecs_advertisement_looks_like_batch_of_health_message():
+    msg = deserialize(codecs_advertisement('pi', [MSGPACK_CODEC, JSON_CODEC]))
+    assert msg == {'op': 'BATCH', 'messages': ['pi'], 'signature': None,
+                   'codecs': [MSGPACK_CODEC, JSON_CODEC]}
+
+
+def create_stacks(tdir, looper, tconf, binary_codec_enabled, metrics=None):
+    names = ['Alpha', 'Beta']
+    genKeys(tdir, names)
+    printers = [Printer(n) for n in names]
+    stacks = []
+    for name, printer, enabled in zip(names, printers, binary_codec_enabled):
+        config = adict(**tconf.__dict__)
+        config.ENABLE_BINARY_CODEC = enabled
+        stacks.append(ZStack(name, ha=genHa(), basedirpath=tdir, msgHandler=printer.print,
+                             restricted=True, config=config,
+                             metrics=metrics or MockMetricsCollector(),
+                             mt_incoming_size=MetricsName.INCOMING_NODE_MESSAGE_SIZE,
+                             mt_incoming_copied=MetricsName.INCOMING_NODE_MESSAGE_BYTES_COPIED))
+    prepStacks(looper, *stacks, connect=True, useKeys=True)
+    return stacks, printers
+
+
+@pytest.mark.parametrize('binary_codec_enabled, expected_codec', [
+    ((True, True), MSGPACK_CODEC),
+    ((True, False), JSON_CODEC),
+    ((False, False), JSON_CODEC),
+])
+def test_binary_codec_is_negotiated(tdir, looper, tconf, binary_codec_enabled, expected_codec):
+    (alpha, beta), (alpha_printer, beta_printer) = \
+        create_stacks(tdir, looper, tconf, binary_codec_enabled)
+
+    def check_codecs():
+        assert alpha.remote_codec(beta.name) == expected_codec
+        assert beta.remote_codec(alpha.name) == expected_codec
+
+    looper.run(eventually(check_codecs))
+
+    alpha.send(MSG, beta.name)
+    beta.send(MSG)
+    expected = deserialize(serialize(MSG))
+    looper.run(eventually(chkPrinted, beta_printer, expected))
+    looper.run(eventually(chkPrinted, alpha_printer, expected))
+
+
+@pytest.mark.parametrize('binary_codec_enabled', [(True, True), (False, False)])
+def test_large_received_message_is_copied_only_to_be_decoded_from_utf8(tdir, looper, tconf, binary_codec_enabled):
+    metrics = MockMetricsCollector()
+    (alpha, beta), (_, beta_printer) = create_stacks(tdir, looper, tconf, binary_codec_enabled, metrics)
+    expected_codec = MSGPACK_CODEC if binary_codec_enabled[0] else JSON_CODEC
+
+    def check_codec():
+        assert alpha.remote_codec(beta.name) == expected_codec
+
+    looper.run(eventually(check_codec))
+
+    # The first large message from a socket is copied like small ones are
+    msg = dict(MSG, payload='x' * 100000)
+    alpha.send(msg, beta.name)
+    looper.run(eventually(chkPrinted, beta_printer, deserialize(serialize(msg))))
+
+    metrics.flush_accumulated()
+    metrics.events.clear()
+    msg = dict(MSG, payload='y' * 100000)
+    alpha.send(msg, beta.name)
+    looper.run(eventually(chkPrinted, beta_printer, deserialize(serialize(msg))))
+    metrics.flush_accumulated()
+
+    received = {ev.name: ev.sum for ev in metrics.events}
+    received_size = received[MetricsName.INCOMING_NODE_MESSAGE_SIZE]
+    copied_size = received[MetricsName.INCOMING_NODE_MESSAGE_BYTES_COPIED]
+    assert received_size > 100000
+    if expected_codec == MSGPACK_CODEC:
+        # only health messages are received in JSON
+        assert copied_size < received_size - 100000
+    else:
+        assert copied_size == received_size
+
+
+def test_messages_are_received_without_copying_only_after_large_message(tdir, looper, tconf):
+    (alpha, beta), (_, beta_printer) = create_stacks(tdir, looper, tconf, (True, True))
+
+    def check_codec():
+        assert alpha.remote_codec(beta.name) == MSGPACK_CODEC
+
+    looper.run(eventually(check_codec))
+
+    received = []
+    verify_and_append = beta._verifyAndAppend
+
+    def spy_verify_and_append(msg, ident):
+        received.append(type(msg))
+        return verify_and_append(msg, ident)
+
+    beta._verifyAndAppend = spy_verify_and_append
+    large_size = tconf.ZMQ_ZERO_COPY_RECV_THRESHOLD
+    msgs = [dict(MSG, payload='small'),
+            dict(MSG, payload='x' * large_size),
+            dict(MSG, payload='y' * large_size),
+            dict(MSG, payload='small again'),
+            dict(MSG, payload='small at last')]
+    for msg in msgs:
+        alpha.send(msg, beta.name)
+        looper.run(eventually(chkPrinted, beta_printer, deserialize(serialize(msg))))
+
+    assert received == [bytes, bytes, memoryview, memoryview, bytes]
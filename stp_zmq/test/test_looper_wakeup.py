@@ -0,0 +1,70 @@
+import asyncio
+from statistics import mean
+from time import perf_counter
+
+import pytest
+
+from plenum.test.perf_helper import print_perf_result
+from stp_core.loop.eventually import eventually
+from stp_core.loop.looper import Looper
+from stp_core.network.port_dispenser import genHa
+from stp_core.test.helper import prepStacks
+from stp_zmq.test.helper import genKeys
+from stp_zmq.zstack import ZStack
+
+MSGS_COUNT = 30
+SEND_INTERVAL = 0.013
+
+
+class Receiver:
+    def __init__(self):
+        self.received_at = []
+
+    def handle(self, wrapped_msg):
+        self.received_at.append(perf_counter())
+
+
+def create_stacks(tdir, looper, tconf):
+    names = ['Alpha', 'Beta']
+    genKeys(tdir, names)
+    receivers = [Receiver() for _ in names]
+    stacks = [ZStack(name, ha=genHa(), basedirpath=tdir, msgHandler=receiver.handle,
+                     restricted=True, config=tconf)
+              for name, receiver in zip(names, receivers)]
+    motors = prepStacks(looper, *stacks, connect=True, useKeys=True)
+    return stacks, motors, receivers
+
+
+@pytest.mark.parametrize('event_driven', [False, True])
+def test_idle_looper_wakeup_latency(tmpdir, tconf, event_driven, capsys):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    with Looper(loop=loop, event_driven=event_driven) as looper:
+        (alpha, beta), (_, beta_motor), (alpha_receiver, _) = create_stacks(tmpdir.strpath, looper, tconf)
+        # Beta sends messages on its own, so only Alpha is prodded by the looper
+        looper.removeProdable(beta_motor)
+
+        sent_at = []
+
+        def send():
+            sent_at.append(perf_counter())
+            beta.send({'op': 'SOME_MSG', 'n': len(sent_at)}, alpha.name)
+
+        for i in range(MSGS_COUNT):
+            loop.call_later(i * SEND_INTERVAL, send)
+
+        def check_received():
+            assert len(alpha_receiver.received_at) == MSGS_COUNT
+
+        looper.run(eventually(check_received, retryWait=0.1, timeout=10))
+        assert not alpha.has_pending_input()
+        beta.stop()
+    loop.close()
+
+    latencies = [received - sent for sent, received in zip(sent_at, alpha_receiver.received_at)]
+    print_perf_result(capsys,
+                      'Messages to {} looper handled in {:.2f} ms on average, {:.2f} ms at most'
+                      .format('event driven' if event_driven else 'polling',
+                              mean(latencies) * 1000, max(latencies) * 1000))
+    if event_driven:
+        assert mean(latencies) < Looper.POLL_INTERVAL / 2
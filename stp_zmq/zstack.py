@@ -1,17 +1,15 @@
 import inspect
 
 from plenum.common.constants import OP_FIELD_NAME, BATCH
+from plenum.common.types import f
 from plenum.common.metrics_collector import NullMetricsCollector
 from plenum.common.startable import Mode
 from plenum.common.util import z85_to_friendly
 from stp_core.common.config.util import getConfig
 from stp_core.common.constants import CONNECTION_PREFIX, ZMQ_NETWORK_PROTOCOL
 from stp_zmq.client_message_provider import ClientMessageProvider
-
-try:
-    import ujson as json
-except ImportError:
-    import json
+from stp_zmq import codec
+from stp_zmq.codec import JSON_CODEC, MSGPACK_CODEC, CODECS_FIELD
 
 import os
 import shutil
@@ -19,7 +17,8 @@ import sys
 import time
 from binascii import hexlify, unhexlify
 from collections import deque
-from typing import Mapping, Tuple, Any, Union, Optional, NamedTuple
+from weakref import WeakSet
+from typing import Mapping, Tuple, Any, Union, Optional, NamedTuple, List
 
 from common.exceptions import PlenumTypeError, PlenumValueError
 
@@ -33,7 +32,7 @@ from zmq.utils import z85
 from zmq.utils.monitor import recv_monitor_message
 
 import zmq
-from stp_core.common.log import getlogger
+from stp_core.common.log import getlogger, lazy
 from stp_core.network.network_interface import NetworkInterface
 from stp_zmq.util import createEncAndSigKeys, \
     moveKeyFilesToCorrectLocations, createCertsFromKeys
@@ -70,7 +69,8 @@ class ZStack(NetworkInterface):
     def __init__(self, name, ha, basedirpath, msgHandler, restricted=True,
                  seed=None, onlyListener=False, config=None, msgRejectHandler=None, queue_size=0,
                  create_listener_monitor=False, metrics=NullMetricsCollector(),
-                 mt_incoming_size=None, mt_outgoing_size=None, timer=None):
+                 mt_incoming_size=None, mt_outgoing_size=None, timer=None,
+                 mt_incoming_copied=None):
         self._name = name
         self.ha = ha
         self.basedirpath = basedirpath
@@ -86,11 +86,16 @@ class ZStack(NetworkInterface):
         self.metrics = metrics
         self.mt_incoming_size = mt_incoming_size
         self.mt_outgoing_size = mt_outgoing_size
+        # Bytes of a received message copied before it is deserialized
+        self.mt_incoming_copied = mt_incoming_copied
 
         self.listenerQuota = self.config.DEFAULT_LISTENER_QUOTA
         self.listenerSize = self.config.DEFAULT_LISTENER_SIZE
         self.senderQuota = self.config.DEFAULT_SENDER_QUOTA
         self.msgLenVal = MessageLenValidator(self.config.MSG_LEN_LIMIT)
+        # Sockets whose last message was large enough to receive the next one
+        # without copying
+        self._zero_copy_sockets = WeakSet()
 
         self.homeDir = None
         # As of now there would be only one file in secretKeysDir and sigKeyDir
@@ -127,6 +132,15 @@ class ZStack(NetworkInterface):
         # communicate simply to listeners. Used in ClientZStack
         self.onlyListener = onlyListener
 
+        # If enabled, health messages advertise support of the binary codec
+        # and messages are sent in it to the remotes advertising it too
+        self.binary_codec_enabled = self.config.ENABLE_BINARY_CODEC and not onlyListener
+        self._codecs_advertisements = {
+            is_ping: codec.codecs_advertisement(health_msg, [MSGPACK_CODEC, JSON_CODEC])
+            for is_ping, health_msg in ((True, self.pingMessage), (False, self.pongMessage))
+        }
+        self.healthMessages = self.healthMessages | set(self._codecs_advertisements.values())
+
         self._conns = set()  # type: Set[str]
 
         self.rxMsgs = deque()
@@ -497,6 +511,11 @@ class ZStack(NetworkInterface):
         return 0
 
     def _verifyAndAppend(self, msg, ident):
+        """
+        :param msg: received message, bytes or a memoryview of the buffer
+        it was received into
+        :param ident: identifier of the sender
+        """
         try:
             ident.decode()
         except ValueError:
@@ -506,7 +525,15 @@ class ZStack(NetworkInterface):
         try:
             self.metrics.add_event(self.mt_incoming_size, len(msg))
             self.msgLenVal.validate(msg)
-            decoded = msg.decode()
+            # Messages received as bytes are already copied out of zmq frames
+            copied = len(msg) if isinstance(msg, bytes) else 0
+            # Binary frames are passed as is, they are never valid UTF-8
+            if self.binary_codec_enabled and codec.is_binary_frame(msg):
+                decoded = msg
+            else:
+                decoded = str(msg, 'utf-8')
+                copied += len(msg)
+            self.metrics.add_event(self.mt_incoming_copied, copied)
         except (UnicodeDecodeError, InvalidMessageExceedingSizeException) as ex:
             errstr = 'Message will be discarded due to {}'.format(ex)
             frm = self.remotesByKeys[ident].name if ident in self.remotesByKeys else ident
@@ -516,6 +543,24 @@ class ZStack(NetworkInterface):
         self.rxMsgs.append((decoded, ident))
         return True
 
+    def _recv_multipart(self, sock: zmq.Socket) -> List[Union[bytes, memoryview]]:
+        """
+        Receives frames of a message from the socket. The last frame, which
+        is the message itself, is a memoryview of the buffer it was received
+        into if the previous message from the socket was large, since large
+        messages (catchup replies, big batches) usually come in runs.
+        """
+        if sock in self._zero_copy_sockets:
+            frames = sock.recv_multipart(flags=zmq.NOBLOCK, copy=False)
+            frames = [frame.bytes for frame in frames[:-1]] + [frames[-1].buffer]
+        else:
+            frames = sock.recv_multipart(flags=zmq.NOBLOCK)
+        if len(frames[-1]) >= self.config.ZMQ_ZERO_COPY_RECV_THRESHOLD:
+            self._zero_copy_sockets.add(sock)
+        else:
+            self._zero_copy_sockets.discard(sock)
+        return frames
+
     def _receiveFromListener(self, quota: Quota) -> int:
         """
         Receives messages from listener
@@ -526,7 +571,7 @@ class ZStack(NetworkInterface):
         incoming_size = 0
         while i < quota.count and incoming_size < quota.size:
             try:
-                received = self.listener.recv_multipart(flags=zmq.NOBLOCK)
+                received = self._recv_multipart(self.listener)
                 # If client was connected in DEALER mode then is expected
                 # to get exactly 2 values from recv_multipart function
                 if len(received) > 2:
@@ -545,8 +590,7 @@ class ZStack(NetworkInterface):
             except zmq.ZMQError as e:
                 logger.debug("Strange ZMQ behaviour during node-to-node message receiving, experienced {}".format(e))
         if i > 0:
-            logger.trace('{} got {} messages through listener'.
-                         format(self, i))
+            logger.trace('%s got %s messages through listener', self, i)
         return i
 
     def _receiveFromRemotes(self, quotaPerRemote) -> int:
@@ -565,13 +609,13 @@ class ZStack(NetworkInterface):
             sock = remote.socket
             while i < quotaPerRemote:
                 try:
-                    msg, = sock.recv_multipart(flags=zmq.NOBLOCK)
+                    msg, = self._recv_multipart(sock)
                     if not msg:
                         # Router probing sends empty message on connection
                         continue
                     i += 1
-                    logger.trace("{} received a message from remote {} by socket {} {}", self,
-                                 z85_to_friendly(ident), sock.FD, sock.underlying)
+                    logger.trace("%s received a message from remote %s by socket %s %s", self,
+                                 lazy(z85_to_friendly, ident), lazy(sock.getsockopt, zmq.FD), sock.underlying)
                     self._verifyAndAppend(msg, ident)
                 except zmq.Again as e:
                     break
@@ -579,8 +623,7 @@ class ZStack(NetworkInterface):
                     logger.debug(
                         "Strange ZMQ behaviour during node-to-node message receiving, experienced {}".format(e))
             if i > 0:
-                logger.trace('{} got {} messages through remote {}'.
-                             format(self, i, remote))
+                logger.trace('%s got %s messages through remote %s', self, i, remote)
             totalReceived += i
         return totalReceived
 
@@ -602,6 +645,24 @@ class ZStack(NetworkInterface):
         self._receiveFromRemotes(quotaPerRemote=self.senderQuota)
         return len(self.rxMsgs)
 
+    def wakeup_sockets(self) -> List[zmq.Socket]:
+        """
+        Sockets which become readable when the stack receives something
+        """
+        if not self.listener:
+            return []
+        return [self.listener] + [remote.socket for remote in self.remotes.values() if remote.socket]
+
+    def has_pending_input(self) -> bool:
+        """
+        Whether there are received messages which are not processed yet.
+        Sockets become readable only once after new messages are received
+        and any operation on them can consume it, so they are checked too.
+        """
+        if self.rxMsgs:
+            return True
+        return any(sock.getsockopt(zmq.EVENTS) & zmq.POLLIN for sock in self.wakeup_sockets())
+
     def processReceived(self, limit):
         if limit <= 0:
             return 0
@@ -618,6 +679,10 @@ class ZStack(NetworkInterface):
                 self.remotesByKeys[ident].setConnected()
 
             if self.handlePingPong(msg, frm, ident):
+                # Plain health messages are sent by the remotes which do not
+                # support binary codec
+                if ident in self.remotesByKeys:
+                    self.remotesByKeys[ident].codec = JSON_CODEC
                 continue
 
             if not self.onlyListener and ident not in self.remotesByKeys:
@@ -636,6 +701,9 @@ class ZStack(NetworkInterface):
                 logger.error('Error {} while converting message {} '
                              'to JSON from {}'.format(e, msg, z85_to_friendly(ident)))
                 continue
+            if CODECS_FIELD in msg and msg.get(OP_FIELD_NAME) == BATCH:
+                self._process_codecs_advertisement(msg, frm, ident)
+                continue
             # We have received non-ping-pong message from some remote, we can clean this counter
             if OP_FIELD_NAME not in msg or msg[OP_FIELD_NAME] != BATCH:
                 self.remote_ping_stats[z85_to_friendly(frm)] = 0
@@ -647,6 +715,23 @@ class ZStack(NetworkInterface):
     def doProcessReceived(self, msg, frm, ident):
         return msg
 
+    def _process_codecs_advertisement(self, msg, frm, ident):
+        codecs = msg[CODECS_FIELD]
+        if ident in self.remotesByKeys and isinstance(codecs, list):
+            remote = self.remotesByKeys[ident]
+            new_codec = MSGPACK_CODEC \
+                if self.binary_codec_enabled and MSGPACK_CODEC in codecs else JSON_CODEC
+            if remote.codec != new_codec:
+                logger.info('{} switching to {} codec for messages to {}'
+                            .format(self, new_codec, z85_to_friendly(frm)))
+                remote.codec = new_codec
+        for m in msg.get(f.MSGS.nm, []):
+            self.handlePingPong(m, frm, ident)
+
+    def remote_codec(self, uid) -> str:
+        remote = self.remotes.get(uid)
+        return remote.codec if remote is not None else JSON_CODEC
+
     def connect(self,
                 name=None,
                 remoteId=None,
@@ -747,7 +832,10 @@ class ZStack(NetworkInterface):
         return remote
 
     def sendPingPong(self, remote: Union[str, Remote], is_ping=True):
-        msg = self.pingMessage if is_ping else self.pongMessage
+        if self.binary_codec_enabled:
+            msg = self._codecs_advertisements[is_ping]
+        else:
+            msg = self.pingMessage if is_ping else self.pongMessage
         action = 'ping' if is_ping else 'pong'
         name = remote if isinstance(remote, (str, bytes)) else remote.name
         # Do not use Batches for sending health messages
@@ -773,7 +861,7 @@ class ZStack(NetworkInterface):
         if msg in (self.pingMessage, self.pongMessage):
             if msg == self.pingMessage:
                 nodeName = z85_to_friendly(frm)
-                logger.trace('{} got ping from {}'.format(self, nodeName))
+                logger.trace('%s got ping from %s', self, nodeName)
                 self.sendPingPong(frm, is_ping=False)
                 if not self.config.ENABLE_HEARTBEATS and self.config.PING_RECONNECT_ENABLED and nodeName in self.connecteds:
                     if self.remote_ping_stats.get(nodeName):
@@ -787,7 +875,7 @@ class ZStack(NetworkInterface):
             if msg == self.pongMessage:
                 if ident in self.remotesByKeys:
                     self.remotesByKeys[ident].setConnected()
-                logger.trace('{} got pong from {}'.format(self, z85_to_friendly(frm)))
+                logger.trace('%s got pong from %s', self, lazy(z85_to_friendly, frm))
             return True
         return False
 
@@ -816,15 +904,18 @@ class ZStack(NetworkInterface):
                 r = []
                 e = []
                 # Serializing beforehand since to avoid serializing for each
-                # remote
+                # remote, once per codec used by the remotes
+                serialized = {}
                 try:
-                    msg = self.prepare_to_send(msg)
+                    for remote in self.remotes.values():
+                        if remote.codec not in serialized:
+                            serialized[remote.codec] = self.prepare_to_send(msg, remote.codec)
                 except InvalidMessageExceedingSizeException as ex:
                     err_str = '{}Cannot send message. Error {}'.format(CONNECTION_PREFIX, ex)
                     logger.warning(err_str)
                     return False, err_str
-                for uid in self.remotes:
-                    res, err = self.transmit(msg, uid, serialized=True, is_batch=is_batch)
+                for uid, remote in self.remotes.items():
+                    res, err = self.transmit(serialized[remote.codec], uid, serialized=True, is_batch=is_batch)
                     r.append(res)
                     e.append(err)
                 e = list(filter(lambda x: x is not None, e))
@@ -846,11 +937,14 @@ class ZStack(NetworkInterface):
             return False, err_str
         try:
             if not serialized:
-                msg = self.prepare_to_send(msg)
+                msg = self.prepare_to_send(msg, remote.codec)
 
-            logger.trace('{} transmitting message {} to {} by socket {} {}'
-                         .format(self, msg, z85_to_friendly(uid), socket.FD, socket.underlying))
-            socket.send(msg, flags=zmq.NOBLOCK)
+            logger.trace('%s transmitting message %s to %s by socket %s %s',
+                         self, msg, lazy(z85_to_friendly, uid), lazy(socket.getsockopt, zmq.FD), socket.underlying)
+            # Messages broadcast to several remotes are the same bytes object,
+            # so they are not copied into every socket; zmq still copies
+            # messages shorter than `zmq.COPY_THRESHOLD` since it is cheaper.
+            socket.send(msg, flags=zmq.NOBLOCK, copy=False)
 
             if remote.isConnected or msg in self.healthMessages:
                 self.metrics.add_event(self.mt_outgoing_size, len(msg))
@@ -868,20 +962,12 @@ class ZStack(NetworkInterface):
         return False, err_str
 
     @staticmethod
-    def serializeMsg(msg):
-        if isinstance(msg, Mapping):
-            msg = json.dumps(msg)
-        if isinstance(msg, str):
-            msg = msg.encode()
-        assert isinstance(msg, bytes)
-        return msg
+    def serializeMsg(msg, codec_name=JSON_CODEC):
+        return codec.serialize(msg, codec_name)
 
     @staticmethod
     def deserializeMsg(msg):
-        if isinstance(msg, bytes):
-            msg = msg.decode()
-        msg = json.loads(msg)
-        return msg
+        return codec.deserialize(msg)
 
     def signedMsg(self, msg: bytes, signer: Signer = None):
         sig = self.signer.signature(msg)
@@ -1027,8 +1113,8 @@ class ZStack(NetworkInterface):
     def clearAllDir(self):
         shutil.rmtree(self.homeDir)
 
-    def prepare_to_send(self, msg: Any):
-        msg_bytes = self.serializeMsg(msg)
+    def prepare_to_send(self, msg: Any, codec_name=JSON_CODEC):
+        msg_bytes = self.serializeMsg(msg, codec_name)
         return msg_bytes
 
     @staticmethod